@@ -0,0 +1,58 @@
+from keywords import count_keywords, get_phrase_matcher, keyword_match_percentage
+from prompts import INDUSTRY_TEMPLATES, generate_prompt
+from tracing import span
+
+
+# Streamlit-free analysis shared by app2 and the HTTP analysis service
+
+def generate_improvement_suggestions(resume_text, job_description, industry):
+    # This function would ideally use more advanced NLP techniques
+    # For simplicity, we'll use a basic keyword matching approach
+    job_keywords = count_keywords(job_description)
+    industry_keywords = INDUSTRY_TEMPLATES[industry]["keywords"]
+
+    # Industry keywords are often multi-word phrases, so match them as phrases;
+    # one automaton over them and the job description's terms finds both in a
+    # single pass over each text
+    matcher = get_phrase_matcher(tuple(industry_keywords) + tuple(sorted(job_keywords)))
+    resume_phrases = matcher.find(resume_text)
+    job_phrases = matcher.find(job_description)
+    
+    missing_job_keywords = set(job_keywords) - set(resume_phrases)
+    # Terms the job description itself uses come first
+    missing_industry_keywords = sorted(
+        (keyword for keyword in industry_keywords if keyword not in resume_phrases),
+        key=lambda keyword: keyword not in job_phrases,
+    )
+    
+    suggestions = [
+        f"Consider adding these keywords from the job description: {', '.join(list(missing_job_keywords)[:5])}",
+        f"Include industry-specific terms like: {', '.join(list(missing_industry_keywords)[:5])}",
+        "Quantify your achievements with specific metrics and results",
+        "Ensure your resume is ATS-friendly by using a simple, clean format",
+        "Tailor your resume summary to directly address the job requirements",
+        "Use action verbs to start each bullet point in your experience section",
+        "Highlight your most relevant skills and experiences for this specific role",
+        "Include any relevant certifications or training programs you've completed"
+    ]
+    
+    return suggestions
+
+
+def analyze_resume(resume_text, job_description, industry="Technology", analysis_type=None, use_cache=True):
+    with span("keyword_match"):
+        resume_keywords = count_keywords(resume_text)
+        job_keywords = count_keywords(job_description)
+        result = {
+            "match_percentage": keyword_match_percentage(resume_keywords, job_keywords),
+            "matching_keywords": sorted(set(resume_keywords) & set(job_keywords)),
+            "missing_keywords": sorted(set(job_keywords) - set(resume_keywords)),
+            "suggestions": generate_improvement_suggestions(resume_text, job_description, industry),
+        }
+    if analysis_type:
+        from gemini_client import generate_response
+
+        prompt = generate_prompt(analysis_type, industry)
+        result["analysis_type"] = analysis_type
+        result["analysis"] = generate_response(prompt, resume_text, job_description, use_cache=use_cache)
+    return result
@@ -0,0 +1,295 @@
+import argparse
+import base64
+import binascii
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from analysis import analyze_resume
+from pdf_admission import AdmissionRejected, get_admission_controller
+from pdf_processing import PdfDocument
+from prompts import ANALYSIS_TYPES, INDUSTRY_TEMPLATES
+from tracing import render_prometheus, traced
+
+
+# Headless HTTP service for machine-to-machine analysis.
+#
+#   POST /analyze   {"job_description": "...", "resume_text": "..."}
+#                   or {"job_description": "...", "resume_pdf": "<base64 PDF>"}
+#                   optional: "industry", "analysis_type" (runs Gemini), "use_cache"
+#   GET  /healthz   liveness
+#   GET  /readyz    503 while the request queue is full
+#   GET  /metrics   stage timings, payload sizes and cache hits (Prometheus text)
+#
+# Requests are handed to a fixed pool of worker threads through a bounded
+# queue. When the queue is full the request is rejected straight away with
+# 429 and a Retry-After header instead of piling up. PDF work that cannot be
+# admitted under the PDF memory budget (see pdf_admission.py) gets 503.
+#
+#   python analysis_service.py --port 8080 --workers 4 --queue-size 32
+
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", 4))
+ANALYSIS_QUEUE_SIZE = int(os.getenv("ANALYSIS_QUEUE_SIZE", 32))
+ANALYSIS_TIMEOUT = float(os.getenv("ANALYSIS_TIMEOUT", 120))
+MAX_REQUEST_BYTES = int(os.getenv("ANALYSIS_MAX_REQUEST_BYTES", 20 * 1024 * 1024))
+
+
+class QueueFull(Exception):
+    pass
+
+
+class WorkerPool:
+    def __init__(self, workers=ANALYSIS_WORKERS, queue_size=ANALYSIS_QUEUE_SIZE):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._busy = 0
+        self._completed = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"analysis-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            self._queue.put_nowait((future, fn, args, kwargs))
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            raise QueueFull()
+        return future
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            future, fn, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            with self._lock:
+                self._busy += 1
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._busy -= 1
+                    self._completed += 1
+
+    def shutdown(self):
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    @property
+    def saturated(self):
+        return self._queue.full()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "busy_workers": self._busy,
+                "queue_depth": self._queue.qsize(),
+                "queue_size": self.queue_size,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+
+class BadRequest(Exception):
+    pass
+
+
+def parse_analysis_request(body):
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise BadRequest("Request body must be JSON")
+    if not isinstance(payload, dict):
+        raise BadRequest("Request body must be a JSON object")
+
+    job_description = payload.get("job_description")
+    if not job_description:
+        raise BadRequest("job_description is required")
+    if not isinstance(job_description, str):
+        raise BadRequest("job_description must be a string")
+    industry = payload.get("industry", "Technology")
+    if not isinstance(industry, str) or industry not in INDUSTRY_TEMPLATES:
+        raise BadRequest(f"industry must be one of: {', '.join(INDUSTRY_TEMPLATES)}")
+    analysis_type = payload.get("analysis_type")
+    if analysis_type is not None and (not isinstance(analysis_type, str) or analysis_type not in ANALYSIS_TYPES):
+        raise BadRequest(f"analysis_type must be one of: {', '.join(ANALYSIS_TYPES)}")
+
+    resume_text = payload.get("resume_text")
+    if resume_text is not None and not isinstance(resume_text, str):
+        raise BadRequest("resume_text must be a string")
+    resume_pdf = None
+    if not resume_text:
+        if not payload.get("resume_pdf"):
+            raise BadRequest("resume_text or resume_pdf is required")
+        if not isinstance(payload["resume_pdf"], str):
+            raise BadRequest("resume_pdf must be base64-encoded")
+        try:
+            resume_pdf = base64.b64decode(payload["resume_pdf"], validate=True)
+        except (binascii.Error, ValueError):
+            raise BadRequest("resume_pdf must be base64-encoded")
+    use_cache = payload.get("use_cache", True)
+    if not isinstance(use_cache, bool):
+        raise BadRequest("use_cache must be true or false")
+
+    return {
+        "resume_text": resume_text,
+        "resume_pdf": resume_pdf,
+        "job_description": job_description,
+        "industry": industry,
+        "analysis_type": analysis_type,
+        "use_cache": use_cache,
+    }
+
+@traced("analysis_request")
+def run_analysis_request(request):
+    # Runs on a worker thread
+    resume_text = request["resume_text"]
+    if resume_text is None:
+        try:
+            resume_text = PdfDocument(request["resume_pdf"]).text
+        except AdmissionRejected:
+            raise
+        except Exception as e:
+            raise BadRequest(f"resume_pdf could not be read as a PDF: {str(e)}")
+        if not resume_text.strip():
+            raise BadRequest("No text could be extracted from the PDF")
+    result = analyze_resume(
+        resume_text, request["job_description"], request["industry"], request["analysis_type"], request["use_cache"]
+    )
+    result["resume_characters"] = len(resume_text)
+    return result
+
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    server_version = "ATSAnalysis/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        pool = self.server.pool
+        if self.path == "/healthz":
+            self.send_json(200, {"status": "ok"})
+        elif self.path == "/readyz":
+            status = 503 if pool.saturated else 200
+            self.send_json(status, {
+                "status": "saturated" if status == 503 else "ready",
+                **pool.stats(),
+                "pdf_admission": get_admission_controller().stats(),
+            })
+        elif self.path == "/metrics":
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        if self.path != "/analyze":
+            self.send_json(404, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.send_json(400, {"error": "Invalid Content-Length"})
+            return
+        if length > MAX_REQUEST_BYTES:
+            self.close_connection = True
+            self.send_json(413, {"error": f"Request body is larger than {MAX_REQUEST_BYTES} bytes"})
+            return
+        body = self.rfile.read(length)
+
+        started = time.perf_counter()
+        try:
+            request = parse_analysis_request(body)
+            future = self.server.pool.submit(run_analysis_request, request)
+            result = future.result(timeout=self.server.request_timeout)
+        except BadRequest as e:
+            self.send_json(400, {"error": str(e)})
+            return
+        except QueueFull:
+            self.send_json(429, {"error": "Analysis queue is full, retry later"}, {"Retry-After": "1"})
+            return
+        except AdmissionRejected as e:
+            self.send_json(503, {"error": f"PDF processing is overloaded: {str(e)}"}, {"Retry-After": "5"})
+            return
+        except FutureTimeoutError:
+            future.cancel()
+            self.send_json(504, {"error": "Analysis timed out"})
+            return
+        except Exception as e:
+            self.send_json(500, {"error": f"Analysis failed: {str(e)}"})
+            return
+        result["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+        self.send_json(200, result)
+
+
+class AnalysisServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, workers=ANALYSIS_WORKERS, queue_size=ANALYSIS_QUEUE_SIZE, request_timeout=ANALYSIS_TIMEOUT):
+        super().__init__(address, AnalysisRequestHandler)
+        self.pool = WorkerPool(workers, queue_size)
+        self.request_timeout = request_timeout
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the resume analysis HTTP service.")
+    parser.add_argument("--host", default=os.getenv("ANALYSIS_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("ANALYSIS_PORT", 8080)))
+    parser.add_argument("--workers", type=int, default=ANALYSIS_WORKERS)
+    parser.add_argument("--queue-size", type=int, default=ANALYSIS_QUEUE_SIZE)
+    parser.add_argument("--timeout", type=float, default=ANALYSIS_TIMEOUT, help="Seconds to wait for an analysis")
+    args = parser.parse_args(argv)
+
+    server = AnalysisServer((args.host, args.port), args.workers, args.queue_size, args.timeout)
+    print(f"Serving analysis on http://{args.host}:{args.port} with {args.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
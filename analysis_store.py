@@ -0,0 +1,300 @@
+import hashlib
+import os
+import queue
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+
+from keywords import count_keywords
+
+
+# Durable history of analyses in a local SQLite file. Resume texts and job
+# descriptions are stored once each, keyed by the SHA-256 of their text, with
+# keyword counters kept as zlib-compressed "term<TAB>count" lines. Every
+# analysis row points at one of each and holds the match score and the
+# model's output, so a candidate can be reopened without redoing the PDF work
+# or the model call. The database runs in WAL mode so readers never wait for
+# the writer: reads borrow a connection from a small pool, up to
+# ANALYSIS_STORE_READERS at once, and writes go through a single writer
+# connection guarded by a lock. Connections are pooled rather than kept per
+# thread, since Streamlit runs each rerun on a new thread. Writes made inside
+# batch() share one transaction, and the writer lock is held until it ends;
+# reads on the thread running the batch see its uncommitted writes.
+
+ANALYSIS_STORE_PATH = os.getenv("ANALYSIS_STORE_PATH", os.path.join(".cache", "analyses.db"))
+ANALYSIS_STORE_ENABLED = os.getenv("ANALYSIS_STORE_ENABLED", "1").lower() not in ("0", "false", "no")
+ANALYSIS_STORE_READERS = int(os.getenv("ANALYSIS_STORE_READERS", 4))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    sha256 TEXT PRIMARY KEY,
+    source_sha256 TEXT,
+    candidate TEXT,
+    text TEXT NOT NULL,
+    keywords BLOB NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_by_source ON documents (source_sha256);
+CREATE INDEX IF NOT EXISTS documents_by_candidate ON documents (candidate);
+CREATE TABLE IF NOT EXISTS job_descriptions (
+    sha256 TEXT PRIMARY KEY,
+    title TEXT,
+    text TEXT NOT NULL,
+    keywords BLOB NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY,
+    document_sha256 TEXT NOT NULL REFERENCES documents (sha256),
+    jd_sha256 TEXT NOT NULL REFERENCES job_descriptions (sha256),
+    candidate TEXT,
+    analysis_type TEXT NOT NULL,
+    industry TEXT NOT NULL DEFAULT '',
+    match_mode TEXT NOT NULL DEFAULT '',
+    match_percentage REAL,
+    output TEXT,
+    created_at REAL NOT NULL,
+    UNIQUE (document_sha256, jd_sha256, analysis_type, industry, match_mode)
+);
+CREATE INDEX IF NOT EXISTS analyses_by_candidate ON analyses (candidate, created_at);
+CREATE INDEX IF NOT EXISTS analyses_by_jd ON analyses (jd_sha256, created_at);
+CREATE INDEX IF NOT EXISTS analyses_by_date ON analyses (created_at);
+"""
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def text_sha256(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def encode_keywords(keywords):
+    lines = "\n".join(f"{term}\t{count}" for term, count in sorted(keywords.items()))
+    return zlib.compress(lines.encode("utf-8"))
+
+def decode_keywords(blob):
+    keywords = Counter()
+    for line in zlib.decompress(blob).decode("utf-8").splitlines():
+        term, count = line.split("\t")
+        keywords[term] = int(count)
+    return keywords
+
+
+class AnalysisStore:
+    def __init__(self, path=ANALYSIS_STORE_PATH, readers=ANALYSIS_STORE_READERS):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = None
+        self._batch_depth = 0
+        self._batch_owner = None
+        # Idle read connections; the semaphore bounds how many are open
+        self._readers = queue.LifoQueue()
+        self._reader_slots = threading.BoundedSemaphore(readers)
+        with self._lock:
+            conn = self._connection()
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _open(self):
+        conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _connection(self):
+        # The writer connection; callers hold self._lock
+        if self._conn is None:
+            self._conn = self._open()
+        return self._conn
+
+    @contextmanager
+    def _reader(self):
+        # Blocks while every read connection is in use
+        with self._reader_slots:
+            try:
+                conn = self._readers.get_nowait()
+            except queue.Empty:
+                conn = self._open()
+                conn.execute("PRAGMA query_only=ON")
+            try:
+                yield conn
+            finally:
+                self._readers.put(conn)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        while True:
+            try:
+                conn = self._readers.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @contextmanager
+    def batch(self):
+        with self._lock:
+            conn = self._connection()
+            self._batch_depth += 1
+            self._batch_owner = threading.get_ident()
+            try:
+                yield self
+            except BaseException:
+                if self._batch_depth == 1:
+                    conn.rollback()
+                raise
+            else:
+                if self._batch_depth == 1:
+                    conn.commit()
+            finally:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self._batch_owner = None
+
+    def _write(self, sql, params):
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.execute(sql, params)
+            if not self._batch_depth:
+                conn.commit()
+            return cursor
+
+    def _read(self, sql, params, fetch):
+        if self._batch_owner == threading.get_ident():
+            with self._lock:
+                return fetch(self._connection().execute(sql, params))
+        with self._reader() as conn:
+            return fetch(conn.execute(sql, params))
+
+    def _fetchone(self, sql, params):
+        return self._read(sql, params, sqlite3.Cursor.fetchone)
+
+    def _fetchall(self, sql, params):
+        return self._read(sql, params, sqlite3.Cursor.fetchall)
+
+    def add_document(self, text, candidate=None, source_sha256=None, keywords=None):
+        # Deduplicated by text; returns the document's hash
+        sha256 = text_sha256(text)
+        if keywords is None:
+            keywords = count_keywords(text)
+        self._write(
+            "INSERT INTO documents (sha256, source_sha256, candidate, text, keywords, created_at) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (sha256) DO UPDATE SET "
+            "source_sha256 = COALESCE(excluded.source_sha256, source_sha256), "
+            "candidate = COALESCE(excluded.candidate, candidate)",
+            (sha256, source_sha256, candidate, text, encode_keywords(keywords), time.time()),
+        )
+        return sha256
+
+    def add_job_description(self, text, title=None, keywords=None):
+        sha256 = text_sha256(text)
+        if keywords is None:
+            keywords = count_keywords(text)
+        self._write(
+            "INSERT INTO job_descriptions (sha256, title, text, keywords, created_at) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (sha256) DO UPDATE SET title = COALESCE(excluded.title, title)",
+            (sha256, title, text, encode_keywords(keywords), time.time()),
+        )
+        return sha256
+
+    def record_analysis(self, document_sha256, jd_sha256, analysis_type, output=None, match_percentage=None,
+                        candidate=None, industry="", match_mode=""):
+        # One row per (document, JD, analysis type, industry, match mode);
+        # recording the same analysis again replaces it
+        self._write(
+            "INSERT INTO analyses (document_sha256, jd_sha256, candidate, analysis_type, industry, match_mode, "
+            "match_percentage, output, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (document_sha256, jd_sha256, analysis_type, industry, match_mode) DO UPDATE SET "
+            "candidate = COALESCE(excluded.candidate, candidate), match_percentage = excluded.match_percentage, "
+            "output = COALESCE(excluded.output, output), created_at = excluded.created_at",
+            (document_sha256, jd_sha256, candidate, analysis_type, industry, match_mode,
+             match_percentage, output, time.time()),
+        )
+
+    def _document(self, row):
+        if row is None:
+            return None
+        document = dict(row)
+        document["keywords"] = decode_keywords(document["keywords"])
+        return document
+
+    def get_document(self, sha256):
+        row = self._fetchone("SELECT * FROM documents WHERE sha256 = ?", (sha256,))
+        return self._document(row)
+
+    def find_document_by_source(self, source_sha256):
+        # Latest text extracted from the PDF with this hash
+        row = self._fetchone(
+            "SELECT * FROM documents WHERE source_sha256 = ? ORDER BY created_at DESC LIMIT 1", (source_sha256,)
+        )
+        return self._document(row)
+
+    def get_job_description(self, sha256):
+        row = self._fetchone("SELECT * FROM job_descriptions WHERE sha256 = ?", (sha256,))
+        return self._document(row)
+
+    def find_analysis(self, document_sha256, jd_sha256, analysis_type, industry="", match_mode=""):
+        row = self._fetchone(
+            "SELECT * FROM analyses WHERE document_sha256 = ? AND jd_sha256 = ? AND analysis_type = ? "
+            "AND industry = ? AND match_mode = ?",
+            (document_sha256, jd_sha256, analysis_type, industry, match_mode),
+        )
+        return dict(row) if row is not None else None
+
+    def history(self, candidate=None, jd_sha256=None, since=None, until=None, limit=50):
+        # Newest first; every filter uses one of the analyses indexes
+        clauses, params = [], []
+        if candidate is not None:
+            clauses.append("a.candidate = ?")
+            params.append(candidate)
+        if jd_sha256 is not None:
+            clauses.append("a.jd_sha256 = ?")
+            params.append(jd_sha256)
+        if since is not None:
+            clauses.append("a.created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("a.created_at < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._fetchall(
+            "SELECT a.id, a.document_sha256, a.jd_sha256, a.candidate, a.analysis_type, a.industry, a.match_mode, "
+            "a.match_percentage, a.output, a.created_at, j.title AS jd_title "
+            f"FROM analyses a JOIN job_descriptions j ON j.sha256 = a.jd_sha256 {where} "
+            "ORDER BY a.created_at DESC LIMIT ?",
+            (*params, limit),
+        )
+        return [dict(row) for row in rows]
+
+    def candidates(self, limit=100):
+        rows = self._fetchall(
+            "SELECT candidate, MAX(created_at) AS last_seen, COUNT(*) AS analyses FROM analyses "
+            "WHERE candidate IS NOT NULL GROUP BY candidate ORDER BY last_seen DESC LIMIT ?",
+            (limit,),
+        )
+        return [dict(row) for row in rows]
+
+
+def get_analysis_store():
+    # None when the store is disabled
+    global _store
+    if not ANALYSIS_STORE_ENABLED:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = AnalysisStore()
+        return _store
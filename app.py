@@ -2,40 +2,29 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import streamlit as st
-import os
-import io
-import base64
-from PIL import Image
-import pdf2image
-import google.generativeai as genai
+from pdf_processing import PdfDocument
+from payload_planner import plan_payload
+from gemini_client import generate_response
+from structured_analysis import generate_report
+from session_memo import session_memo, upload_key
 
-genai.configure(api_key = os.getenv("GOOGLE_API_KEY"))
 
-
-def get_gemini_response(input, pdf_content, prompt):
-        model = genai.GenerativeModel("gemini-1.5-flash")
-        response = model.generate_content([input,pdf_content[0],prompt])
-        return response.text
+def get_gemini_response(input, pdf_content, prompt, use_cache=True):
+        return generate_response(input, pdf_content, prompt, use_cache=use_cache)
 
 def input_pdf_setup(uploaded_file):
+    # Extracted text where it is clean, page images only where it is not
     if uploaded_file is not None:
-        images = pdf2image.convert_from_bytes(uploaded_file.read())
-        first_page = images[0]
-
-        img_bytes_arr = io.BytesIO()
-        first_page.save(img_bytes_arr, format = 'JPEG')
-        img_bytes_arr = img_bytes_arr.getvalue()
-
-        pdf_parts = [
-            {
-                "mime_type" : "image/jpeg",
-                "data" : base64.b64encode(img_bytes_arr).decode()
-            }
-        ]
-        return pdf_parts
+        with PdfDocument.from_upload(uploaded_file) as document:
+            content, _ = plan_payload(document)
+        return content
     else:
         raise FileNotFoundError("No file uploaded")
 
+def get_pdf_content(uploaded_file):
+    # Rendered once per upload; the buttons below reuse it on later reruns
+    return session_memo("pdf_content", upload_key(uploaded_file), lambda: input_pdf_setup(uploaded_file))
+
 st.set_page_config(page_title= "ATS Resume Expert")
 st.header("ATS Tracking System")
 input_text = st.text_area("Job Description",key="input")
@@ -48,6 +37,7 @@ submit1 = st.button("Tell me about resume")
 submit2 = st.button("How can I improvise my skills")
 submit3 = st.button("What are the keywords that are missing?")
 submit4 = st.button("Percentage match")
+submit_all = st.button("Full report")
 
 
 input_prompt1 = """
@@ -102,7 +92,7 @@ Your analysis should be thorough and specific, helping the candidate to align th
 
 if submit1:
     if uploaded_file is not None:
-          pdf_content = input_pdf_setup(uploaded_file)
+          pdf_content = get_pdf_content(uploaded_file)
           response = get_gemini_response(input_prompt1, pdf_content, input_text)
           st.subheader("The Response is")
           st.write(response)
@@ -110,7 +100,7 @@ if submit1:
          st.write("Please upload the resume")
 elif submit2:
     if uploaded_file is not None:
-          pdf_content = input_pdf_setup(uploaded_file)
+          pdf_content = get_pdf_content(uploaded_file)
           response = get_gemini_response(input_prompt2, pdf_content, input_text)
           st.subheader("The Response is")
           st.write(response)
@@ -118,7 +108,7 @@ elif submit2:
          st.write("Please upload the resume")
 elif submit3:
     if uploaded_file is not None:
-          pdf_content = input_pdf_setup(uploaded_file)
+          pdf_content = get_pdf_content(uploaded_file)
           response = get_gemini_response(input_prompt3, pdf_content, input_text)
           st.subheader("The Response is")
           st.write(response)
@@ -126,10 +116,33 @@ elif submit3:
          st.write("Please upload the resume")
 elif submit4:
     if uploaded_file is not None:
-          pdf_content = input_pdf_setup(uploaded_file)
+          pdf_content = get_pdf_content(uploaded_file)
           response = get_gemini_response(input_prompt4, pdf_content, input_text)
           st.subheader("The Response is")
           st.write(response)
     else:
          st.write("Please upload the resume")
-
+elif submit_all:
+    if uploaded_file is not None:
+          # All four analyses come back from a single structured call
+          pdf_content = get_pdf_content(uploaded_file)
+          prompts = {
+               "About the resume": input_prompt1,
+               "Skill improvement": input_prompt2,
+               "Missing keywords": input_prompt3,
+               "Percentage match": input_prompt4,
+          }
+          with st.spinner("Running all analyses..."):
+               try:
+                    report = generate_report(prompts, pdf_content, input_text)
+               except Exception as e:
+                    st.error(f"Error generating AI response: {str(e)}")
+                    report = None
+          if report:
+               if report["overall_score"] is not None:
+                    st.metric("Overall match", f"{report['overall_score']}%")
+               for name in prompts:
+                    st.subheader(name)
+                    st.write(report["sections"][name])
+    else:
+         st.write("Please upload the resume")
\ No newline at end of file
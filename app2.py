@@ -1,24 +1,26 @@
 import streamlit as st
-import os
-import io
-import base64
-from PIL import Image
-import pdf2image
-import google.generativeai as genai
-from dotenv import load_dotenv
-import pandas as pd
-import matplotlib.pyplot as plt
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-from collections import Counter
-import pdfplumber
 import json
 import time
+from dotenv import load_dotenv
 
-# Load environment variables and configure Gemini AI
+# Load environment variables before the modules that read them; Gemini is
+# configured on first use
 load_dotenv()
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+
+from keywords import IncrementalScorer
+from pdf_processing import PdfDocument
+from pdf_admission import AdmissionRejected, get_admission_controller
+from payload_planner import plan_payload
+from gemini_client import generate_response, stream_response
+from prompts import ANALYSIS_TYPES, INDUSTRY_TEMPLATES, generate_prompt
+from analysis import generate_improvement_suggestions
+from structured_analysis import generate_report
+from session_memo import session_memo, text_key, upload_key
+from analysis_store import get_analysis_store, text_sha256
+from tracing import recent_spans, render_prometheus, traced, write_metrics_file
+
+MATCH_MODES = ["Keyword overlap", "BM25 relevance"]
+FULL_REPORT = "Full Report"
 
 # Set page config
 st.set_page_config(page_title="ATS Resume Expert", layout="wide")
@@ -77,99 +79,142 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-INDUSTRY_TEMPLATES = {
-    "Technology": {
-        "sections": ["Summary", "Technical Skills", "Work Experience", "Projects", "Education"],
-        "keywords": ["programming", "software development", "agile", "cloud computing"]
-    },
-    "Finance": {
-        "sections": ["Professional Summary", "Core Qualifications", "Professional Experience", "Education", "Certifications"],
-        "keywords": ["financial analysis", "risk management", "investment strategies", "market research"]
-    },
-    "Healthcare": {
-        "sections": ["Professional Summary", "Clinical Experience", "Education", "Certifications", "Skills"],
-        "keywords": ["patient care", "medical procedures", "healthcare regulations", "electronic health records"]
-    },
-    "Business": {
-        "sections": ["Executive Summary", "Core Competencies", "Professional Experience", "Achievements", "Education"],
-        "keywords": ["strategic planning", "project management", "business development", "data analysis", "leadership"]
-    },
-    "Sales": {
-        "sections": ["Professional Summary", "Sales Achievements", "Work Experience", "Skills", "Education"],
-        "keywords": ["revenue growth", "client acquisition", "negotiation", "CRM", "sales strategies"]
-    }
-}
 
+def input_pdf_setup(document):
+    # Returns (pdf_parts, warning). pdf_parts is the planned mix of text and
+    # page images when some pages have no usable text, and None when the
+    # extracted text alone is sent. Warnings are returned rather than shown
+    # so a memoized result can show them again on every rerun.
+    try:
+        if len(document) == 0:
+            return None, "The uploaded file is empty. You can manually input your resume text below."
+
+        pdf_parts, plan = plan_payload(document)
+        if plan["mode"] == "text":
+            return None, None
+        return pdf_parts, None
+    except AdmissionRejected:
+        raise
+    except ValueError:
+        return None, "Unable to process the PDF. You can manually input your resume text below."
+    except Exception as e:
+        return None, f"An unexpected error occurred while processing the PDF: {str(e)}. You can manually input your resume text below."
 
-@st.cache_resource
-def download_nltk_data():
+def extract_text_from_pdf(document):
     try:
-        nltk.download('punkt', quiet=True)
-        nltk.download('stopwords', quiet=True)
-        nltk.data.find('tokenizers/punkt')
-        nltk.data.find('corpora/stopwords')
+        text = document.text
+        if not text.strip():
+            return text, "No text could be extracted from the PDF. You can manually input your resume text below."
+        return text, None
+    except AdmissionRejected:
+        raise
     except Exception as e:
-        st.error(f"Error downloading NLTK data: {str(e)}")
-
-def input_pdf_setup(uploaded_file):
-    if uploaded_file is not None:
-        try:
-            file_content = uploaded_file.read()
-            if len(file_content) == 0:
-                st.warning("The uploaded file is empty. You can manually input your resume text below.")
-                return None
-            
-            images = pdf2image.convert_from_bytes(file_content)
-            if len(images) > 0:
-                first_page = images[0]
-                img_bytes_arr = io.BytesIO()
-                first_page.save(img_bytes_arr, format='JPEG')
-                img_bytes_arr = img_bytes_arr.getvalue()
-                pdf_parts = [
-                    {
-                        "mime_type": "image/jpeg",
-                        "data": base64.b64encode(img_bytes_arr).decode()
-                    }
-                ]
-                return pdf_parts
-            else:
-                st.warning("No pages were converted from the PDF. You can manually input your resume text below.")
-                return None
-        except pdf2image.exceptions.PDFPageCountError:
-            st.warning("Unable to process the PDF. You can manually input your resume text below.")
-            return None
-        except Exception as e:
-            st.warning(f"An unexpected error occurred while processing the PDF: {str(e)}. You can manually input your resume text below.")
-            return None
-    else:
-        st.info("No file uploaded. You can manually input your resume text below.")
+        return "", f"Error extracting text from PDF: {str(e)}. You can manually input your resume text below."
+
+def process_upload(uploaded_file):
+    # Read the upload once and share the parsed document between rendering
+    # and text extraction. A PDF whose text was already extracted in an
+    # earlier session is looked up first and read back from the analysis
+    # store, without parsing it again. Only PDFs sent as text alone are
+    # saved with their source hash, so a hit never needs page images.
+    store = get_analysis_store()
+    store_warning = None
+    with PdfDocument.from_upload(uploaded_file) as document:
+        stored = None
+        if store:
+            try:
+                stored = store.find_document_by_source(document.sha256)
+            except Exception as e:
+                store_warning = f"Could not read analysis history: {str(e)}"
+        if stored is not None:
+            return None, stored["text"], []
+        pdf_content, render_warning = input_pdf_setup(document)
+        resume_text, text_warning = extract_text_from_pdf(document)
+        if store and resume_text.strip() and not store_warning:
+            text_only = pdf_content is None and render_warning is None
+            try:
+                store.add_document(
+                    resume_text, candidate=uploaded_file.name, source_sha256=document.sha256 if text_only else None
+                )
+            except Exception as e:
+                store_warning = f"Could not save the resume to history: {str(e)}"
+    warnings = [warning for warning in (render_warning, text_warning, store_warning) if warning]
+    return pdf_content, resume_text, warnings
+
+def job_title(job_description):
+    # First non-empty line, used to label history entries
+    for line in job_description.splitlines():
+        if line.strip():
+            return line.strip()[:80]
+    return ""
+
+def save_analysis(candidate, resume_text, job_description, analysis_type, output, match_percentage, industry, match_mode):
+    store = get_analysis_store()
+    if store is None or not output:
+        return
+    try:
+        scorer = get_keyword_scorer()
+        # Both texts and the analysis are written in one transaction
+        with store.batch():
+            document = store.add_document(resume_text, candidate=candidate, keywords=scorer.resume_keywords)
+            jd = store.add_job_description(job_description, job_title(job_description), keywords=scorer.job_keywords)
+            store.record_analysis(document, jd, analysis_type, output, match_percentage, candidate, industry, match_mode)
+    except Exception as e:
+        st.warning(f"Could not save the analysis to history: {str(e)}")
+
+def find_saved_analysis(resume_text, job_description, analysis_type, industry, match_mode):
+    store = get_analysis_store()
+    if store is None:
         return None
+    try:
+        saved = store.find_analysis(text_sha256(resume_text), text_sha256(job_description), analysis_type, industry, match_mode)
+    except Exception as e:
+        st.warning(f"Could not read analysis history: {str(e)}")
+        return None
+    return saved["output"] if saved else None
 
-def extract_text_from_pdf(pdf_file):
-    if pdf_file is not None:
-        try:
-            with pdfplumber.open(pdf_file) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    text += page.extract_text() or ""
-            if not text.strip():
-                st.warning("No text could be extracted from the PDF. You can manually input your resume text below.")
-            return text
-        except Exception as e:
-            st.warning(f"Error extracting text from PDF: {str(e)}. You can manually input your resume text below.")
-            return ""
-    return ""
+def show_history(candidate):
+    store = get_analysis_store()
+    if store is None or not candidate:
+        return
+    try:
+        entries = store.history(candidate=candidate, limit=20)
+    except Exception as e:
+        st.warning(f"Could not read analysis history: {str(e)}")
+        return
+    if not entries:
+        return
+    st.markdown("### Previous Analyses")
+    for entry in entries:
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["created_at"]))
+        score = "" if entry["match_percentage"] is None else f" · {entry['match_percentage']}%"
+        with st.expander(f"{when} · {entry['analysis_type']} · {entry['jd_title'] or 'Untitled job'}{score}"):
+            if entry["analysis_type"] == FULL_REPORT:
+                report = json.loads(entry["output"])
+                for name in ANALYSIS_TYPES:
+                    st.markdown(f"#### {name}")
+                    st.markdown(report["sections"].get(name, ""))
+            else:
+                st.markdown(entry["output"])
 
 
-def get_gemini_response(input_prompt, pdf_content, job_description):
+def get_gemini_response(input_prompt, pdf_content, job_description, use_cache=True):
     try:
-        model = genai.GenerativeModel("gemini-1.5-flash")
-        response = model.generate_content([input_prompt, pdf_content, job_description])
-        return response.text
+        return generate_response(input_prompt, pdf_content, job_description, use_cache=use_cache)
     except Exception as e:
         st.error(f"Error generating AI response: {str(e)}")
         return ""
 
+def render_stream(chunks):
+    # Re-render the accumulated markdown as each chunk arrives
+    placeholder = st.empty()
+    text = ""
+    for chunk in chunks:
+        text += chunk
+        placeholder.markdown(text + "▌")
+    placeholder.markdown(text)
+    return text
+
 def structured_resume_input():
     resume_data = {}
     
@@ -244,30 +289,36 @@ WORK EXPERIENCE
 
     return formatted_resume
 
-def extract_keywords(text):
-    try:
-        words = word_tokenize(text.lower())
-        stop_words = set(stopwords.words('english'))
-        keywords = [word for word in words if word.isalnum() and word not in stop_words]
-        return Counter(keywords)
-    except Exception as e:
-        st.error(f"Error extracting keywords: {str(e)}")
-        return Counter()
+def get_keyword_scorer():
+    # One scorer per session, updated from each rerun's texts
+    if "keyword_scorer" not in st.session_state:
+        st.session_state["keyword_scorer"] = IncrementalScorer()
+    return st.session_state["keyword_scorer"]
 
+@traced("keyword_match")
 def calculate_percentage_match(resume_text, job_description):
     try:
-        resume_keywords = extract_keywords(resume_text)
-        job_keywords = extract_keywords(job_description)
-        matching_keywords = set(resume_keywords.keys()) & set(job_keywords.keys())
-        total_job_keywords = len(job_keywords)
-        if total_job_keywords == 0:
-            return 0
-        match_percentage = (len(matching_keywords) / total_job_keywords) * 100
-        return round(match_percentage, 2)
+        # Only the edited part of either text is re-tokenized
+        return get_keyword_scorer().update(resume_text, job_description)
     except Exception as e:
         st.error(f"Error calculating percentage match: {str(e)}")
         return 0
 
+def calculate_relevance(resume_text, job_description):
+    # BM25 share of the JD's weight covered by the resume, or None when no
+    # IDF model has been built. Imported here to keep numpy out of startup.
+    from relevance import BM25Scorer, get_idf_model
+
+    try:
+        model = get_idf_model()
+        if model is None:
+            return None
+        scorer = session_memo("bm25_scorer", text_key(job_description), lambda: BM25Scorer(model, [job_description]))
+        return float(scorer.score(resume_text)[0])
+    except Exception as e:
+        st.error(f"Error calculating BM25 relevance: {str(e)}")
+        return None
+
 def apply_industry_template(resume_text, industry):
     template = INDUSTRY_TEMPLATES.get(industry, {})
     sections = template.get("sections", [])
@@ -275,76 +326,6 @@ def apply_industry_template(resume_text, industry):
     formatted_resume = "\n\n".join([f"{section.upper()}:\n[Add relevant information here]" for section in sections])
     return formatted_resume, keywords
 
-def generate_prompt(analysis_type, industry):
-    if analysis_type == "Comprehensive Review":
-        return f"""Provide a comprehensive evaluation of the resume for a {industry} position:
-        1. Overall Match: Provide a percentage and brief explanation.
-        2. Key Strengths: Identify and explain the top 3-5 strengths relevant to the job.
-        3. Experience Analysis: Evaluate the relevance and depth of the candidate's experience.
-        4. Skills Assessment: Analyze the alignment of the candidate's skills with job requirements.
-        5. Education Relevance: Comment on the applicant's educational background in relation to the position.
-        6. Achievements: Highlight notable accomplishments and their relevance.
-        7. Improvement Areas: Suggest 3-5 specific areas for enhancement.
-        8. ATS Optimization Tips: Provide actionable advice to improve ATS compatibility.
-        9. Overall Impression: Summarize the candidate's suitability in 2-3 sentences.
-        """
-    elif analysis_type == "Skill Gap Analysis":
-        return f"""Conduct a thorough skill gap analysis for the {industry} position:
-        1. Required Skills: List the key skills required for the job based on the description.
-        2. Matching Skills: Identify skills in the resume that align with job requirements.
-        3. Missing Skills: Highlight important skills mentioned in the job description but missing from the resume.
-        4. Skill Proficiency: Assess the apparent level of expertise in matching skills.
-        5. Transferable Skills: Identify skills that, while not exact matches, could be valuable for the role.
-        6. Skill Development Recommendations: Suggest ways to acquire or improve crucial skills.
-        7. Industry Trends: Mention any emerging skills in the {industry} field that could enhance the application.
-        """
-    elif analysis_type == "Keyword Optimization":
-        return f"""Analyze and optimize the resume for key {industry} keywords:
-        1. Job Description Keywords: Extract and list important keywords from the job description.
-        2. Resume Keyword Matches: Identify keywords in the resume that match the job description.
-        3. Missing Keywords: List important keywords from the job description not found in the resume.
-        4. Keyword Placement: Suggest optimal sections to incorporate missing keywords.
-        5. Keyword Density: Evaluate the appropriate use and frequency of keywords.
-        6. Industry-Specific Terminology: Suggest relevant {industry} terms to include.
-        7. Action Verbs: Recommend powerful action verbs to enhance impact.
-        8. Keyword Integration Tips: Provide advice on naturally incorporating keywords into the resume.
-        """
-    else:  # ATS Match Score
-        return f"""Evaluate the resume's ATS compatibility for a {industry} position:
-        1. Overall ATS Score: Provide a percentage score for ATS compatibility.
-        2. Formatting Analysis: Assess the resume's format for ATS readability.
-        3. Keyword Match: Calculate the percentage of job description keywords found in the resume.
-        4. Section Headers: Evaluate the use of standard, ATS-friendly section headings.
-        5. Contact Information: Check for proper placement and completeness of contact details.
-        6. Work History Format: Analyze the presentation of work experience for ATS parsing.
-        7. Education Section: Assess the formatting of educational qualifications.
-        8. Skills Section: Evaluate the presentation and relevance of the skills section.
-        9. ATS Optimization Recommendations: Provide specific tips to improve ATS compatibility.
-        """
-
-def generate_improvement_suggestions(resume_text, job_description, industry):
-    # This function would ideally use more advanced NLP techniques
-    # For simplicity, we'll use a basic keyword matching approach
-    resume_keywords = set(extract_keywords(resume_text).keys())
-    job_keywords = set(extract_keywords(job_description).keys())
-    industry_keywords = set(INDUSTRY_TEMPLATES[industry]["keywords"])
-    
-    missing_job_keywords = job_keywords - resume_keywords
-    missing_industry_keywords = industry_keywords - resume_keywords
-    
-    suggestions = [
-        f"Consider adding these keywords from the job description: {', '.join(list(missing_job_keywords)[:5])}",
-        f"Include industry-specific terms like: {', '.join(list(missing_industry_keywords)[:5])}",
-        "Quantify your achievements with specific metrics and results",
-        "Ensure your resume is ATS-friendly by using a simple, clean format",
-        "Tailor your resume summary to directly address the job requirements",
-        "Use action verbs to start each bullet point in your experience section",
-        "Highlight your most relevant skills and experiences for this specific role",
-        "Include any relevant certifications or training programs you've completed"
-    ]
-    
-    return suggestions
-
 def main():
     st.markdown('<p class="big-font">ATS Resume Expert</p>', unsafe_allow_html=True)
 
@@ -354,63 +335,152 @@ def main():
         upload_option = st.radio("Choose input method:", ["Upload PDF", "Manual Input"])
         job_description = st.text_area("Job Description", height=200)
         industry = st.selectbox("Select Industry", list(INDUSTRY_TEMPLATES.keys()))
-        analysis_type = st.selectbox("Analysis Type", ["Comprehensive Review", "Skill Gap Analysis", "Keyword Optimization", "ATS Match Score"])
+        analysis_type = st.selectbox("Analysis Type", ANALYSIS_TYPES)
+        match_mode = st.selectbox("Match Mode", MATCH_MODES)
+        use_cache = st.checkbox("Reuse cached AI responses", value=True)
+        show_debug = st.checkbox("Show debug timings", value=False)
 
     # Main content area
     resume_text = ""  # Initialize resume_text with an empty string
+    candidate = None
+    pdf_content, extracted_text = None, None
     if upload_option == "Upload PDF":
         uploaded_file = st.file_uploader("Upload your resume (PDF)", type=["pdf"])
         if uploaded_file:
-            pdf_content = input_pdf_setup(uploaded_file)
-            resume_text = extract_text_from_pdf(uploaded_file)
+            candidate = uploaded_file.name
+            # Only a new upload is processed again; other widget changes
+            # reuse this session's result. Under load the upload waits for
+            # its turn, and a rejected one is not memoized, so the next rerun
+            # tries again.
+            queued = get_admission_controller().stats()["queued"]
+            waiting = f"Waiting for {queued} other resumes to be processed first... ⏳" if queued else "Processing your resume..."
+            try:
+                with st.spinner(waiting):
+                    pdf_content, resume_text, warnings = session_memo(
+                        "upload", upload_key(uploaded_file), lambda: process_upload(uploaded_file)
+                    )
+            except AdmissionRejected:
+                pdf_content, resume_text = None, ""
+                warnings = ["The server is busy processing other resumes. Please try again in a moment."]
+            for warning in warnings:
+                st.warning(warning)
+            extracted_text = resume_text
             if resume_text:
                 resume_text = st.text_area("Extracted Resume Text (Edit if needed):", value=resume_text, height=300)
             else:
                 st.warning("Failed to extract text from PDF. Please use the manual input option.")
     else:
         resume_data = structured_resume_input()
+        candidate = resume_data['name'] or None
         resume_text = format_resume(resume_data)
         resume_text = st.text_area("Formatted Resume Text (Edit if needed):", value=resume_text, height=300)
 
     if resume_text and job_description:
+        # Pages without usable text go to the model as images, unless the
+        # text has been edited since it was extracted
+        model_content = pdf_content if pdf_content is not None and resume_text == extracted_text else resume_text
+
+        # Live score, cheap enough to refresh on every edit
+        live_match = calculate_percentage_match(resume_text, job_description)
+        missing_keywords = get_keyword_scorer().missing_keywords
+        relevance = None
+        if match_mode == "BM25 relevance":
+            relevance = calculate_relevance(resume_text, job_description)
+            if relevance is None:
+                st.info("No IDF model found, so keyword overlap is shown. Build one with `python relevance.py <job description files or directories>`.")
+        if relevance is not None:
+            st.caption(f"Live BM25 relevance: {relevance}% · keyword match: {live_match}% · {len(missing_keywords)} job description keywords missing")
+        else:
+            st.caption(f"Live keyword match: {live_match}% · {len(missing_keywords)} job description keywords missing")
+        if missing_keywords:
+            with st.expander("Missing keywords"):
+                st.write(", ".join(missing_keywords))
+
         if st.button("Analyze Resume", type="primary"):
-            with st.spinner(f"Performing {analysis_type}... 🧠"):
-                # Generate AI response
+            # Local metrics are cheap, so show them before the model starts
+            match_percentage = live_match if relevance is None else relevance
+            suggestions = session_memo(
+                "suggestions",
+                text_key(resume_text, job_description, industry),
+                lambda: generate_improvement_suggestions(resume_text, job_description, industry),
+            )
+
+            st.subheader("Analysis Results")
+
+            # Metrics
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Overall Match", f"{match_percentage}%")
+            with col2:
+                st.metric("Keyword Match", f"{live_match}%")
+            with col3:
+                st.metric("ATS Readability", "High")
+
+            # AI Feedback, streamed into the page as it is generated, or read
+            # back from history when this exact analysis was run before
+            st.markdown(f"### {analysis_type} Feedback")
+            saved = find_saved_analysis(resume_text, job_description, analysis_type, industry, match_mode) if use_cache else None
+            if saved:
+                st.markdown(saved)
+            else:
                 prompt = generate_prompt(analysis_type, industry)
-                ai_response = get_gemini_response(prompt, resume_text, job_description)
-                
-                # Calculate match percentage
-                match_percentage = calculate_percentage_match(resume_text, job_description)
-                
-                # Generate improvement suggestions
-                suggestions = generate_improvement_suggestions(resume_text, job_description, industry)
-                
-                # Display results
-                st.subheader("Analysis Results")
-                
-                # Metrics
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Overall Match", f"{match_percentage}%")
-                with col2:
-                    keyword_match = min(100, match_percentage + 10)  # Simplified calculation
-                    st.metric("Keyword Match", f"{keyword_match}%")
-                with col3:
-                    st.metric("ATS Readability", "High")
-                
-                # AI Feedback
-                st.markdown(f"### {analysis_type} Feedback")
-                st.markdown(ai_response)
-                
-                # Improvement Suggestions
-                st.markdown("### Improvement Suggestions")
-                for i, suggestion in enumerate(suggestions, 1):
-                    st.info(f"{i}. {suggestion}")
+                with st.spinner(f"Performing {analysis_type}... 🧠"):
+                    try:
+                        ai_response = render_stream(stream_response(prompt, model_content, job_description, use_cache=use_cache))
+                    except Exception as e:
+                        # A partial response is shown but never saved
+                        st.error(f"Error generating AI response: {str(e)}")
+                    else:
+                        save_analysis(candidate, resume_text, job_description, analysis_type, ai_response, match_percentage, industry, match_mode)
+
+            # Improvement Suggestions
+            st.markdown("### Improvement Suggestions")
+            for i, suggestion in enumerate(suggestions, 1):
+                st.info(f"{i}. {suggestion}")
+
+        if st.button("Run Full Report"):
+            with st.spinner("Running all analysis types... 🧠"):
+                # Every analysis type comes back from one structured call
+                prompts = {name: generate_prompt(name, industry) for name in ANALYSIS_TYPES}
+                saved = find_saved_analysis(resume_text, job_description, FULL_REPORT, industry, match_mode) if use_cache else None
+                if saved:
+                    report = json.loads(saved)
+                else:
+                    try:
+                        report = generate_report(prompts, model_content, job_description, use_cache=use_cache)
+                    except Exception as e:
+                        st.error(f"Error generating AI response: {str(e)}")
+                        report = None
+                    if report:
+                        save_analysis(
+                            candidate, resume_text, job_description, FULL_REPORT, json.dumps(report),
+                            report["overall_score"], industry, match_mode,
+                        )
+
+            if report:
+                st.subheader("Full Report")
+                if report["scores"]:
+                    score_columns = st.columns(len(report["scores"]))
+                    for column, (area, score) in zip(score_columns, report["scores"].items()):
+                        column.metric(area, f"{score}%")
+                for tab, name in zip(st.tabs(ANALYSIS_TYPES), ANALYSIS_TYPES):
+                    with tab:
+                        st.markdown(report["sections"][name])
     elif not resume_text:
         st.info("Please input your resume to begin the analysis.")
     elif not job_description:
         st.info("Please enter a job description to compare your resume against.")
 
+    show_history(candidate)
+
+    write_metrics_file()
+    if show_debug:
+        st.markdown("### Debug: Stage Timings")
+        spans = recent_spans()
+        if spans:
+            st.dataframe(list(reversed(spans)), use_container_width=True)
+        with st.expander("Prometheus metrics"):
+            st.code(render_prometheus(), language="text")
+
 if __name__ == "__main__":
-    download_nltk_data()
     main()
\ No newline at end of file
@@ -0,0 +1,50 @@
+import numpy as np
+from scipy import sparse
+
+from keywords import count_keywords
+from tracing import traced
+
+
+# Score many resumes against many job descriptions at once. Every document is
+# tokenized a single time and the N x M match matrix comes out of one sparse
+# matrix product instead of N x M calls to calculate_percentage_match.
+
+def build_vocabulary(job_keywords):
+    vocabulary = {}
+    for keywords in job_keywords:
+        for term in keywords:
+            vocabulary.setdefault(term, len(vocabulary))
+    return vocabulary
+
+def build_presence_matrix(keyword_counters, vocabulary):
+    rows, cols = [], []
+    for row, keywords in enumerate(keyword_counters):
+        for term in keywords:
+            col = vocabulary.get(term)
+            # Terms that appear in no job description can never match
+            if col is not None:
+                rows.append(row)
+                cols.append(col)
+    data = np.ones(len(rows), dtype=np.int32)
+    return sparse.csr_matrix((data, (rows, cols)), shape=(len(keyword_counters), len(vocabulary)), dtype=np.int32)
+
+def percentage_match_matrix(resume_keywords, job_keywords):
+    vocabulary = build_vocabulary(job_keywords)
+    resume_matrix = build_presence_matrix(resume_keywords, vocabulary)
+    job_matrix = build_presence_matrix(job_keywords, vocabulary)
+
+    matches = (resume_matrix @ job_matrix.T).toarray()
+    totals = np.asarray(job_matrix.sum(axis=1)).ravel()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percentages = matches / totals * 100
+    percentages[:, totals == 0] = 0
+
+    # Python's round() is correctly rounded while np.round is not, so use it
+    # to stay identical to calculate_percentage_match
+    return np.array([[round(float(value), 2) for value in row] for row in percentages]).reshape(percentages.shape)
+
+@traced("batch_scoring")
+def batch_percentage_match(resume_texts, job_descriptions):
+    resume_keywords = [count_keywords(text) for text in resume_texts]
+    job_keywords = [count_keywords(text) for text in job_descriptions]
+    return percentage_match_matrix(resume_keywords, job_keywords)
@@ -0,0 +1,107 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_admission import AdmissionController, AdmissionRejected
+from run_benchmarks import percentile
+
+
+# Simulates a burst of uploads arriving at once, each holding the memory a
+# page render at the given DPI would need for --work seconds, first with no
+# limit and then through AdmissionController. Reports the peak of memory held
+# at the same time, queue depth, waits and rejections. --check exits non-zero
+# unless the admitted run stays within the budget and rejects nothing.
+#
+#   python benchmarks/admission_load.py --uploads 40 --budget-mb 128 --check
+
+def page_bytes(dpi, channels=3, copies=2):
+    # US Letter
+    return int(8.5 * dpi * 11 * dpi * channels * copies)
+
+def run_burst(uploads, cost, work, controller=None):
+    held = {"now": 0, "peak": 0, "queue_peak": 0}
+    waits, rejections = [], []
+    lock = threading.Lock()
+
+    def hold():
+        with lock:
+            waits.append(time.perf_counter() - started)
+            held["now"] += cost
+            held["peak"] = max(held["peak"], held["now"])
+            if controller is not None:
+                held["queue_peak"] = max(held["queue_peak"], controller.stats()["queued"])
+        time.sleep(work)
+        with lock:
+            held["now"] -= cost
+
+    def upload():
+        admission = nullcontext() if controller is None else controller.admit(cost, "render")
+        try:
+            with admission:
+                hold()
+        except AdmissionRejected as e:
+            with lock:
+                rejections.append(str(e))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=uploads) as pool:
+        for _ in range(uploads):
+            pool.submit(upload)
+    return {
+        "completed": len(waits),
+        "rejected": len(rejections),
+        "first_rejection": rejections[0] if rejections else None,
+        "elapsed_s": round(time.perf_counter() - started, 2),
+        "peak_memory_mb": round(held["peak"] / 2**20, 1),
+        "peak_queue_depth": held["queue_peak"],
+        "wait_p50_ms": round(percentile(waits, 0.50) * 1000, 1) if waits else None,
+        "wait_p95_ms": round(percentile(waits, 0.95) * 1000, 1) if waits else None,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test PDF admission control with a burst of simulated renders.")
+    parser.add_argument("--uploads", type=int, default=40)
+    parser.add_argument("--dpi", type=int, default=200)
+    parser.add_argument("--work", type=float, default=0.05, help="Seconds each render holds its memory")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--budget-mb", type=int, default=128)
+    parser.add_argument("--max-queue", type=int, default=64)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("-o", "--output", help="Write the results as JSON")
+    parser.add_argument("--check", action="store_true", help="Fail unless the admitted run stays within budget")
+    args = parser.parse_args(argv)
+
+    cost = page_bytes(args.dpi)
+    budget = args.budget_mb * 2**20
+    controller = AdmissionController(args.concurrency, budget, args.max_queue, args.timeout)
+    results = {
+        "page_mb": round(cost / 2**20, 1),
+        "unlimited": run_burst(args.uploads, cost, args.work),
+        "admitted": run_burst(args.uploads, cost, args.work, controller),
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.check:
+        admitted = results["admitted"]
+        problems = []
+        if admitted["rejected"]:
+            problems.append(f"{admitted['rejected']} uploads were rejected: {admitted['first_rejection']}")
+        if admitted["peak_memory_mb"] * 2**20 > max(budget, cost):
+            problems.append(f"peak memory {admitted['peak_memory_mb']} MB is over the {args.budget_mb} MB budget")
+        for problem in problems:
+            print(problem, file=sys.stderr)
+        return 1 if problems else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
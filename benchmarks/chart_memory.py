@@ -0,0 +1,109 @@
+import argparse
+import gc
+import json
+import os
+import random
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from charts import CHART_BACKENDS, CHART_CACHE_ENTRIES, clear_chart_cache, render_skill_match_chart
+from structured_analysis import SCORE_AREAS
+
+
+# Renders thousands of skill match charts with distinct scores through each
+# backend and reports resident memory growth after a warm-up, so leaked
+# figures or an unbounded chart cache show up as steady growth. --pyplot also
+# measures the old pyplot.subplots() renderer, which never closed its
+# figures, for comparison. --check exits non-zero when a backend grows by
+# more than --max-growth-mb.
+#
+#   python benchmarks/chart_memory.py --renders 2000 --check
+
+def rss_bytes():
+    # Current resident set size; falls back to the peak where /proc is missing
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def random_scores(rng):
+    return {area: rng.randint(0, 100) for area in SCORE_AREAS}
+
+def render_pyplot(scores):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.barh(list(scores), list(scores.values()), color='skyblue')
+    plt.tight_layout()
+    return fig
+
+def measure(render, renders, warmup, seed):
+    rng = random.Random(seed)
+    for _ in range(warmup):
+        render(random_scores(rng))
+    gc.collect()
+    before = rss_bytes()
+    started = time.perf_counter()
+    for _ in range(renders):
+        render(random_scores(rng))
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    growth = rss_bytes() - before
+    return {
+        "renders": renders,
+        "growth_mb": round(growth / 2**20, 2),
+        "growth_kb_per_render": round(growth / 1024 / renders, 2),
+        "ms_per_render": round(elapsed / renders * 1000, 3),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure memory growth over many chart renders.")
+    parser.add_argument("--renders", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=None, help="Renders before measuring (default: enough to fill the cache)")
+    parser.add_argument("--backend", choices=CHART_BACKENDS, action="append", help="Backend to measure (repeatable)")
+    parser.add_argument("--pyplot", action="store_true", help="Also measure the old unclosed pyplot renderer")
+    parser.add_argument("--max-growth-mb", type=float, default=8.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="Write the results as JSON")
+    parser.add_argument("--check", action="store_true", help="Fail when a backend grows more than --max-growth-mb")
+    args = parser.parse_args(argv)
+
+    # Warming up past the cache size means the measured renders only replace
+    # cache entries instead of adding them
+    warmup = CHART_CACHE_ENTRIES + 50 if args.warmup is None else args.warmup
+    results = {}
+    for backend in args.backend or CHART_BACKENDS:
+        clear_chart_cache()
+        results[backend] = measure(
+            lambda scores: render_skill_match_chart(scores, backend), args.renders, warmup, args.seed
+        )
+        print(f"{backend:12} {json.dumps(results[backend])}", file=sys.stderr)
+    # Last, since the figures it leaks stay for the rest of the process
+    if args.pyplot:
+        results["pyplot"] = measure(render_pyplot, args.renders, 10, args.seed)
+        print(f"{'pyplot':12} {json.dumps(results['pyplot'])}", file=sys.stderr)
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.check:
+        problems = [
+            f"{backend} grew by {result['growth_mb']} MB over {result['renders']} renders"
+            for backend, result in results.items()
+            if backend != "pyplot" and result["growth_mb"] > args.max_growth_mb
+        ]
+        for problem in problems:
+            print(problem, file=sys.stderr)
+        return 1 if problems else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
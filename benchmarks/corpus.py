@@ -0,0 +1,141 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prompts import INDUSTRY_TEMPLATES
+
+
+# Deterministic synthetic resumes and job descriptions built from
+# INDUSTRY_TEMPLATES. Resumes come as text and as real multi-page PDFs
+# (written directly, no PDF library needed) so every stage of the pipeline
+# can be timed on the same inputs across commits.
+
+LINES_PER_PAGE = 50
+
+GENERIC_SKILLS = [
+    "python", "sql", "excel", "communication", "teamwork", "reporting", "stakeholder management",
+    "budgeting", "mentoring", "documentation", "presentation", "problem solving", "scheduling",
+    "java", "kubernetes", "tableau", "salesforce", "compliance", "forecasting", "training",
+]
+ACTION_VERBS = [
+    "Led", "Built", "Designed", "Managed", "Improved", "Delivered", "Automated", "Launched",
+    "Negotiated", "Analyzed", "Coordinated", "Reduced", "Increased", "Implemented",
+]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Health", "Stark Industries", "Wayne Finance"]
+SCHOOLS = ["State University", "Tech Institute", "City College", "National University"]
+
+
+def resume_lines(rng, industry, pages):
+    template = INDUSTRY_TEMPLATES[industry]
+    skills = template["keywords"] + rng.sample(GENERIC_SKILLS, 8)
+    lines = [f"Candidate {rng.randint(1000, 9999)}", "candidate@example.com | 555-0100 | Remote", ""]
+    target = pages * LINES_PER_PAGE
+    while len(lines) < target:
+        for section in template["sections"]:
+            lines.append(section.upper())
+            if "Education" in section:
+                lines.append(f"B.S. from {rng.choice(SCHOOLS)}, {rng.randint(2000, 2022)}")
+            elif "Skill" in section or "Competenc" in section or "Qualification" in section:
+                lines.append(", ".join(rng.sample(skills, 6)))
+            else:
+                for _ in range(rng.randint(3, 6)):
+                    lines.append(
+                        f"{rng.choice(ACTION_VERBS)} {rng.choice(skills)} initiatives at {rng.choice(COMPANIES)}, "
+                        f"improving {rng.choice(skills)} results by {rng.randint(5, 60)}%"
+                    )
+            lines.append("")
+    return lines[:target]
+
+def job_description_text(rng, industry):
+    template = INDUSTRY_TEMPLATES[industry]
+    required = template["keywords"] + rng.sample(GENERIC_SKILLS, 6)
+    lines = [f"{industry} Specialist", "", "Responsibilities:"]
+    for _ in range(rng.randint(4, 8)):
+        lines.append(f"- {rng.choice(ACTION_VERBS)} {rng.choice(required)} across teams")
+    lines.append("")
+    lines.append("Requirements:")
+    for skill in rng.sample(required, min(len(required), 8)):
+        lines.append(f"- Experience with {skill}")
+    return "\n".join(lines)
+
+def _pdf_escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def write_pdf(lines, lines_per_page=LINES_PER_PAGE):
+    # Minimal PDF 1.4: one Helvetica text stream per page
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page_lines in pages:
+        text = "".join(f"({_pdf_escape(line)}) '\n" for line in page_lines)
+        stream = f"BT /F1 10 Tf 14 TL 50 780 Td\n{text}ET"
+        objects.append(f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream")
+        content_id = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>"
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for offset in offsets:
+        output += f"{offset:010d} 00000 n \n".encode("latin-1")
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode("latin-1")
+    return bytes(output)
+
+def generate_corpus(seed=0, resumes=50, job_descriptions=10, page_counts=(1, 2, 3)):
+    rng = random.Random(seed)
+    industries = list(INDUSTRY_TEMPLATES)
+    corpus = {"resumes": [], "job_descriptions": []}
+    for i in range(resumes):
+        industry = industries[i % len(industries)]
+        pages = page_counts[i % len(page_counts)]
+        lines = resume_lines(rng, industry, pages)
+        corpus["resumes"].append({
+            "id": f"resume-{i:04d}",
+            "industry": industry,
+            "pages": pages,
+            "text": "\n".join(lines),
+            "pdf": write_pdf(lines),
+        })
+    for i in range(job_descriptions):
+        industry = industries[i % len(industries)]
+        corpus["job_descriptions"].append({
+            "id": f"jd-{i:03d}",
+            "industry": industry,
+            "text": job_description_text(rng, industry),
+        })
+    return corpus
+
+def write_corpus(corpus, directory):
+    os.makedirs(os.path.join(directory, "resumes"), exist_ok=True)
+    os.makedirs(os.path.join(directory, "job_descriptions"), exist_ok=True)
+    for resume in corpus["resumes"]:
+        with open(os.path.join(directory, "resumes", f"{resume['id']}.pdf"), "wb") as f:
+            f.write(resume["pdf"])
+        with open(os.path.join(directory, "resumes", f"{resume['id']}.txt"), "w", encoding="utf-8") as f:
+            f.write(resume["text"])
+    for job_description in corpus["job_descriptions"]:
+        with open(os.path.join(directory, "job_descriptions", f"{job_description['id']}.txt"), "w", encoding="utf-8") as f:
+            f.write(job_description["text"])
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Write a synthetic resume/job description corpus to disk.")
+    parser.add_argument("directory")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--resumes", type=int, default=50)
+    parser.add_argument("--job-descriptions", type=int, default=10)
+    args = parser.parse_args()
+    write_corpus(generate_corpus(args.seed, args.resumes, args.job_descriptions), args.directory)
@@ -0,0 +1,139 @@
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model_scheduler import TokenBucket
+
+
+# A local stand-in for the Gemini API. It enforces its own quota with a token
+# bucket and answers 429 with Retry-After when that is exceeded, can inject
+# random 429s and 503s, and adds latency to every successful call.
+# FakeModel talks to it over HTTP with the same generate_content() call the
+# app makes on a GenerativeModel.
+#
+#   python benchmarks/fake_model_server.py --port 8090 --quota 10 --error-rate 0.05
+
+
+class FakeModelError(Exception):
+    def __init__(self, code, message, retry_after=None):
+        super().__init__(f"{code} {message}")
+        self.code = code
+        self.retry_after = retry_after
+
+
+class FakeModelHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        with server.lock:
+            roll = server.rng.random()
+        # try_acquire() returns a wait time when the quota is used up
+        if server.quota.try_acquire():
+            server.count("rate_limited")
+            self.send_json(429, {"error": "Quota exceeded"}, {"Retry-After": str(server.retry_after)})
+            return
+        if roll < server.error_rate:
+            # Injected failures are split between rate limits and outages
+            if roll < server.error_rate / 2:
+                server.count("rate_limited")
+                self.send_json(429, {"error": "Injected quota error"}, {"Retry-After": str(server.retry_after)})
+            else:
+                server.count("unavailable")
+                self.send_json(503, {"error": "Injected outage"})
+            return
+        time.sleep(server.latency * (0.5 + roll))
+        server.count("served")
+        self.send_json(200, {"text": f"Fake analysis of {payload.get('characters', 0)} characters."})
+
+
+class FakeModelServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, quota_per_second=10.0, burst=5, latency=0.05, error_rate=0.0, retry_after=1, seed=0):
+        super().__init__(address, FakeModelHandler)
+        self.quota = TokenBucket(quota_per_second, burst)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {"served": 0, "rate_limited": 0, "unavailable": 0}
+
+    def count(self, outcome):
+        with self.lock:
+            self.counts[outcome] += 1
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/generate"
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    def __init__(self, url):
+        self.url = url
+
+    def generate_content(self, parts, stream=False, generation_config=None, request_options=None):
+        timeout = (request_options or {}).get("timeout", 30)
+        body = json.dumps({"characters": sum(len(str(part)) for part in parts)}).encode("utf-8")
+        request = urllib.request.Request(self.url, data=body, headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                text = json.loads(response.read())["text"]
+        except urllib.error.HTTPError as e:
+            retry_after = e.headers.get("Retry-After")
+            raise FakeModelError(e.code, e.reason, float(retry_after) if retry_after else None)
+        return iter([FakeResponse(text)]) if stream else FakeResponse(text)
+
+
+def start_fake_server(port=0, **options):
+    server = FakeModelServer(("127.0.0.1", port), **options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a fake Gemini endpoint that injects 429s and latency.")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--quota", type=float, default=10.0, help="Requests per second before 429s")
+    parser.add_argument("--burst", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05, help="Mean seconds per successful call")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls failed with 429/503")
+    args = parser.parse_args()
+    server = FakeModelServer(("127.0.0.1", args.port), args.quota, args.burst, args.latency, args.error_rate)
+    print(f"Fake model listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
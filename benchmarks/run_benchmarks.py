@@ -0,0 +1,238 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import gemini_client
+import pdf_processing
+from cache import LRUCache, TwoTierCache
+from corpus import generate_corpus
+from keywords import IncrementalScorer, count_keywords, keyword_match_percentage
+from model_scheduler import RequestScheduler
+from near_duplicates import LshIndex, MinHasher
+from payload_planner import plan_payload
+from pdf_processing import PdfDocument, extract_page_texts
+from prompts import ANALYSIS_TYPES, generate_prompt
+from relevance import BM25Scorer, IdfModel
+from startup import measure_startup
+
+
+# Times each pipeline stage separately on a deterministic synthetic corpus and
+# writes p50/p95 latency and throughput per stage to a JSON file. Pass
+# --compare with an earlier results file to fail on regressions.
+#
+#   python benchmarks/run_benchmarks.py -o bench_results.json
+#   python benchmarks/run_benchmarks.py -o new.json --compare bench_results.json
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class StubModel:
+    # Stands in for genai.GenerativeModel so the prompt path runs offline
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    def generate_content(self, parts, stream=False, generation_config=None, request_options=None):
+        if self.latency:
+            time.sleep(self.latency)
+        text = f"Stub analysis of {sum(len(str(part)) for part in parts)} characters."
+        return iter([StubResponse(text)]) if stream else StubResponse(text)
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    position = (len(ordered) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def summarize(durations, errors=None):
+    total = sum(durations)
+    summary = {
+        "samples": len(durations),
+        "p50_ms": round(percentile(durations, 0.50) * 1000, 4) if durations else None,
+        "p95_ms": round(percentile(durations, 0.95) * 1000, 4) if durations else None,
+        "mean_ms": round(total / len(durations) * 1000, 4) if durations else None,
+        "throughput_per_s": round(len(durations) / total, 2) if total else None,
+    }
+    if errors:
+        summary["errors"] = len(errors)
+        summary["first_error"] = errors[0]
+    return summary
+
+def time_stage(fn, inputs, repeat):
+    durations, errors = [], []
+    # One untimed call so lazy imports and first-use setup are not counted
+    if inputs:
+        try:
+            fn(inputs[0])
+        except Exception:
+            pass
+    for _ in range(repeat):
+        for item in inputs:
+            start = time.perf_counter()
+            try:
+                fn(item)
+            except Exception as e:
+                errors.append(f"{type(e).__name__}: {e}")
+                continue
+            durations.append(time.perf_counter() - start)
+    return summarize(durations, errors)
+
+def disable_caches():
+    # Cold numbers: every call does the real poppler/pdfplumber/model work
+    pdf_processing._pdf_cache = TwoTierCache(LRUCache(max_entries=0))
+
+def install_stub_model(latency):
+    gemini_client._configured = True
+    gemini_client._models[gemini_client.MODEL_NAME] = StubModel(latency)
+    # The stub has no quota, so the scheduler should not throttle it
+    gemini_client._scheduler = RequestScheduler(requests_per_minute=1e9, burst=1000)
+
+def run_benchmarks(corpus, repeat=3, model_latency=0.0, startup_runs=5):
+    disable_caches()
+    install_stub_model(model_latency)
+
+    resumes = corpus["resumes"]
+    job_descriptions = corpus["job_descriptions"]
+    pairs = [(resume["text"], jd["text"]) for resume in resumes for jd in job_descriptions]
+    prompt_inputs = [
+        (ANALYSIS_TYPES[i % len(ANALYSIS_TYPES)], resume["industry"], resume["text"], job_descriptions[i % len(job_descriptions)]["text"])
+        for i, resume in enumerate(resumes)
+    ]
+
+    def render_page(resume):
+        # What input_pdf_setup did before payload planning: render page one
+        # to a base64 JPEG
+        PdfDocument(resume["pdf"]).render()
+
+    def prompt_and_model(item):
+        analysis_type, industry, resume_text, job_description = item
+        prompt = generate_prompt(analysis_type, industry)
+        gemini_client.generate_response(prompt, resume_text, job_description, use_cache=False)
+
+    bm25 = BM25Scorer(
+        IdfModel.fit([jd["text"] for jd in job_descriptions], [resume["text"] for resume in resumes]),
+        [jd["text"] for jd in job_descriptions],
+    )
+    scorers = {resume["id"]: IncrementalScorer(resume["text"], job_descriptions[0]["text"]) for resume in resumes}
+
+    def rescore_edit(resume):
+        # One character typed into the middle of the resume
+        scorer = scorers[resume["id"]]
+        text = scorer.resume_text
+        middle = len(text) // 2
+        scorer.update(text[:middle] + "x" + text[middle:])
+
+    minhasher = MinHasher()
+    lsh_index = LshIndex()
+    for resume in resumes:
+        lsh_index.add(resume["id"], minhasher.signature(resume["text"]))
+
+    stages = {
+        "render_page": time_stage(render_page, resumes, repeat),
+        "extract_text": time_stage(lambda resume: extract_page_texts(resume["pdf"]), resumes, repeat),
+        # What input_pdf_setup does now: extract, and render only unusable pages
+        "plan_payload": time_stage(lambda resume: plan_payload(PdfDocument(resume["pdf"])), resumes, repeat),
+        "extract_keywords": time_stage(lambda resume: count_keywords(resume["text"]), resumes, repeat),
+        "percentage_match": time_stage(
+            lambda pair: keyword_match_percentage(count_keywords(pair[0]), count_keywords(pair[1])), pairs, repeat
+        ),
+        # One resume against every job description per sample
+        "bm25_match": time_stage(lambda resume: bm25.score(resume["text"]), resumes, repeat),
+        "incremental_rescore": time_stage(rescore_edit, resumes, repeat),
+        # Signature plus a lookup against every resume in the corpus
+        "near_duplicate_lookup": time_stage(
+            lambda resume: lsh_index.find_duplicate(minhasher.signature(resume["text"])), resumes, repeat
+        ),
+        "prompt_and_model": time_stage(prompt_and_model, prompt_inputs, repeat),
+    }
+    startup = measure_startup(runs=startup_runs)
+    stages["startup"] = {
+        "samples": startup["runs"],
+        "p50_ms": round(startup["median_seconds"] * 1000, 4),
+        "p95_ms": round(startup["max_seconds"] * 1000, 4),
+        "heavy_modules_loaded": startup["heavy_modules_loaded"],
+    }
+    return stages
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline, max_regression):
+    regressions = []
+    for stage, current in results["stages"].items():
+        previous = baseline.get("stages", {}).get(stage)
+        if not previous:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            old, new = previous.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            print(f"{stage:20} {metric}: {old:10.3f} -> {new:10.3f} ms ({change:+.1%})")
+            if change > max_regression:
+                regressions.append(f"{stage} {metric} regressed by {change:.1%}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark each resume analysis stage.")
+    parser.add_argument("-o", "--output", default="bench_results.json")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--resumes", type=int, default=30)
+    parser.add_argument("--job-descriptions", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the corpus per stage")
+    parser.add_argument("--model-latency", type=float, default=0.0, help="Seconds the stub model sleeps per call")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="Allowed relative slowdown (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    corpus = generate_corpus(args.seed, args.resumes, args.job_descriptions)
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "seed": args.seed,
+            "resumes": args.resumes,
+            "job_descriptions": args.job_descriptions,
+            "repeat": args.repeat,
+        },
+        "stages": run_benchmarks(corpus, args.repeat, args.model_latency),
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    for stage, summary in results["stages"].items():
+        if summary.get("errors") and not summary["samples"]:
+            print(f"{stage:20} skipped: {summary['first_error']}")
+        else:
+            print(f"{stage:20} p50 {summary['p50_ms']:10.3f} ms  p95 {summary['p95_ms']:10.3f} ms")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.max_regression)
+        for regression in regressions:
+            print(regression, file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fake_model_server import FakeModel, start_fake_server
+from model_scheduler import BATCH, INTERACTIVE, RequestScheduler
+from run_benchmarks import percentile
+
+
+# Drives a burst of batch requests plus a trickle of interactive ones at the
+# fake model server, once with plain concurrent calls and once through
+# RequestScheduler, and reports failures, 429s, throughput and per-priority
+# latency. --check exits non-zero unless every scheduled request succeeds and
+# interactive requests finish ahead of batch ones.
+#
+#   python benchmarks/scheduler_load.py --batch 120 --interactive 20 --check
+
+def latency_summary(latencies):
+    if not latencies:
+        return {"samples": 0}
+    return {
+        "samples": len(latencies),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+    }
+
+def run_load(call, batch, interactive, interactive_interval):
+    # call(priority) performs one request; returns the outcome per priority
+    results = {INTERACTIVE: [], BATCH: []}
+    failures = []
+    lock = threading.Lock()
+
+    def one(priority):
+        start = time.perf_counter()
+        try:
+            call(priority)
+        except Exception as e:
+            with lock:
+                failures.append(f"{type(e).__name__}: {e}")
+            return
+        with lock:
+            results[priority].append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=batch + interactive) as pool:
+        for _ in range(batch):
+            pool.submit(one, BATCH)
+        for _ in range(interactive):
+            time.sleep(interactive_interval)
+            pool.submit(one, INTERACTIVE)
+    elapsed = time.perf_counter() - started
+    succeeded = len(results[INTERACTIVE]) + len(results[BATCH])
+    return {
+        "succeeded": succeeded,
+        "failed": len(failures),
+        "first_failure": failures[0] if failures else None,
+        "elapsed_s": round(elapsed, 2),
+        "throughput_per_s": round(succeeded / elapsed, 2),
+        "interactive": latency_summary(results[INTERACTIVE]),
+        "batch": latency_summary(results[BATCH]),
+    }
+
+def scenario(mode, args):
+    server = start_fake_server(
+        quota_per_second=args.quota, burst=args.burst, latency=args.latency, error_rate=args.error_rate, seed=args.seed
+    )
+    model = FakeModel(server.url)
+    parts = ["prompt", "resume text", "job description"]
+    try:
+        if mode == "direct":
+            result = run_load(
+                lambda priority: model.generate_content(parts).text, args.batch, args.interactive, args.interactive_interval
+            )
+        else:
+            scheduler = RequestScheduler(
+                requests_per_minute=args.quota * 60 * args.headroom, burst=args.burst, workers=args.workers,
+                max_retries=args.max_retries, backoff_base=args.backoff_base, backoff_max=5.0,
+            )
+            try:
+                result = run_load(
+                    lambda priority: scheduler.call(
+                        lambda timeout: model.generate_content(parts, request_options={"timeout": timeout}).text,
+                        priority, args.deadline,
+                    ),
+                    args.batch, args.interactive, args.interactive_interval,
+                )
+                result["scheduler"] = scheduler.stats()
+            finally:
+                scheduler.shutdown()
+        result["server"] = dict(server.counts)
+    finally:
+        server.shutdown()
+        server.server_close()
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the model scheduler against a fake rate-limited server.")
+    parser.add_argument("--batch", type=int, default=120)
+    parser.add_argument("--interactive", type=int, default=20)
+    parser.add_argument("--interactive-interval", type=float, default=0.2, help="Seconds between interactive arrivals")
+    parser.add_argument("--quota", type=float, default=20.0, help="Server quota in requests per second")
+    parser.add_argument("--burst", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.02, help="Injected 429/503 fraction")
+    parser.add_argument("--headroom", type=float, default=0.95, help="Scheduler rate as a fraction of the quota")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--max-retries", type=int, default=4)
+    parser.add_argument("--backoff-base", type=float, default=0.2)
+    parser.add_argument("--deadline", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="Write the results as JSON")
+    parser.add_argument("--check", action="store_true", help="Fail unless the scheduled run is clean")
+    args = parser.parse_args(argv)
+
+    results = {mode: scenario(mode, args) for mode in ("direct", "scheduled")}
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.check:
+        scheduled = results["scheduled"]
+        problems = []
+        if scheduled["failed"]:
+            problems.append(f"{scheduled['failed']} scheduled requests failed: {scheduled['first_failure']}")
+        interactive, batch = scheduled["interactive"].get("p95_ms"), scheduled["batch"].get("p95_ms")
+        if interactive is not None and batch is not None and interactive >= batch:
+            problems.append(f"interactive p95 {interactive} ms is not below batch p95 {batch} ms")
+        for problem in problems:
+            print(problem, file=sys.stderr)
+        return 1 if problems else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
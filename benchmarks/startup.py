@@ -0,0 +1,88 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+# Cold-start budget check. Each run imports the app's modules in a fresh
+# interpreter with outbound connections disabled, and fails if the median
+# import time is over budget, if a heavy optional module was actually loaded,
+# or if anything tried to reach the network.
+#
+#   python benchmarks/startup.py --budget 0.5
+#   python benchmarks/startup.py --app app2 --budget 3
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CORE_MODULES = ["keywords", "prompts", "cache", "pdf_processing", "llm_cache", "gemini_client"]
+HEAVY_MODULES = ["pdf2image", "pdfplumber", "google.generativeai", "matplotlib", "pandas", "nltk"]
+
+PROBE = r"""
+import json, socket, sys, time
+
+network_attempts = []
+def blocked(*args, **kwargs):
+    network_attempts.append(repr(args[:2]))
+    raise OSError("network access during startup")
+socket.socket.connect = blocked
+socket.create_connection = blocked
+
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+
+loaded = [
+    name for name in {heavy!r}
+    if name in sys.modules
+]
+print(json.dumps({{"seconds": elapsed, "loaded": loaded, "network": network_attempts}}))
+"""
+
+
+def measure_once(modules):
+    probe = PROBE.format(modules=modules, heavy=HEAVY_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    # Streamlit may print warnings when an app is imported outside "streamlit run"
+    return json.loads(output.strip().splitlines()[-1])
+
+def measure_startup(modules=CORE_MODULES, runs=5):
+    results = [measure_once(modules) for _ in range(runs)]
+    return {
+        "modules": modules,
+        "runs": runs,
+        "median_seconds": statistics.median(result["seconds"] for result in results),
+        "max_seconds": max(result["seconds"] for result in results),
+        "heavy_modules_loaded": sorted({name for result in results for name in result["loaded"]}),
+        "network_attempts": sorted({attempt for result in results for attempt in result["network"]}),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold-start import time against a budget.")
+    parser.add_argument("--app", help="Also import this Streamlit app module (e.g. app2)")
+    parser.add_argument("--budget", type=float, default=0.5, help="Maximum median import time in seconds")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    modules = CORE_MODULES + ([args.app] if args.app else [])
+    report = measure_startup(modules, args.runs)
+    report["budget_seconds"] = args.budget
+    print(json.dumps(report, indent=2))
+
+    failures = []
+    if report["median_seconds"] > args.budget:
+        failures.append(f"median startup {report['median_seconds']:.3f}s is over the {args.budget:.3f}s budget")
+    if report["heavy_modules_loaded"]:
+        failures.append(f"heavy modules loaded at startup: {', '.join(report['heavy_modules_loaded'])}")
+    if report["network_attempts"]:
+        failures.append("network access attempted at startup")
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
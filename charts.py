@@ -0,0 +1,113 @@
+import io
+import os
+from xml.sax.saxutils import escape
+
+from cache import LRUCache
+from tracing import record_cache, record_size, traced
+
+
+# Skill match charts rendered straight to image data. The matplotlib backend
+# draws on a standalone Figure, which pyplot never registers, and clears it
+# once the PNG is written, so a long-running server does not accumulate open
+# figures. The native backend writes the SVG by hand and never imports
+# matplotlib. Rendered charts are cached by backend and score data, so a
+# rerun showing the same report draws nothing.
+
+CHART_BACKEND = os.getenv("CHART_BACKEND", "matplotlib")
+CHART_BACKENDS = ("matplotlib", "native")
+CHART_CACHE_ENTRIES = int(os.getenv("CHART_CACHE_ENTRIES", 128))
+CHART_DPI = 100
+
+# Native SVG layout, in pixels
+SVG_WIDTH = 720
+SVG_LABEL_WIDTH = 180
+SVG_VALUE_WIDTH = 60
+SVG_ROW_HEIGHT = 36
+SVG_TOP = 48
+SVG_BOTTOM = 48
+BAR_COLOR = "#87ceeb"
+
+_chart_cache = LRUCache(CHART_CACHE_ENTRIES)
+
+
+def render_matplotlib(skills, scores):
+    # Imported here so the app starts without loading matplotlib
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(10, 6))
+    FigureCanvasAgg(fig)
+    try:
+        ax = fig.add_subplot()
+        ax.barh(skills, scores, color='skyblue')
+        ax.set_xlabel('Match Percentage')
+        ax.set_ylabel('Skills')
+        ax.set_title('Skill Match Analysis')
+
+        for i, v in enumerate(scores):
+            ax.text(v + 1, i, f'{v}%', va='center')
+
+        fig.tight_layout()
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", dpi=CHART_DPI)
+        return buffer.getvalue()
+    finally:
+        fig.clear()
+
+def render_native(skills, scores):
+    plot_width = SVG_WIDTH - SVG_LABEL_WIDTH - SVG_VALUE_WIDTH
+    height = SVG_TOP + SVG_ROW_HEIGHT * len(skills) + SVG_BOTTOM
+    axis_y = SVG_TOP + SVG_ROW_HEIGHT * len(skills)
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{SVG_WIDTH}" height="{height}" '
+        f'viewBox="0 0 {SVG_WIDTH} {height}" font-family="sans-serif" font-size="13">',
+        f'<text x="{SVG_WIDTH / 2}" y="28" text-anchor="middle" font-size="16">Skill Match Analysis</text>',
+    ]
+    # Like barh, the first skill is drawn at the bottom
+    for i, (skill, score) in enumerate(zip(reversed(skills), reversed(scores))):
+        y = SVG_TOP + i * SVG_ROW_HEIGHT
+        bar = plot_width * min(max(score, 0), 100) / 100
+        parts.append(
+            f'<text x="{SVG_LABEL_WIDTH - 8}" y="{y + SVG_ROW_HEIGHT / 2}" text-anchor="end" '
+            f'dominant-baseline="middle">{escape(str(skill))}</text>'
+        )
+        parts.append(
+            f'<rect x="{SVG_LABEL_WIDTH}" y="{y + 6}" width="{bar:.1f}" height="{SVG_ROW_HEIGHT - 12}" fill="{BAR_COLOR}"/>'
+        )
+        parts.append(
+            f'<text x="{SVG_LABEL_WIDTH + bar + 6:.1f}" y="{y + SVG_ROW_HEIGHT / 2}" '
+            f'dominant-baseline="middle">{score}%</text>'
+        )
+    parts.append(
+        f'<line x1="{SVG_LABEL_WIDTH}" y1="{axis_y}" x2="{SVG_LABEL_WIDTH + plot_width}" y2="{axis_y}" stroke="#333"/>'
+    )
+    for tick in range(0, 101, 20):
+        x = SVG_LABEL_WIDTH + plot_width * tick / 100
+        parts.append(f'<text x="{x:.1f}" y="{axis_y + 18}" text-anchor="middle">{tick}</text>')
+    parts.append(
+        f'<text x="{SVG_LABEL_WIDTH + plot_width / 2}" y="{height - 8}" text-anchor="middle">Match Percentage</text>'
+    )
+    parts.append("</svg>")
+    return "".join(parts)
+
+RENDERERS = {"matplotlib": render_matplotlib, "native": render_native}
+
+@traced("chart_render")
+def render_skill_match_chart(skills_data, backend=None):
+    # Returns PNG bytes (matplotlib) or an SVG string (native); st.image
+    # displays either
+    backend = backend or CHART_BACKEND
+    if backend not in RENDERERS:
+        raise ValueError(f"Unknown chart backend {backend!r}; expected one of {', '.join(CHART_BACKENDS)}")
+    key = (backend, tuple(skills_data.items()))
+    chart = _chart_cache.get(key)
+    record_cache("chart", chart is not None)
+    if chart is not None:
+        return chart
+    chart = RENDERERS[backend](list(skills_data.keys()), list(skills_data.values()))
+    record_size("chart_bytes", len(chart))
+    _chart_cache.set(key, chart)
+    return chart
+
+def clear_chart_cache():
+    _chart_cache.clear()
@@ -0,0 +1,98 @@
+import os
+import threading
+import time
+
+from llm_cache import cached_generate, lookup_response, store_response
+from model_scheduler import INTERACTIVE, RequestScheduler
+from prompt_budget import compact_payload
+from tracing import span
+
+
+# Long-lived model instances for Gemini calls. The SDK is imported and
+# configured from GOOGLE_API_KEY when the first model is created, which keeps
+# it out of app startup. Every request to the model goes through one
+# RequestScheduler for rate limiting, priorities and retries.
+
+MODEL_NAME = "gemini-1.5-flash"
+MAX_CONCURRENT_REQUESTS = 4
+
+_configured = False
+_models = {}
+_models_lock = threading.Lock()
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_model(model_name=MODEL_NAME):
+    global _configured
+    with _models_lock:
+        model = _models.get(model_name)
+        if model is None:
+            # Imported only to create a model, so a stand-in model placed in
+            # _models (see benchmarks/run_benchmarks.py) needs no SDK
+            import google.generativeai as genai
+
+            if not _configured:
+                genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+                _configured = True
+            model = genai.GenerativeModel(model_name)
+            _models[model_name] = model
+        return model
+
+def get_scheduler():
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RequestScheduler(workers=MAX_CONCURRENT_REQUESTS)
+        return _scheduler
+
+def request_parts(input_prompt, content, job_description):
+    # content is one part or a list of parts from the payload planner
+    if isinstance(content, list):
+        return [input_prompt, *content, job_description]
+    return [input_prompt, content, job_description]
+
+def generate_response(input_prompt, content, job_description, model_name=MODEL_NAME, use_cache=True,
+                      generation_config=None, validate=None, priority=INTERACTIVE):
+    # Compacted before the cache lookup so the cache key matches what is sent
+    input_prompt, content, job_description, _ = compact_payload(input_prompt, content, job_description)
+    options = {"generation_config": generation_config} if generation_config else {}
+
+    def attempt(timeout):
+        response = get_model(model_name).generate_content(
+            request_parts(input_prompt, content, job_description), request_options={"timeout": timeout}, **options
+        )
+        return response.text
+
+    def generate():
+        return get_scheduler().call(attempt, priority)
+    with span("gemini_response", model=model_name):
+        return cached_generate(model_name, input_prompt, content, job_description, generate, use_cache, validate)
+
+def stream_response(input_prompt, content, job_description, model_name=MODEL_NAME, use_cache=True, priority=INTERACTIVE):
+    # Yields text chunks as the model produces them; a cached response is
+    # yielded as a single chunk and a completed stream is stored in the cache
+    input_prompt, content, job_description, _ = compact_payload(input_prompt, content, job_description)
+    cached = lookup_response(model_name, input_prompt, content, job_description, use_cache)
+    if cached is not None:
+        yield cached
+        return
+    chunks = []
+    started = time.perf_counter()
+    with span("gemini_response", model=model_name, stream=True) as attributes:
+        # Only opening the stream is scheduled and retried; the SDK raises
+        # quota errors there, before any chunk is yielded
+        response = get_scheduler().call(
+            lambda timeout: get_model(model_name).generate_content(
+                request_parts(input_prompt, content, job_description), stream=True, request_options={"timeout": timeout}
+            ),
+            priority,
+        )
+        for chunk in response:
+            text = chunk.text
+            if text:
+                if not chunks:
+                    attributes["first_chunk_ms"] = round((time.perf_counter() - started) * 1000, 3)
+                chunks.append(text)
+                yield text
+    store_response(model_name, input_prompt, content, job_description, "".join(chunks), use_cache)
@@ -0,0 +1,200 @@
+import re
+from collections import Counter, deque
+from functools import lru_cache
+
+
+# Tokens are runs of letters and digits, which is what the NLTK pipeline kept
+# after its isalnum() filter, matched by a single precompiled regex
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+TOKEN_CHAR = re.compile(r"[^\W_]")
+# Characters compared per probe when locating an edit
+COMPARE_BLOCK = 256
+
+# NLTK's English stopword list, frozen here so no corpus has to be loaded
+NLTK_STOP_WORDS = """
+i me my myself we our ours ourselves you you're you've you'll you'd your yours
+yourself yourselves he him his himself she she's her hers herself it it's its
+itself they them their theirs themselves what which who whom this that that'll
+these those am is are was were be been being have has had having do does did
+doing a an the and but if or because as until while of at by for with about
+against between into through during before after above below to from up down
+in out on off over under again further then once here there when where why how
+all any both each few more most other some such no nor not only own same so
+than too very s t can will just don don't should should've now d ll m o re ve y
+ain aren aren't couldn couldn't didn didn't doesn doesn't hadn hadn't hasn
+hasn't haven haven't isn isn't ma mightn mightn't mustn mustn't needn needn't
+shan shan't shouldn shouldn't wasn wasn't weren weren't won won't wouldn
+wouldn't
+""".split()
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+# The list run through the tokenizer: "you're" can never come out of it, but
+# "you" and "re" can, so filtering matches what NLTK removed
+STOP_WORDS = frozenset(token for word in NLTK_STOP_WORDS for token in tokenize(word))
+
+# Not traced: batch, incremental and benchmark loops call this per document,
+# so callers trace the request instead
+def count_keywords(text):
+    return Counter(token for token in tokenize(text) if token not in STOP_WORDS)
+
+def keyword_match_percentage(resume_keywords, job_keywords):
+    matching_keywords = set(resume_keywords.keys()) & set(job_keywords.keys())
+    total_job_keywords = len(job_keywords)
+    if total_job_keywords == 0:
+        return 0
+    match_percentage = (len(matching_keywords) / total_job_keywords) * 100
+    return round(match_percentage, 2)
+
+def _common_prefix_length(a, b):
+    # Compares in place, a block at a time: each probe copies at most
+    # COMPARE_BLOCK characters of b and the scan stops at the first
+    # difference, so only the unchanged prefix is read
+    limit = min(len(a), len(b))
+    i = 0
+    while i + COMPARE_BLOCK <= limit and a.startswith(b[i:i + COMPARE_BLOCK], i):
+        i += COMPARE_BLOCK
+    while i < limit and a[i] == b[i]:
+        i += 1
+    return i
+
+def _common_suffix_length(a, b, limit):
+    i = 0
+    while i + COMPARE_BLOCK <= limit and a.endswith(b[len(b) - i - COMPARE_BLOCK:len(b) - i], 0, len(a) - i):
+        i += COMPARE_BLOCK
+    while i < limit and a[len(a) - i - 1] == b[len(b) - i - 1]:
+        i += 1
+    return i
+
+def term_count_changes(old_text, new_text):
+    # Keyword count deltas between two versions of a text, tokenizing only
+    # the changed region widened to the surrounding token boundaries
+    start = _common_prefix_length(old_text, new_text)
+    suffix = _common_suffix_length(old_text, new_text, min(len(old_text), len(new_text)) - start)
+    old_end, new_end = len(old_text) - suffix, len(new_text) - suffix
+    while start > 0 and TOKEN_CHAR.match(old_text, start - 1):
+        start -= 1
+    while old_end < len(old_text) and TOKEN_CHAR.match(old_text, old_end):
+        old_end += 1
+        new_end += 1
+    changes = Counter(token for token in tokenize(new_text[start:new_end]) if token not in STOP_WORDS)
+    changes.subtract(token for token in tokenize(old_text[start:old_end]) if token not in STOP_WORDS)
+    return {term: delta for term, delta in changes.items() if delta}
+
+
+class IncrementalScorer:
+    # Keeps keyword counts for a resume and a job description and updates
+    # them from edits. Only the changed region is re-tokenized and only the
+    # affected terms are touched; finding the region is one in-place scan
+    # over the unchanged ends. Results are identical to
+    # keyword_match_percentage on freshly counted texts.
+    def __init__(self, resume_text="", job_description=""):
+        self.resume_text = ""
+        self.job_description = ""
+        self.resume_keywords = Counter()
+        self.job_keywords = Counter()
+        self._missing = set()
+        self.update(resume_text, job_description)
+
+    def update(self, resume_text=None, job_description=None):
+        if job_description is not None and job_description != self.job_description:
+            for term, delta in term_count_changes(self.job_description, job_description).items():
+                self._adjust_job(term, delta)
+            self.job_description = job_description
+        if resume_text is not None and resume_text != self.resume_text:
+            for term, delta in term_count_changes(self.resume_text, resume_text).items():
+                self._adjust_resume(term, delta)
+            self.resume_text = resume_text
+        return self.match_percentage
+
+    def _adjust_resume(self, term, delta):
+        before = self.resume_keywords[term]
+        after = before + delta
+        if after:
+            self.resume_keywords[term] = after
+        else:
+            del self.resume_keywords[term]
+        if term in self.job_keywords:
+            if not before:
+                self._missing.discard(term)
+            elif not after:
+                self._missing.add(term)
+
+    def _adjust_job(self, term, delta):
+        before = self.job_keywords[term]
+        after = before + delta
+        if after:
+            self.job_keywords[term] = after
+        else:
+            del self.job_keywords[term]
+        if not before and term not in self.resume_keywords:
+            self._missing.add(term)
+        elif not after:
+            self._missing.discard(term)
+
+    @property
+    def match_percentage(self):
+        if not self.job_keywords:
+            return 0
+        matching = len(self.job_keywords) - len(self._missing)
+        return round((matching / len(self.job_keywords)) * 100, 2)
+
+    @property
+    def missing_keywords(self):
+        return sorted(self._missing)
+
+
+class PhraseMatcher:
+    # Aho-Corasick automaton over tokens: finds every occurrence of every
+    # phrase (single or multi-word, e.g. "risk management") in one pass over
+    # the text's tokens
+    def __init__(self, phrases):
+        self.phrases = list(dict.fromkeys(phrases))
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for index, phrase in enumerate(self.phrases):
+            node = 0
+            for token in tokenize(phrase):
+                child = self._goto[node].get(token)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[node][token] = child
+                node = child
+            if node:
+                self._output[node].append(index)
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(token, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find(self, text):
+        goto, fail, output = self._goto, self._fail, self._output
+        counts = Counter()
+        node = 0
+        for token in tokenize(text):
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            for index in output[node]:
+                counts[self.phrases[index]] += 1
+        return counts
+
+@lru_cache(maxsize=64)
+def get_phrase_matcher(phrases):
+    # phrases must be a tuple so compiled automata can be reused
+    return PhraseMatcher(phrases)
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from tracing import record_cache
+
+# Model responses keyed on (model name, prompt, resume hash, job description
+# hash) in a local SQLite file, so identical requests are answered without a
+# model call across reruns and restarts. Entries expire after a TTL and the
+# least recently used ones are dropped once the store exceeds max_bytes.
+
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(".cache", "llm_responses.db"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", 7 * 24 * 3600))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1").lower() not in ("0", "false", "no")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_by_access ON responses (accessed_at);
+"""
+
+
+def content_hash(content):
+    if isinstance(content, bytes):
+        data = content
+    elif isinstance(content, str):
+        data = content.encode("utf-8")
+    else:
+        # Image parts and other structured content
+        data = json.dumps(content, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+def response_cache_key(model_name, prompt, resume_content, job_description):
+    parts = [model_name, prompt, content_hash(resume_content), content_hash(job_description)]
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, path=LLM_CACHE_PATH, ttl=LLM_CACHE_TTL, max_bytes=LLM_CACHE_MAX_BYTES):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+
+    def get(self, key):
+        now = time.time()
+        with self._lock, self.conn:
+            row = self.conn.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            response, created_at = row
+            if self.ttl and now - created_at > self.ttl:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self.conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            return response
+
+    def set(self, key, model_name, response):
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model_name, response, size, now, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now):
+        if self.ttl:
+            self.conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for key, size in self.conn.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self.conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+    def clear(self):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM responses")
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache()
+        return _response_cache
+
+def lookup_response(model_name, prompt, resume_content, job_description, use_cache=True):
+    if not (use_cache and LLM_CACHE_ENABLED):
+        return None
+    key = response_cache_key(model_name, prompt, resume_content, job_description)
+    response = get_response_cache().get(key)
+    record_cache("llm_response", response is not None)
+    return response
+
+def store_response(model_name, prompt, resume_content, job_description, response, use_cache=True):
+    # Empty responses are never stored
+    if not (use_cache and LLM_CACHE_ENABLED and response):
+        return
+    key = response_cache_key(model_name, prompt, resume_content, job_description)
+    get_response_cache().set(key, model_name, response)
+
+def cached_generate(model_name, prompt, resume_content, job_description, generate, use_cache=True, validate=None):
+    # generate() is only called on a miss. validate(response), if given,
+    # raises for a response that should not be stored.
+    response = lookup_response(model_name, prompt, resume_content, job_description, use_cache)
+    if response is not None:
+        return response
+    response = generate()
+    if validate is not None:
+        validate(response)
+    store_response(model_name, prompt, resume_content, job_description, response, use_cache)
+    return response
@@ -0,0 +1,199 @@
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from tracing import increment
+
+
+# Every model call goes through one scheduler per process. A token bucket
+# keeps the request rate under the quota, a priority queue sends interactive
+# requests ahead of batch work, retryable failures (429s, 5xx, timeouts) are
+# retried with jittered exponential backoff, and each request has a deadline
+# after which it fails instead of queueing forever. A 429 empties the bucket,
+# so one rate-limit error slows every worker down instead of setting off a
+# burst of retries.
+
+GEMINI_REQUESTS_PER_MINUTE = float(os.getenv("GEMINI_REQUESTS_PER_MINUTE", 60))
+GEMINI_BURST = int(os.getenv("GEMINI_BURST", 5))
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", 4))
+GEMINI_BACKOFF_BASE = float(os.getenv("GEMINI_BACKOFF_BASE", 1.0))
+GEMINI_BACKOFF_MAX = float(os.getenv("GEMINI_BACKOFF_MAX", 30.0))
+GEMINI_DEADLINE = float(os.getenv("GEMINI_DEADLINE", 120.0))
+
+INTERACTIVE = 0
+BATCH = 1
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+def is_retryable(error):
+    # google.api_core errors carry the HTTP status in .code
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    return getattr(error, "code", None) in RETRYABLE_STATUS
+
+def is_rate_limited(error):
+    return getattr(error, "code", None) == 429
+
+def backoff_delay(attempt, base=GEMINI_BACKOFF_BASE, maximum=GEMINI_BACKOFF_MAX):
+    # Full jitter: anywhere between zero and the exponential ceiling
+    return random.uniform(0, min(maximum, base * 2 ** attempt))
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self):
+        # 0 when a token was taken, otherwise seconds until one is available
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def refund(self):
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + 1)
+
+    def drain(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, 0.0)
+
+
+class _Request:
+    def __init__(self, fn, priority, deadline):
+        self.fn = fn
+        self.priority = priority
+        self.deadline = deadline
+        self.future = Future()
+        self.attempt = 0
+
+
+class RequestScheduler:
+    def __init__(self, requests_per_minute=GEMINI_REQUESTS_PER_MINUTE, burst=GEMINI_BURST, workers=4,
+                 max_retries=GEMINI_MAX_RETRIES, backoff_base=GEMINI_BACKOFF_BASE, backoff_max=GEMINI_BACKOFF_MAX):
+        self.bucket = TokenBucket(requests_per_minute / 60.0, burst)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._heap = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._stats = {"submitted": 0, "succeeded": 0, "failed": 0, "retried": 0, "rate_limited": 0, "expired": 0}
+        self._threads = [
+            threading.Thread(target=self._run, name=f"model-scheduler-{i}", daemon=True) for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, fn, priority=INTERACTIVE, timeout=GEMINI_DEADLINE):
+        # fn(remaining_seconds) makes one attempt at the call
+        request = _Request(fn, priority, time.monotonic() + timeout)
+        self._count("submitted")
+        self._push(request)
+        return request.future
+
+    def call(self, fn, priority=INTERACTIVE, timeout=GEMINI_DEADLINE):
+        future = self.submit(fn, priority, timeout)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise DeadlineExceeded(f"Model request did not finish within {timeout:g} seconds")
+
+    def _push(self, request):
+        with self._condition:
+            heapq.heappush(self._heap, (request.priority, next(self._sequence), request))
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._heap and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+            # The token is taken before a request is picked, so whichever
+            # request has the highest priority at that moment goes next
+            delay = self.bucket.try_acquire()
+            if delay:
+                time.sleep(delay)
+                continue
+            with self._condition:
+                if not self._heap:
+                    self.bucket.refund()
+                    continue
+                _, _, request = heapq.heappop(self._heap)
+            self._execute(request)
+
+    def _execute(self, request):
+        if request.attempt == 0 and not request.future.set_running_or_notify_cancel():
+            self.bucket.refund()
+            return
+        remaining = request.deadline - time.monotonic()
+        if remaining <= 0:
+            self.bucket.refund()
+            self._count("expired")
+            request.future.set_exception(DeadlineExceeded("Model request expired before it could be sent"))
+            return
+        try:
+            result = request.fn(remaining)
+        except Exception as e:
+            self._retry_or_fail(request, e)
+        else:
+            self._count("succeeded")
+            request.future.set_result(result)
+
+    def _retry_or_fail(self, request, error):
+        if is_rate_limited(error):
+            self._count("rate_limited")
+            self.bucket.drain()
+        delay = max(backoff_delay(request.attempt, self.backoff_base, self.backoff_max),
+                    getattr(error, "retry_after", None) or 0)
+        if (request.attempt >= self.max_retries or not is_retryable(error)
+                or time.monotonic() + delay >= request.deadline):
+            self._count("failed")
+            request.future.set_exception(error)
+            return
+        request.attempt += 1
+        self._count("retried")
+        timer = threading.Timer(delay, self._push, args=(request,))
+        timer.daemon = True
+        timer.start()
+
+    def _count(self, outcome):
+        with self._condition:
+            self._stats[outcome] += 1
+        increment("ats_model_requests_total", outcome=outcome)
+
+    def stats(self):
+        with self._condition:
+            return {**self._stats, "queued": len(self._heap)}
+
+    def shutdown(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join()
@@ -0,0 +1,122 @@
+import os
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+from keywords import tokenize
+
+
+# Near-duplicate detection for resumes that arrive several times with small
+# edits. Each text is reduced to overlapping word shingles and summarized by a
+# MinHash signature; two signatures agree in a given position with probability
+# equal to the Jaccard similarity of the shingle sets. An LSH index splits
+# signatures into bands and buckets each band, so a lookup only compares
+# against texts that share at least one band instead of the whole corpus.
+# Shingles are hashed with CRC32 rather than hash() so signatures computed in
+# different worker processes agree.
+
+DUPLICATE_THRESHOLD = float(os.getenv("DUPLICATE_THRESHOLD", 0.9))
+SHINGLE_SIZE = 4
+NUM_PERMUTATIONS = 128
+MINHASH_SEED = 1
+
+# Universal hashing (a * x + b) mod p over 32-bit shingle hashes; a stays
+# below 2**31 so the product fits in uint64
+_PRIME = np.uint64(4294967311)
+_MAX_HASH = np.uint64(2**32 - 1)
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    tokens = tokenize(text)
+    if len(tokens) < size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+def _band_probability(similarity, bands, rows):
+    # Chance that two texts with this Jaccard similarity share a band
+    return 1 - (1 - similarity ** rows) ** bands
+
+def lsh_parameters(threshold, num_permutations=NUM_PERMUTATIONS, false_negative_weight=0.9):
+    # (bands, rows) minimizing the weighted area of missed duplicates above
+    # the threshold and wasted comparisons below it. Candidates are verified
+    # against the full signature, so a miss costs more than a comparison, and
+    # bands * rows may leave some permutations for verification only.
+    steps = 100
+    best = None
+    for rows, bands in (
+        (rows, bands) for rows in range(1, num_permutations + 1) for bands in range(1, num_permutations // rows + 1)
+    ):
+        false_positive = sum(
+            _band_probability(threshold * (i + 0.5) / steps, bands, rows) for i in range(steps)
+        ) * threshold / steps
+        false_negative = sum(
+            1 - _band_probability(threshold + (1 - threshold) * (i + 0.5) / steps, bands, rows) for i in range(steps)
+        ) * (1 - threshold) / steps
+        error = (1 - false_negative_weight) * false_positive + false_negative_weight * false_negative
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+
+class MinHasher:
+    def __init__(self, num_permutations=NUM_PERMUTATIONS, seed=MINHASH_SEED, shingle_size=SHINGLE_SIZE):
+        rng = np.random.default_rng(seed)
+        self.num_permutations = num_permutations
+        self.shingle_size = shingle_size
+        self._a = rng.integers(1, 2**31, size=(num_permutations, 1), dtype=np.uint64)
+        self._b = rng.integers(0, 2**32, size=(num_permutations, 1), dtype=np.uint64)
+
+    def signature(self, text):
+        # None for a text with no tokens, which has nothing to compare
+        items = shingles(text, self.shingle_size)
+        if not items:
+            return None
+        hashes = np.fromiter(
+            (zlib.crc32(item.encode("utf-8")) for item in items), dtype=np.uint64, count=len(items)
+        )
+        permuted = (self._a * hashes + self._b) % _PRIME & _MAX_HASH
+        return permuted.min(axis=1).astype(np.uint32)
+
+
+def estimated_jaccard(a, b):
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+class LshIndex:
+    def __init__(self, threshold=DUPLICATE_THRESHOLD, num_permutations=NUM_PERMUTATIONS):
+        self.threshold = threshold
+        self.bands, self.rows = lsh_parameters(threshold, num_permutations)
+        self._buckets = [defaultdict(list) for _ in range(self.bands)]
+        self._signatures = {}
+
+    def _band_keys(self, signature):
+        for band in range(self.bands):
+            yield signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def add(self, key, signature):
+        self._signatures[key] = signature
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            buckets[band_key].append(key)
+
+    def query(self, signature):
+        # Keys whose estimated Jaccard similarity reaches the threshold,
+        # most similar first
+        candidates = set()
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(buckets.get(band_key, ()))
+        matches = []
+        for key in candidates:
+            similarity = estimated_jaccard(signature, self._signatures[key])
+            if similarity >= self.threshold:
+                matches.append((similarity, key))
+        matches.sort(key=lambda match: match[0], reverse=True)
+        return [(key, similarity) for similarity, key in matches]
+
+    def find_duplicate(self, signature):
+        # (key, similarity) of the closest earlier text, or None
+        matches = self.query(signature)
+        return matches[0] if matches else None
+
+    def __len__(self):
+        return len(self._signatures)
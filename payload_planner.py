@@ -0,0 +1,138 @@
+import os
+import re
+import unicodedata
+
+from pdf_admission import AdmissionRejected
+from pdf_processing import PAGE_BREAK
+from tracing import increment, record_size, span
+
+
+# Chooses what to send Gemini for an uploaded PDF. Every page's extracted text
+# is checked for density (non-space characters) and for garbled output:
+# replacement and control characters, private-use glyphs and pdfplumber's
+# "(cid:NN)" placeholders for fonts without a text mapping. Clean pages go as
+# text, which is far smaller and cheaper than an image; only pages whose text
+# is missing or garbled are rendered, up to PAYLOAD_MAX_IMAGE_PAGES. When no
+# text can be extracted at all, page 1 is rendered as before. A page that
+# gets neither is replaced by a marker in the text. Each page's decision
+# (page, reason, garbled ratio, image bytes) and the payload size are kept
+# with the plan_payload span for the debug panel and counted in the metrics.
+
+PAYLOAD_MIN_PAGE_CHARS = int(os.getenv("PAYLOAD_MIN_PAGE_CHARS", 50))
+PAYLOAD_MAX_GARBLED_RATIO = float(os.getenv("PAYLOAD_MAX_GARBLED_RATIO", 0.05))
+PAYLOAD_MAX_IMAGE_PAGES = int(os.getenv("PAYLOAD_MAX_IMAGE_PAGES", 2))
+
+CID_PATTERN = re.compile(r"\(cid:\d+\)")
+GARBLED_CATEGORIES = frozenset(("Cc", "Cf", "Co", "Cn", "Cs"))
+REPLACEMENT_CHARACTER = "\ufffd"
+OMITTED_PAGE_MARKER = "[Page {page} omitted: no usable text]"
+
+
+def garbled_ratio(text):
+    # Share of non-space characters that are not real text; each (cid:NN)
+    # placeholder counts as one character
+    cids = len(CID_PATTERN.findall(text))
+    text = CID_PATTERN.sub("", text)
+    characters = [char for char in text if not char.isspace()]
+    total = len(characters) + cids
+    if total == 0:
+        return 0.0
+    garbled = cids + sum(
+        1 for char in characters
+        if char == REPLACEMENT_CHARACTER or unicodedata.category(char) in GARBLED_CATEGORIES
+    )
+    return garbled / total
+
+def page_decision(page, text, min_chars=PAYLOAD_MIN_PAGE_CHARS, max_garbled_ratio=PAYLOAD_MAX_GARBLED_RATIO):
+    characters = sum(1 for char in text if not char.isspace())
+    ratio = garbled_ratio(text)
+    if characters < min_chars:
+        mode, reason = "image", "sparse_text"
+    elif ratio > max_garbled_ratio:
+        mode, reason = "image", "garbled_text"
+    else:
+        mode, reason = "text", "clean_text"
+    return {"page": page, "mode": mode, "reason": reason, "characters": characters, "garbled_ratio": round(ratio, 4)}
+
+def part_size(part):
+    # Image parts count their base64 payload, as in the request body
+    if isinstance(part, dict):
+        return len(part.get("data", ""))
+    return len(part.encode("utf-8"))
+
+def plan_payload(document, max_image_pages=PAYLOAD_MAX_IMAGE_PAGES, min_chars=PAYLOAD_MIN_PAGE_CHARS,
+                 max_garbled_ratio=PAYLOAD_MAX_GARBLED_RATIO):
+    # Returns (content, plan). content is a string when every page goes as
+    # text, otherwise a list of text and image parts in page order. plan holds
+    # the per-page decisions, the overall mode and the payload size in bytes.
+    # Raises ValueError when neither text nor an image could be produced.
+    with span("plan_payload") as attributes:
+        try:
+            page_texts = document.page_texts
+        except AdmissionRejected:
+            raise
+        except Exception:
+            page_texts = []
+
+        if any(text.strip() for text in page_texts):
+            decisions = [
+                page_decision(page, text, min_chars, max_garbled_ratio)
+                for page, text in enumerate(page_texts, 1)
+            ]
+        else:
+            page_texts = [""]
+            decisions = [{"page": 1, "mode": "image", "reason": "no_text", "characters": 0, "garbled_ratio": 0.0}]
+
+        parts, text_run, images = [], [], 0
+        for decision, text in zip(decisions, page_texts):
+            if decision["mode"] == "image" and images >= max_image_pages:
+                decision.update(mode="text", reason="image_limit")
+            if decision["mode"] == "image":
+                try:
+                    rendered = document.render(pages=(decision["page"],))
+                except AdmissionRejected:
+                    raise
+                except Exception:
+                    rendered = None
+                if rendered:
+                    if text_run:
+                        parts.append(PAGE_BREAK.join(text_run))
+                        text_run = []
+                    parts.append(rendered[0])
+                    decision["bytes"] = part_size(rendered[0])
+                    images += 1
+                    continue
+                decision.update(mode="text", reason="render_failed")
+            if text.strip():
+                text_run.append(text)
+            else:
+                # Left out rather than dropped silently, so the model knows
+                # the resume has a page it cannot see
+                text_run.append(OMITTED_PAGE_MARKER.format(page=decision["page"]))
+                decision["omitted"] = True
+        if text_run:
+            parts.append(PAGE_BREAK.join(text_run))
+        omitted = sum(1 for decision in decisions if decision.get("omitted"))
+        if omitted == len(decisions):
+            raise ValueError("No text or page images could be read from the PDF")
+
+        if images == 0:
+            content = parts[0]
+            mode = "text"
+        else:
+            content = parts
+            mode = "image" if all(decision["mode"] == "image" for decision in decisions) else "mixed"
+        payload_bytes = sum(part_size(part) for part in parts)
+        attributes.update({
+            "mode": mode,
+            "pages": len(decisions),
+            "image_pages": images,
+            "omitted_pages": omitted,
+            "payload_bytes": payload_bytes,
+            "decisions": decisions,
+        })
+
+    for decision in decisions:
+        increment("ats_payload_pages_total", mode=decision["mode"], reason=decision["reason"])
+    record_size(f"payload_{mode}_bytes", payload_bytes)
+    return content, {"mode": mode, "pages": decisions, "omitted_pages": omitted, "payload_bytes": payload_bytes}
@@ -0,0 +1,168 @@
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from tracing import increment, observe, set_gauge
+
+
+# Process-wide admission control for PDF rendering and text extraction. poppler
+# holds a full-page bitmap per rendered page and pdfplumber keeps every
+# character object of a document, so each job reserves an estimate of its
+# memory (from DPI and page size for rendering, from page count for
+# extraction) before it starts. Jobs run while both the concurrency limit and
+# the memory budget allow, and otherwise wait in arrival order. A job is
+# rejected with AdmissionRejected when the queue is full or it has waited
+# longer than the timeout, so a burst of uploads queues up instead of running
+# the process out of memory. Only cache misses go through here.
+
+PDF_MAX_CONCURRENT_JOBS = int(os.getenv("PDF_MAX_CONCURRENT_JOBS", 2))
+PDF_MEMORY_BUDGET = int(os.getenv("PDF_MEMORY_BUDGET", 512 * 1024 * 1024))
+PDF_ADMISSION_MAX_QUEUE = int(os.getenv("PDF_ADMISSION_MAX_QUEUE", 32))
+PDF_ADMISSION_TIMEOUT = float(os.getenv("PDF_ADMISSION_TIMEOUT", 60.0))
+
+# pdf2image reads poppler's PPM output into memory and PIL decodes it again,
+# so a page is held about twice while it is encoded
+RENDER_COPIES = 2
+EXTRACT_BYTES_PER_PAGE = int(os.getenv("PDF_EXTRACT_BYTES_PER_PAGE", 4 * 1024 * 1024))
+LETTER_POINTS = (612.0, 792.0)
+
+PAGE_PATTERN = re.compile(rb"/Type\s*/Page(?![a-zA-Z])")
+MEDIA_BOX_PATTERN = re.compile(rb"/MediaBox\s*\[\s*([-\d.]+)\s+([-\d.]+)\s+([-\d.]+)\s+([-\d.]+)\s*\]")
+
+_controller = None
+_controller_lock = threading.Lock()
+
+
+class AdmissionRejected(Exception):
+    pass
+
+
+def estimate_page_count(pdf_bytes):
+    # Page objects inside compressed object streams are not visible, in which
+    # case this falls back to a single page
+    return max(1, len(PAGE_PATTERN.findall(pdf_bytes)))
+
+def page_size_points(pdf_bytes):
+    # The largest media box in the file, or US Letter when there is none
+    width, height = 0.0, 0.0
+    for match in MEDIA_BOX_PATTERN.finditer(pdf_bytes):
+        try:
+            x0, y0, x1, y1 = (float(value) for value in match.groups())
+        except ValueError:
+            continue
+        width, height = max(width, abs(x1 - x0)), max(height, abs(y1 - y0))
+    if width <= 0 or height <= 0:
+        return LETTER_POINTS
+    return width, height
+
+def render_cost(pdf_bytes, dpi, grayscale=False):
+    # Pages are rendered one at a time, so only one bitmap is held at once
+    width, height = page_size_points(pdf_bytes)
+    channels = 1 if grayscale else 3
+    return int(width / 72 * dpi * height / 72 * dpi * channels * RENDER_COPIES)
+
+def extract_cost(pdf_bytes):
+    return estimate_page_count(pdf_bytes) * EXTRACT_BYTES_PER_PAGE + len(pdf_bytes)
+
+
+class AdmissionController:
+    def __init__(self, max_concurrent=PDF_MAX_CONCURRENT_JOBS, memory_budget=PDF_MEMORY_BUDGET,
+                 max_queue=PDF_ADMISSION_MAX_QUEUE, timeout=PDF_ADMISSION_TIMEOUT):
+        self.max_concurrent = max_concurrent
+        self.memory_budget = memory_budget
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.running = 0
+        self.reserved = 0
+        self._waiting = deque()
+        self._condition = threading.Condition()
+        self._stats = {"admitted": 0, "rejected": 0, "waited": 0, "wait_seconds": 0.0}
+
+    def _fits(self, cost):
+        if self.running >= self.max_concurrent:
+            return False
+        # A job larger than the whole budget runs alone rather than never
+        return self.running == 0 or self.reserved + cost <= self.memory_budget
+
+    def _publish(self):
+        set_gauge("ats_pdf_admission_queue_depth", len(self._waiting))
+        set_gauge("ats_pdf_admission_reserved_bytes", self.reserved)
+
+    def _reject(self, kind, reason):
+        self._stats["rejected"] += 1
+        increment("ats_pdf_admission_total", kind=kind, outcome="rejected")
+        raise AdmissionRejected(reason)
+
+    def _acquire(self, cost, kind, timeout):
+        start = time.monotonic()
+        with self._condition:
+            if not self._waiting and self._fits(cost):
+                waited = False
+            else:
+                if len(self._waiting) >= self.max_queue:
+                    self._reject(kind, f"{len(self._waiting)} PDF jobs are already waiting")
+                ticket = object()
+                self._waiting.append(ticket)
+                self._publish()
+                deadline = start + timeout
+                try:
+                    # First come, first served, so large jobs are not starved
+                    # by a stream of small ones
+                    while not (self._waiting[0] is ticket and self._fits(cost)):
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._reject(kind, f"PDF job waited more than {timeout:g} seconds for admission")
+                        self._condition.wait(remaining)
+                finally:
+                    self._waiting.remove(ticket)
+                    self._publish()
+                    self._condition.notify_all()
+                waited = True
+            self.running += 1
+            self.reserved += cost
+            wait_seconds = time.monotonic() - start
+            self._stats["admitted"] += 1
+            self._stats["waited"] += waited
+            self._stats["wait_seconds"] += wait_seconds
+            self._publish()
+        increment("ats_pdf_admission_total", kind=kind, outcome="admitted")
+        observe("ats_pdf_admission_wait_seconds", wait_seconds, kind=kind)
+        return wait_seconds
+
+    def _release(self, cost):
+        with self._condition:
+            self.running -= 1
+            self.reserved -= cost
+            self._publish()
+            self._condition.notify_all()
+
+    @contextmanager
+    def admit(self, cost, kind="pdf", timeout=None):
+        # Yields the seconds spent waiting
+        wait_seconds = self._acquire(cost, kind, self.timeout if timeout is None else timeout)
+        try:
+            yield wait_seconds
+        finally:
+            self._release(cost)
+
+    def stats(self):
+        with self._condition:
+            return {
+                **self._stats,
+                "running": self.running,
+                "queued": len(self._waiting),
+                "reserved_bytes": self.reserved,
+                "memory_budget": self.memory_budget,
+                "max_concurrent": self.max_concurrent,
+            }
+
+
+def get_admission_controller():
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = AdmissionController()
+        return _controller
@@ -0,0 +1,248 @@
+import base64
+import hashlib
+import io
+import json
+import mmap
+import os
+import tempfile
+
+from cache import DiskCache, LRUCache, TwoTierCache
+from pdf_admission import extract_cost, get_admission_controller, render_cost
+from tracing import record_cache, record_size, traced
+
+
+# Rendering and text extraction results are cached by the SHA-256 of the PDF
+# bytes plus the parameters that affect the output, first in process memory and
+# then in a size-bounded directory on disk, so reruns and repeat uploads of the
+# same file skip poppler and pdfplumber entirely. Cache misses wait for
+# admission (see pdf_admission.py) before they start.
+
+PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR", os.path.join(".cache", "pdf"))
+PDF_CACHE_MAX_BYTES = int(os.getenv("PDF_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+PDF_CACHE_MEMORY_ENTRIES = int(os.getenv("PDF_CACHE_MEMORY_ENTRIES", 64))
+
+# Render settings: only the requested pages are rasterized, at this DPI, and
+# when a byte budget is set the JPEG quality (then the image size) is lowered
+# until the encoded page fits
+PDF_RENDER_DPI = int(os.getenv("PDF_RENDER_DPI", 200))
+PDF_RENDER_GRAYSCALE = os.getenv("PDF_RENDER_GRAYSCALE", "0").lower() in ("1", "true", "yes")
+PDF_RENDER_MAX_BYTES = int(os.getenv("PDF_RENDER_MAX_BYTES", 0)) or None
+JPEG_QUALITY = 75
+MIN_JPEG_QUALITY = 30
+
+# Uploads read from a plain stream are kept in memory up to this size and
+# spooled to a memory-mapped temporary file beyond it
+PDF_SPOOL_MAX_MEMORY = int(os.getenv("PDF_SPOOL_MAX_MEMORY", 8 * 1024 * 1024))
+
+# Joins page texts (a form feed, as pdftotext writes), so prompt compaction
+# can tell page headers and footers from repeated content
+PAGE_BREAK = "\f"
+
+_pdf_cache = None
+
+
+def get_pdf_cache():
+    global _pdf_cache
+    if _pdf_cache is None:
+        disk = DiskCache(PDF_CACHE_DIR, PDF_CACHE_MAX_BYTES) if PDF_CACHE_MAX_BYTES > 0 else None
+        _pdf_cache = TwoTierCache(LRUCache(PDF_CACHE_MEMORY_ENTRIES), disk)
+    return _pdf_cache
+
+def pdf_cache_key(kind, pdf_bytes, **params):
+    digest = hashlib.sha256(pdf_bytes).hexdigest()
+    params_json = json.dumps(params, sort_keys=True)
+    return hashlib.sha256(f"{kind}:{digest}:{params_json}".encode()).hexdigest()
+
+def encode_image(image, image_format="JPEG", max_bytes=None):
+    def encode(img, quality):
+        buffer = io.BytesIO()
+        if image_format == "JPEG":
+            img.save(buffer, format=image_format, quality=quality, optimize=True)
+        else:
+            img.save(buffer, format=image_format)
+        return buffer.getvalue()
+
+    data = encode(image, JPEG_QUALITY)
+    if max_bytes is None or len(data) <= max_bytes or image_format != "JPEG":
+        return data
+
+    # Binary search for the highest quality that fits the budget
+    low, high, best = MIN_JPEG_QUALITY, JPEG_QUALITY - 1, None
+    while low <= high:
+        quality = (low + high) // 2
+        candidate = encode(image, quality)
+        if len(candidate) <= max_bytes:
+            best, low = candidate, quality + 1
+        else:
+            high = quality - 1
+    if best is not None:
+        return best
+
+    # Still too large at the lowest quality, so shrink the page instead
+    while len(data) > max_bytes and min(image.size) > 100:
+        image = image.resize((int(image.width * 0.75), int(image.height * 0.75)))
+        data = encode(image, MIN_JPEG_QUALITY)
+    return data
+
+@traced("render_pdf")
+def render_pages(pdf_bytes, pages=(1,), dpi=None, grayscale=None, max_bytes=None, image_format="JPEG", pdf_path=None):
+    dpi = dpi or PDF_RENDER_DPI
+    grayscale = PDF_RENDER_GRAYSCALE if grayscale is None else grayscale
+    max_bytes = max_bytes or PDF_RENDER_MAX_BYTES
+    pages = list(pages)
+
+    cache = get_pdf_cache()
+    key = pdf_cache_key(
+        "render", pdf_bytes, pages=pages, dpi=dpi, grayscale=grayscale, max_bytes=max_bytes, image_format=image_format
+    )
+    pdf_parts = cache.get(key)
+    record_cache("pdf_render", pdf_parts is not None)
+    if pdf_parts is not None:
+        return pdf_parts
+
+    # Imported on first use so starting an app does not load poppler bindings
+    import pdf2image
+
+    with get_admission_controller().admit(render_cost(pdf_bytes, dpi, grayscale), "render"):
+        pdf_parts = []
+        for page in pages:
+            # One page at a time keeps a single bitmap in memory; a document
+            # that is already on disk is handed to poppler directly
+            if pdf_path is not None:
+                images = pdf2image.convert_from_path(
+                    pdf_path, dpi=dpi, first_page=page, last_page=page, grayscale=grayscale
+                )
+            else:
+                images = pdf2image.convert_from_bytes(
+                    pdf_bytes, dpi=dpi, first_page=page, last_page=page, grayscale=grayscale
+                )
+            if len(images) == 0:
+                continue
+            data = encode_image(images[0], image_format, max_bytes)
+            record_size("image_bytes", len(data))
+            images[0].close()
+            pdf_parts.append(
+                {
+                    "mime_type": f"image/{image_format.lower()}",
+                    "data": base64.b64encode(data).decode()
+                }
+            )
+    if not pdf_parts:
+        return None
+    cache.set(key, pdf_parts)
+    return pdf_parts
+
+@traced("extract_text")
+def extract_page_texts(pdf_bytes):
+    cache = get_pdf_cache()
+    key = pdf_cache_key("page_texts", pdf_bytes)
+    page_texts = cache.get(key)
+    record_cache("pdf_text", page_texts is not None)
+    if page_texts is not None:
+        return page_texts
+
+    import pdfplumber
+
+    with get_admission_controller().admit(extract_cost(pdf_bytes), "extract"):
+        with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+            page_texts = [page.extract_text() or "" for page in pdf.pages]
+    cache.set(key, page_texts)
+    return page_texts
+
+def extract_text(pdf_bytes):
+    return PAGE_BREAK.join(extract_page_texts(pdf_bytes))
+
+
+class PdfDocument:
+    # One uploaded PDF, read exactly once into a single buffer (a zero-copy
+    # view of an in-memory upload, or an mmap of a file on disk). Text, per-page
+    # text and rendered pages are computed lazily and memoized, so every
+    # consumer shares the same parse.
+    def __init__(self, data, path=None, closer=None):
+        self.data = data
+        self.path = path
+        self._closer = closer
+        self._digest = None
+        self._page_texts = None
+        self._renders = {}
+
+    @classmethod
+    def from_upload(cls, uploaded_file):
+        if isinstance(uploaded_file, cls):
+            return uploaded_file
+        if hasattr(uploaded_file, "getbuffer"):
+            return cls(uploaded_file.getbuffer())
+
+        uploaded_file.seek(0)
+        spool = tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_MEMORY)
+        size = 0
+        for chunk in iter(lambda: uploaded_file.read(1024 * 1024), b""):
+            spool.write(chunk)
+            size += len(chunk)
+        if size <= PDF_SPOOL_MAX_MEMORY:
+            spool.seek(0)
+            data = spool.read()
+            spool.close()
+            return cls(data)
+        spool.flush()
+        mapped = mmap.mmap(spool.fileno(), 0, access=mmap.ACCESS_READ)
+
+        def close():
+            mapped.close()
+            spool.close()
+        return cls(mapped, closer=close)
+
+    @classmethod
+    def from_path(cls, path):
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return cls(b"", path=path)
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, path=path, closer=mapped.close)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        # A view of an upload's buffer pins it, and the upload cannot be
+        # closed or resized until the view is released
+        if isinstance(self.data, memoryview):
+            self.data.release()
+        if self._closer is not None:
+            self._closer()
+            self._closer = None
+
+    @property
+    def sha256(self):
+        if self._digest is None:
+            self._digest = hashlib.sha256(self.data).hexdigest()
+        return self._digest
+
+    @property
+    def page_texts(self):
+        if self._page_texts is None:
+            self._page_texts = extract_page_texts(self.data)
+        return self._page_texts
+
+    @property
+    def text(self):
+        return PAGE_BREAK.join(self.page_texts)
+
+    @property
+    def page_count(self):
+        return len(self.page_texts)
+
+    def render(self, pages=(1,), dpi=None, grayscale=None, max_bytes=None, image_format="JPEG"):
+        key = (tuple(pages), dpi, grayscale, max_bytes, image_format)
+        if key not in self._renders:
+            self._renders[key] = render_pages(
+                self.data, pages, dpi=dpi, grayscale=grayscale, max_bytes=max_bytes,
+                image_format=image_format, pdf_path=self.path
+            )
+        return self._renders[key]
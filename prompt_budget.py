@@ -0,0 +1,225 @@
+import os
+import re
+
+from keywords import STOP_WORDS, tokenize
+from pdf_processing import PAGE_BREAK
+from tracing import increment, record_size, span
+
+
+# Keeps what is sent to Gemini inside a size budget. A payload that already
+# fits is sent exactly as given. Otherwise duplicate whitespace and
+# boilerplate lines are removed first: page markers such as "Page 2 of 3" and
+# "- 2 -", "references available upon request", and page headers and footers,
+# i.e. lines that repeat at the top or bottom of most pages (pages are
+# separated by PAGE_BREAK). A job description longer than its share of the
+# budget is cut at the end. If the resume text is still over budget, its
+# sections are ranked by keyword overlap with the job description and the
+# least relevant ones are left out; with mixed content, each text part gets a
+# share of the room left after the images. Tokens are estimated at
+# CHARS_PER_TOKEN characters each, which is close enough for budgeting English
+# text, and IMAGE_TOKENS per image part, as Gemini counts them.
+
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", 8000))
+CHARS_PER_TOKEN = 4
+IMAGE_TOKENS = 258
+# The resume always gets at least this much room, however long the JD is,
+# and the JD at least MIN_JD_CHARS, however long the resume is
+MIN_RESUME_CHARS = 2000
+MIN_JD_CHARS = 1000
+SECTION_MAX_LINES = 12
+# Lines from each end of a page that can be a header or footer; one keeps a
+# job title just under a repeated name from being taken for a header
+PAGE_FURNITURE_LINES = 1
+OMITTED_MARKER = "[...]"
+
+# Matched against whole lines. Bare numbers and "N/M" are left alone, since
+# they are as likely to be a GPA or an employment date as a page number.
+BOILERPLATE_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r"page \d+(\s*(of|/)\s*\d+)?",
+    r"-\s*\d{1,3}\s*-",
+    r"references (are )?(available )?(up)?on request\.?",
+    r"(curriculum vitae|resume|résumé)",
+)]
+
+
+def estimate_tokens(characters):
+    return -(-characters // CHARS_PER_TOKEN)
+
+def content_characters(content):
+    # Image parts count their base64 payload; a list holds text and image
+    # parts from the payload planner
+    if isinstance(content, list):
+        return sum(content_characters(part) for part in content)
+    return len(content.get("data", "")) if isinstance(content, dict) else len(str(content))
+
+def payload_characters(input_prompt, content, job_description):
+    return len(input_prompt) + content_characters(content) + len(job_description)
+
+def as_parts(content):
+    return content if isinstance(content, list) else [content]
+
+def text_parts(content):
+    return [part for part in as_parts(content) if isinstance(part, str)]
+
+def image_count(content):
+    return sum(1 for part in as_parts(content) if not isinstance(part, str))
+
+def payload_tokens(input_prompt, content, job_description):
+    characters = len(input_prompt) + sum(len(part) for part in text_parts(content)) + len(job_description)
+    return estimate_tokens(characters) + image_count(content) * IMAGE_TOKENS
+
+def normalize_whitespace(text):
+    lines = [" ".join(line.split()) for line in text.splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+def at_page_edge(lines, index):
+    return index < PAGE_FURNITURE_LINES or index >= len(lines) - PAGE_FURNITURE_LINES
+
+def page_furniture(pages):
+    # Lines at the top or bottom of at least two pages and of half of them
+    counts = {}
+    for lines in pages:
+        for line in {line for index, line in enumerate(lines) if line and at_page_edge(lines, index)}:
+            counts[line] = counts.get(line, 0) + 1
+    return {line for line, count in counts.items() if count >= 2 and count * 2 >= len(pages)}
+
+def strip_boilerplate(text):
+    pages = [normalize_whitespace(page).split("\n") for page in text.split(PAGE_BREAK)]
+    furniture = page_furniture(pages)
+    kept, seen = [], set()
+    for lines in pages:
+        for index, line in enumerate(lines):
+            if any(pattern.fullmatch(line) for pattern in BOILERPLATE_PATTERNS):
+                continue
+            # Headers and footers are kept once; the same line elsewhere on
+            # a page is content
+            if line in furniture and at_page_edge(lines, index):
+                if line in seen:
+                    continue
+                seen.add(line)
+            kept.append(line)
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(kept)).strip()
+
+def is_heading(line):
+    return len(line.split()) <= 4 and (line.isupper() or line.endswith(":"))
+
+def split_sections(text, max_lines=SECTION_MAX_LINES):
+    # Sections start at headings and blank lines; long ones are cut into
+    # chunks so ranking can keep the relevant part of a long job history
+    sections, current = [], []
+    for line in text.split("\n"):
+        if not line or is_heading(line):
+            if current:
+                sections.append(current)
+            current = [line] if line else []
+            continue
+        current.append(line)
+        if len(current) >= max_lines:
+            sections.append(current)
+            current = []
+    if current:
+        sections.append(current)
+    return ["\n".join(section) for section in sections]
+
+def truncate(text, max_chars):
+    # Keeps the start of the text, cut at a line or word break
+    if len(text) <= max_chars:
+        return text
+    limit = max(max_chars - len(OMITTED_MARKER) - 1, 0)
+    cut = max(text.rfind("\n", 0, limit + 1), text.rfind(" ", 0, limit + 1))
+    return text[:cut if cut > 0 else limit].rstrip() + "\n" + OMITTED_MARKER
+
+def fit_to_budget(text, job_description, max_chars):
+    sections = split_sections(text)
+    if not sections:
+        return text, 0
+    job_terms = set(tokenize(job_description)) - STOP_WORDS
+    overlaps = [len(set(tokenize(section)) & job_terms) for section in sections]
+
+    # The first section (name and contact details) is always kept, cut down
+    # if it alone is over the budget
+    sections[0] = truncate(sections[0], max_chars - len(OMITTED_MARKER) - 2)
+    selected = {0}
+    used = len(sections[0])
+    for index in sorted(range(1, len(sections)), key=lambda i: (-overlaps[i], i)):
+        size = len(sections[index]) + 2
+        if used + size + len(OMITTED_MARKER) <= max_chars:
+            selected.add(index)
+            used += size
+
+    parts = []
+    for index, section in enumerate(sections):
+        if index in selected:
+            parts.append(section)
+        elif parts[-1] != OMITTED_MARKER:
+            parts.append(OMITTED_MARKER)
+    return "\n\n".join(parts), len(sections) - len(selected)
+
+def split_room(sizes, room):
+    # Gives each text part a share of the room in proportion to its size
+    total = sum(sizes)
+    if total <= room:
+        return list(sizes)
+    return [max(room * size // total, 0) for size in sizes]
+
+def fit_payload(input_prompt, content, job_description, token_budget):
+    # Cleans an over-budget payload, then cuts the JD and the resume text;
+    # returns the new payload and the number of resume sections left out
+    input_prompt = normalize_whitespace(input_prompt)
+    job_description = normalize_whitespace(job_description)
+    if isinstance(content, list):
+        content = [strip_boilerplate(part) if isinstance(part, str) else part for part in content]
+    elif isinstance(content, str):
+        content = strip_boilerplate(content)
+    sections_dropped = 0
+    room = token_budget * CHARS_PER_TOKEN - len(input_prompt) - image_count(content) * IMAGE_TOKENS * CHARS_PER_TOKEN
+    resume_chars = sum(len(part) for part in text_parts(content))
+    # The resume keeps up to half the room; the JD may use the rest
+    reserved = min(resume_chars, max(room // 2, MIN_RESUME_CHARS))
+    job_description = truncate(job_description, max(room - reserved, MIN_JD_CHARS))
+    available = max(room - len(job_description), MIN_RESUME_CHARS)
+    if resume_chars > available and isinstance(content, str):
+        content, sections_dropped = fit_to_budget(content, job_description, available)
+    elif resume_chars > available and isinstance(content, list):
+        shares = iter(split_room([len(part) for part in text_parts(content)], available))
+        fitted = []
+        for part in content:
+            if isinstance(part, str):
+                share = next(shares)
+                if len(part) > share:
+                    part, dropped = fit_to_budget(part, job_description, share)
+                    sections_dropped += dropped
+            fitted.append(part)
+        content = fitted
+    return input_prompt, content, job_description, sections_dropped
+
+def compact_payload(input_prompt, content, job_description, token_budget=PROMPT_TOKEN_BUDGET):
+    # Returns the compacted prompt, content and JD plus a report of the
+    # reduction. A payload within the budget is returned unchanged. Image
+    # parts are always passed through. over_budget is set when the result
+    # still does not fit, e.g. because of the minimum shares or the images
+    # alone.
+    with span("compact_prompt") as report:
+        original = payload_characters(input_prompt, content, job_description)
+        jd_chars = len(job_description)
+        sections_dropped = 0
+        if payload_tokens(input_prompt, content, job_description) > token_budget:
+            input_prompt, content, job_description, sections_dropped = fit_payload(
+                input_prompt, content, job_description, token_budget
+            )
+        compacted = payload_characters(input_prompt, content, job_description)
+        estimated_tokens = payload_tokens(input_prompt, content, job_description)
+        report.update({
+            "original_chars": original,
+            "compacted_chars": compacted,
+            "estimated_tokens": estimated_tokens,
+            "reduction_pct": round((1 - compacted / original) * 100, 2) if original else 0,
+            "sections_dropped": sections_dropped,
+            "jd_chars_dropped": max(jd_chars - len(job_description), 0),
+            "over_budget": estimated_tokens > token_budget,
+        })
+    record_size("prompt_chars_original", original)
+    record_size("prompt_chars", compacted)
+    if report["over_budget"]:
+        increment("ats_prompt_over_budget_total")
+    return input_prompt, content, job_description, dict(report)
@@ -0,0 +1,72 @@
+INDUSTRY_TEMPLATES = {
+    "Technology": {
+        "sections": ["Summary", "Technical Skills", "Work Experience", "Projects", "Education"],
+        "keywords": ["programming", "software development", "agile", "cloud computing"]
+    },
+    "Finance": {
+        "sections": ["Professional Summary", "Core Qualifications", "Professional Experience", "Education", "Certifications"],
+        "keywords": ["financial analysis", "risk management", "investment strategies", "market research"]
+    },
+    "Healthcare": {
+        "sections": ["Professional Summary", "Clinical Experience", "Education", "Certifications", "Skills"],
+        "keywords": ["patient care", "medical procedures", "healthcare regulations", "electronic health records"]
+    },
+    "Business": {
+        "sections": ["Executive Summary", "Core Competencies", "Professional Experience", "Achievements", "Education"],
+        "keywords": ["strategic planning", "project management", "business development", "data analysis", "leadership"]
+    },
+    "Sales": {
+        "sections": ["Professional Summary", "Sales Achievements", "Work Experience", "Skills", "Education"],
+        "keywords": ["revenue growth", "client acquisition", "negotiation", "CRM", "sales strategies"]
+    }
+}
+
+ANALYSIS_TYPES = ["Comprehensive Review", "Skill Gap Analysis", "Keyword Optimization", "ATS Match Score"]
+
+
+def generate_prompt(analysis_type, industry):
+    if analysis_type == "Comprehensive Review":
+        return f"""Provide a comprehensive evaluation of the resume for a {industry} position:
+        1. Overall Match: Provide a percentage and brief explanation.
+        2. Key Strengths: Identify and explain the top 3-5 strengths relevant to the job.
+        3. Experience Analysis: Evaluate the relevance and depth of the candidate's experience.
+        4. Skills Assessment: Analyze the alignment of the candidate's skills with job requirements.
+        5. Education Relevance: Comment on the applicant's educational background in relation to the position.
+        6. Achievements: Highlight notable accomplishments and their relevance.
+        7. Improvement Areas: Suggest 3-5 specific areas for enhancement.
+        8. ATS Optimization Tips: Provide actionable advice to improve ATS compatibility.
+        9. Overall Impression: Summarize the candidate's suitability in 2-3 sentences.
+        """
+    elif analysis_type == "Skill Gap Analysis":
+        return f"""Conduct a thorough skill gap analysis for the {industry} position:
+        1. Required Skills: List the key skills required for the job based on the description.
+        2. Matching Skills: Identify skills in the resume that align with job requirements.
+        3. Missing Skills: Highlight important skills mentioned in the job description but missing from the resume.
+        4. Skill Proficiency: Assess the apparent level of expertise in matching skills.
+        5. Transferable Skills: Identify skills that, while not exact matches, could be valuable for the role.
+        6. Skill Development Recommendations: Suggest ways to acquire or improve crucial skills.
+        7. Industry Trends: Mention any emerging skills in the {industry} field that could enhance the application.
+        """
+    elif analysis_type == "Keyword Optimization":
+        return f"""Analyze and optimize the resume for key {industry} keywords:
+        1. Job Description Keywords: Extract and list important keywords from the job description.
+        2. Resume Keyword Matches: Identify keywords in the resume that match the job description.
+        3. Missing Keywords: List important keywords from the job description not found in the resume.
+        4. Keyword Placement: Suggest optimal sections to incorporate missing keywords.
+        5. Keyword Density: Evaluate the appropriate use and frequency of keywords.
+        6. Industry-Specific Terminology: Suggest relevant {industry} terms to include.
+        7. Action Verbs: Recommend powerful action verbs to enhance impact.
+        8. Keyword Integration Tips: Provide advice on naturally incorporating keywords into the resume.
+        """
+    else:  # ATS Match Score
+        return f"""Evaluate the resume's ATS compatibility for a {industry} position:
+        1. Overall ATS Score: Provide a percentage score for ATS compatibility.
+        2. Formatting Analysis: Assess the resume's format for ATS readability.
+        3. Keyword Match: Calculate the percentage of job description keywords found in the resume.
+        4. Section Headers: Evaluate the use of standard, ATS-friendly section headings.
+        5. Contact Information: Check for proper placement and completeness of contact details.
+        6. Work History Format: Analyze the presentation of work experience for ATS parsing.
+        7. Education Section: Assess the formatting of educational qualifications.
+        8. Skills Section: Evaluate the presentation and relevance of the skills section.
+        9. ATS Optimization Recommendations: Provide specific tips to improve ATS compatibility.
+        """
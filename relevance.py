@@ -0,0 +1,188 @@
+import argparse
+import json
+import math
+import os
+import sys
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+from batch_scoring import build_presence_matrix, build_vocabulary
+from keywords import count_keywords
+
+
+# BM25 relevance as an alternative match mode to plain keyword overlap. The
+# resume is the document and the job description's keywords are the query.
+# IDF statistics are fitted once over a corpus of job descriptions and saved
+# as a float32 .npy file, memory-mapped on load, next to the sorted
+# vocabulary. Each JD term a resume contains adds its IDF weight, saturated by
+# how often the resume repeats it (k1) and normalized for the resume's length
+# against the average resume length (b), so rare terms like "kubernetes" count
+# for far more than filler words that get past the stopword list. A score is
+# the resume's BM25 score as a percentage of what an average-length resume
+# mentioning every JD term once would get, capped at 100. One sparse product
+# scores a resume against every job description.
+#
+#   python relevance.py job_descriptions/ --resumes resumes/ -o .cache/idf_model
+
+IDF_MODEL_DIR = os.getenv("IDF_MODEL_DIR", os.path.join(".cache", "idf_model"))
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_idf_model = None
+_idf_model_dir = None
+
+
+class IdfModel:
+    def __init__(self, vocabulary, idf, document_count, average_length):
+        # vocabulary is sorted and idf[i] belongs to vocabulary[i];
+        # average_length is the mean keyword count of a scored resume
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.document_count = document_count
+        self.average_length = average_length
+        self._index = None
+
+    @classmethod
+    def fit(cls, job_descriptions, resumes=()):
+        # The average length comes from the sample resumes when there are
+        # any, otherwise from the job descriptions
+        document_frequency = Counter()
+        total_length = 0
+        for text in job_descriptions:
+            keywords = count_keywords(text)
+            document_frequency.update(keywords.keys())
+            total_length += sum(keywords.values())
+        if not document_frequency:
+            raise ValueError("The job descriptions contain no keywords")
+        count = len(job_descriptions)
+        vocabulary = sorted(document_frequency)
+        frequencies = np.array([document_frequency[term] for term in vocabulary], dtype=np.float64)
+        idf = np.log1p((count - frequencies + 0.5) / (frequencies + 0.5)).astype(np.float32)
+        if resumes:
+            average_length = sum(sum(count_keywords(text).values()) for text in resumes) / len(resumes)
+        else:
+            average_length = total_length / count
+        return cls(vocabulary, idf, count, average_length)
+
+    @property
+    def unseen_idf(self):
+        # Terms missing from the corpus are treated as the rarest possible
+        return math.log1p((self.document_count + 0.5) / 0.5)
+
+    def term_idf(self, term):
+        if self._index is None:
+            self._index = {term: i for i, term in enumerate(self.vocabulary)}
+        index = self._index.get(term)
+        return self.unseen_idf if index is None else float(self.idf[index])
+
+    def save(self, directory=IDF_MODEL_DIR):
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "vocabulary.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(self.vocabulary))
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"document_count": self.document_count, "average_length": self.average_length}, f)
+        np.save(os.path.join(directory, "idf.npy"), np.asarray(self.idf, dtype=np.float32))
+
+    @classmethod
+    def load(cls, directory=IDF_MODEL_DIR):
+        idf = np.load(os.path.join(directory, "idf.npy"), mmap_mode="r")
+        with open(os.path.join(directory, "vocabulary.txt"), "r", encoding="utf-8") as f:
+            vocabulary = f.read().split("\n")
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if len(vocabulary) != len(idf):
+            raise ValueError(f"IDF model in {directory} is inconsistent: {len(vocabulary)} terms, {len(idf)} weights")
+        return cls(vocabulary, idf, meta["document_count"], meta["average_length"])
+
+
+def get_idf_model(directory=IDF_MODEL_DIR):
+    # None when no model has been built yet
+    global _idf_model, _idf_model_dir
+    if _idf_model is None or _idf_model_dir != directory:
+        if not os.path.exists(os.path.join(directory, "idf.npy")):
+            return None
+        _idf_model = IdfModel.load(directory)
+        _idf_model_dir = directory
+    return _idf_model
+
+
+class BM25Scorer:
+    def __init__(self, model, job_descriptions, k1=BM25_K1, b=BM25_B):
+        job_keywords = [count_keywords(text) for text in job_descriptions]
+        self.vocabulary = build_vocabulary(job_keywords)
+        self.k1 = k1
+        self.b = b
+        self.average_length = model.average_length
+        idf = np.array([model.term_idf(term) for term in self.vocabulary], dtype=np.float64)
+        # Each JD term counts once, weighted by its IDF
+        self.weights = sparse.csr_matrix(
+            build_presence_matrix(job_keywords, self.vocabulary).multiply(idf[np.newaxis, :]), dtype=np.float64
+        )
+        self.totals = np.asarray(self.weights.sum(axis=1)).ravel()
+
+    def term_saturation(self, resume_keywords):
+        # resumes x vocabulary matrix of tf * (k1 + 1) / (tf + k1 * length norm),
+        # which is 1 for a term mentioned once in an average-length resume
+        rows, cols, frequencies = [], [], []
+        lengths = np.zeros(len(resume_keywords), dtype=np.float64)
+        for row, keywords in enumerate(resume_keywords):
+            lengths[row] = sum(keywords.values())
+            for term, frequency in keywords.items():
+                col = self.vocabulary.get(term)
+                if col is not None:
+                    rows.append(row)
+                    cols.append(col)
+                    frequencies.append(frequency)
+        if self.average_length:
+            norms = self.k1 * (1 - self.b + self.b * lengths / self.average_length)
+        else:
+            norms = np.full(len(resume_keywords), self.k1)
+        frequencies = np.array(frequencies, dtype=np.float64)
+        saturated = frequencies * (self.k1 + 1) / (frequencies + norms[np.array(rows, dtype=np.int64)])
+        return sparse.csr_matrix(
+            (saturated, (rows, cols)), shape=(len(resume_keywords), len(self.vocabulary)), dtype=np.float64
+        )
+
+    def score_matrix(self, resume_keywords):
+        # resumes x job descriptions, as percentages of each JD's weight
+        scores = (self.term_saturation(resume_keywords) @ self.weights.T).toarray()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percentages = np.minimum(scores / self.totals * 100, 100)
+        percentages[:, self.totals == 0] = 0
+        return np.round(percentages, 2)
+
+    def score(self, resume_text):
+        return self.score_matrix([count_keywords(resume_text)])[0]
+
+
+def read_texts(paths):
+    texts = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.lower().endswith(".txt"):
+                        with open(os.path.join(root, name), "r", encoding="utf-8") as f:
+                            texts.append(f.read())
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                texts.append(f.read())
+    return texts
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit BM25 IDF statistics over a corpus of job descriptions.")
+    parser.add_argument("paths", nargs="+", help="Job description .txt files or directories of them")
+    parser.add_argument("--resumes", nargs="+", default=[], metavar="PATH",
+                        help="Sample resume .txt files or directories, for the average resume length")
+    parser.add_argument("-o", "--output", default=IDF_MODEL_DIR, help="Directory to write the model to")
+    args = parser.parse_args(argv)
+
+    texts = read_texts(args.paths)
+    model = IdfModel.fit(texts, read_texts(args.resumes))
+    model.save(args.output)
+    print(f"Fitted IDF over {model.document_count} job descriptions, {len(model.vocabulary)} terms -> {args.output}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import argparse
+import json
+import os
+import sqlite3
+import threading
+
+from keywords import count_keywords
+
+
+# On-disk inverted index (term -> resume ids and term counts) over the resume
+# corpus. A query only reads the posting lists of the job description's terms,
+# so finding the best resumes does not scan every stored document.
+# screen_resumes.py --resume-index fills it during a screening run.
+#
+#   python resume_index.py backend.txt -k 20
+
+RESUME_INDEX_PATH = os.getenv("RESUME_INDEX_PATH", os.path.join(".cache", "resume_index.db"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    resume_id TEXT PRIMARY KEY,
+    term_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    resume_id TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (term, resume_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_by_resume ON postings (resume_id);
+"""
+
+
+class ResumeIndex:
+    def __init__(self, path=RESUME_INDEX_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        # The connection is shared between threads; a transaction from one
+        # must not interleave with statements from another
+        self._lock = threading.RLock()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write_document(self, resume_id, keywords):
+        self.conn.execute("DELETE FROM postings WHERE resume_id = ?", (resume_id,))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO documents (resume_id, term_count) VALUES (?, ?)",
+            (resume_id, len(keywords)),
+        )
+        self.conn.executemany(
+            "INSERT INTO postings (term, resume_id, count) VALUES (?, ?, ?)",
+            [(term, resume_id, count) for term, count in keywords.items()],
+        )
+
+    def add_document(self, resume_id, resume_text=None, keywords=None):
+        if keywords is None:
+            keywords = count_keywords(resume_text)
+        with self._lock, self.conn:
+            self._write_document(resume_id, keywords)
+
+    def add_documents(self, documents):
+        # documents: iterable of (resume_id, resume_text), written in one transaction
+        documents = [(resume_id, count_keywords(resume_text)) for resume_id, resume_text in documents]
+        with self._lock, self.conn:
+            for resume_id, keywords in documents:
+                self._write_document(resume_id, keywords)
+
+    def remove_document(self, resume_id):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM postings WHERE resume_id = ?", (resume_id,))
+            self.conn.execute("DELETE FROM documents WHERE resume_id = ?", (resume_id,))
+
+    def __contains__(self, resume_id):
+        with self._lock:
+            row = self.conn.execute("SELECT 1 FROM documents WHERE resume_id = ?", (resume_id,)).fetchone()
+        return row is not None
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def query(self, job_description, k=10):
+        job_keywords = count_keywords(job_description)
+        if not job_keywords:
+            return []
+
+        # Job descriptions can have more terms than SQLite allows as bound
+        # parameters, so the query terms are bound as one JSON array
+        with self._lock:
+            rows = self.conn.execute(
+                """
+                WITH query_terms (term) AS (SELECT value FROM json_each(?))
+                SELECT postings.resume_id, COUNT(*) AS matched, SUM(postings.count) AS hits
+                FROM query_terms JOIN postings ON postings.term = query_terms.term
+                GROUP BY postings.resume_id
+                ORDER BY matched DESC, hits DESC, postings.resume_id
+                LIMIT ?
+                """,
+                (json.dumps(list(job_keywords)), k),
+            ).fetchall()
+
+        # Same percentage as keyword_match_percentage
+        total_job_keywords = len(job_keywords)
+        return [(resume_id, round((matched / total_job_keywords) * 100, 2)) for resume_id, matched, _ in rows]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List the indexed resumes that best match a job description.")
+    parser.add_argument("job_description", help="Job description text file")
+    parser.add_argument("-k", type=int, default=10, help="Number of resumes to list")
+    parser.add_argument("--index", default=RESUME_INDEX_PATH, help="Index database (default: RESUME_INDEX_PATH)")
+    args = parser.parse_args(argv)
+
+    with open(args.job_description, "r", encoding="utf-8") as f:
+        job_description = f.read()
+    with ResumeIndex(args.index) as index:
+        for resume_id, match in index.query(job_description, args.k):
+            print(f"{match:6.2f}%  {resume_id}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import threading
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from keywords import count_keywords, keyword_match_percentage
+from pdf_processing import PdfDocument
+from prompts import ANALYSIS_TYPES, INDUSTRY_TEMPLATES, generate_prompt
+from tracing import record_cache, write_metrics_file
+
+
+# Headless bulk screening: extracts every PDF in a directory in a process pool,
+# scores it against one or more job descriptions and streams one record per
+# (resume, job description) pair to JSONL or CSV as soon as each resume is done.
+# Pairs already present in the output file are skipped, so an interrupted run
+# can simply be started again with the same arguments. With --store, texts,
+# keyword counts, scores and analyses also go to the SQLite analysis store,
+# and with --resume-index each resume's keywords go to the inverted index that
+# resume_index.py queries.
+# A resume whose MinHash signature is a near-duplicate of one already seen in
+# the run reuses that resume's analyses instead of calling the model again.
+#
+#   python screen_resumes.py resumes/ --jd backend.txt --jd data.txt -o results.jsonl
+
+CSV_FIELDS = ["resume", "job_description", "match_percentage", "analysis", "error", "duplicate_of"]
+SCREENING = "Screening"
+
+_minhasher = None
+
+
+def get_minhasher():
+    # One per worker process
+    global _minhasher
+    if _minhasher is None:
+        from near_duplicates import MinHasher
+
+        _minhasher = MinHasher()
+    return _minhasher
+
+def score_resume(path, job_descriptions, keep_text=False, scorer=None, signature=False):
+    # Runs in a worker process; job_descriptions is a list of (name, text).
+    # With a BM25Scorer the resume is scored against every JD in one product.
+    try:
+        with PdfDocument.from_path(path) as document:
+            resume_text = document.text
+            source_sha256 = document.sha256
+    except Exception as e:
+        return {"resume": path, "error": f"Error extracting text from PDF: {str(e)}", "scores": {}}
+    resume_keywords = count_keywords(resume_text)
+    if scorer is not None:
+        relevance = scorer.score_matrix([resume_keywords])[0]
+        scores = {name: float(score) for (name, _), score in zip(job_descriptions, relevance)}
+    else:
+        scores = {
+            name: keyword_match_percentage(resume_keywords, count_keywords(text))
+            for name, text in job_descriptions
+        }
+    result = {"resume": path, "error": "", "scores": scores}
+    if keep_text:
+        result["text"] = resume_text
+        result["keywords"] = resume_keywords
+        result["source_sha256"] = source_sha256
+    if signature:
+        result["signature"] = get_minhasher().signature(resume_text)
+    return result
+
+def analyze_resume(result, job_descriptions, analysis_type, industry, use_cache=True):
+    # Runs on the LLM thread pool in the main process
+    from gemini_client import generate_response
+    from model_scheduler import BATCH
+
+    prompt = generate_prompt(analysis_type, industry)
+    analyses, errors = {}, {}
+    for name, text in job_descriptions:
+        try:
+            analyses[name] = generate_response(prompt, result["text"], text, use_cache=use_cache, priority=BATCH)
+        except Exception as e:
+            errors[name] = f"Error generating AI response: {str(e)}"
+    result["analyses"] = analyses
+    result["analysis_errors"] = errors
+    return result
+
+def reuse_analyses(result, original):
+    result["analyses"] = original["analyses"]
+    result["analysis_errors"] = original["analysis_errors"]
+    return result
+
+def store_result(store, result, job_descriptions, analysis_type, industry, match_mode):
+    # One transaction per resume
+    if result["error"] or not result["text"].strip():
+        return
+    with store.batch():
+        document = store.add_document(
+            result["text"], candidate=os.path.basename(result["resume"]),
+            source_sha256=result["source_sha256"], keywords=result["keywords"],
+        )
+        for name, text in job_descriptions:
+            jd = store.add_job_description(text, title=name)
+            store.record_analysis(
+                document, jd, analysis_type or SCREENING, result.get("analyses", {}).get(name),
+                result["scores"].get(name), os.path.basename(result["resume"]),
+                industry if analysis_type else "", match_mode,
+            )
+
+def result_records(result, job_descriptions):
+    for name, _ in job_descriptions:
+        error = result["error"] or result.get("analysis_errors", {}).get(name, "")
+        yield {
+            "resume": result["resume"],
+            "job_description": name,
+            "match_percentage": result["scores"].get(name),
+            "analysis": result.get("analyses", {}).get(name, ""),
+            "error": error,
+            "duplicate_of": result.get("duplicate_of", ""),
+        }
+
+
+def complete_length(text, output_format):
+    # Length of the text up to the end of its last complete record
+    if output_format != "csv":
+        return text.rfind("\n") + 1
+    end = consumed = 0
+    lines = io.StringIO(text, newline="")
+
+    def read_lines():
+        # The reader pulls exactly the lines of each row before yielding it
+        nonlocal consumed
+        for line in lines:
+            consumed += len(line)
+            yield line
+    try:
+        for row in csv.reader(read_lines()):
+            if len(row) == len(CSV_FIELDS) and text[consumed - 1:consumed] == "\n":
+                end = consumed
+    except csv.Error:
+        pass
+    return end
+
+def truncate_partial_record(path, output_format):
+    # A run interrupted mid-write leaves part of a record at the end; it is
+    # cut off so the next record does not join it
+    if not os.path.exists(path):
+        return
+    with open(path, "r+", newline="", encoding="utf-8", errors="replace") as f:
+        text = f.read()
+        end = complete_length(text, output_format)
+        if end < len(text):
+            f.seek(0)
+            f.truncate(len(text[:end].encode("utf-8")))
+
+
+class RecordWriter:
+    def __init__(self, path, output_format):
+        self.path = path
+        self.output_format = output_format
+        self._lock = threading.Lock()
+        truncate_partial_record(path, output_format)
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self.file = open(path, "a", newline="", encoding="utf-8")
+        if output_format == "csv":
+            self.csv_writer = csv.DictWriter(self.file, fieldnames=CSV_FIELDS)
+            if not exists:
+                self.csv_writer.writeheader()
+
+    def write(self, record):
+        with self._lock:
+            if self.output_format == "csv":
+                self.csv_writer.writerow(record)
+            else:
+                self.file.write(json.dumps(record) + "\n")
+            self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+def completed_pairs(path, output_format):
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, newline="", encoding="utf-8") as f:
+        if output_format == "csv":
+            rows = csv.DictReader(f)
+        else:
+            rows = []
+            for line in f:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    # A line cut short by an interruption is redone
+                    continue
+        for row in rows:
+            # A row cut short by an interruption is missing fields
+            if None in row or None in row.values() or not row.get("resume") or not row.get("job_description"):
+                continue
+            done.add((row["resume"], row["job_description"]))
+    return done
+
+def load_job_descriptions(paths):
+    job_descriptions = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            job_descriptions.append((os.path.basename(path), f.read()))
+    return job_descriptions
+
+def find_resumes(directory):
+    paths = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.lower().endswith(".pdf"):
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Screen a directory of PDF resumes against job descriptions.")
+    parser.add_argument("resume_dir", help="Directory containing PDF resumes (searched recursively)")
+    parser.add_argument("--jd", action="append", required=True, help="Job description text file (repeatable)")
+    parser.add_argument("-o", "--output", required=True, help="Output file (.jsonl or .csv)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Output format (default: from the output extension)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Processes used for PDF extraction")
+    parser.add_argument("--match-mode", choices=["overlap", "bm25"], default="overlap",
+                        help="Keyword overlap percentage or BM25 relevance")
+    parser.add_argument("--idf-model", help="IDF model directory for --match-mode bm25 (default: IDF_MODEL_DIR)")
+    parser.add_argument("--llm", choices=ANALYSIS_TYPES, help="Also run this Gemini analysis for every pair")
+    parser.add_argument("--industry", choices=list(INDUSTRY_TEMPLATES.keys()), default="Technology")
+    parser.add_argument("--llm-concurrency", type=int, default=2, help="Maximum concurrent Gemini requests")
+    parser.add_argument("--no-cache", action="store_true", help="Do not reuse cached Gemini responses")
+    parser.add_argument("--duplicate-threshold", type=float, default=None,
+                        help="Jaccard similarity above which a resume reuses an earlier analysis (default: DUPLICATE_THRESHOLD)")
+    parser.add_argument("--no-dedup", action="store_true", help="Analyze near-duplicate resumes separately")
+    parser.add_argument("--restart", action="store_true", help="Ignore existing output and screen everything again")
+    parser.add_argument("--store", nargs="?", const="", metavar="PATH",
+                        help="Also save results to the analysis store (default path: ANALYSIS_STORE_PATH)")
+    parser.add_argument("--resume-index", nargs="?", const="", metavar="PATH",
+                        help="Also add resumes to the resume index (default path: RESUME_INDEX_PATH)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    output_format = args.format or ("csv" if args.output.lower().endswith(".csv") else "jsonl")
+    job_descriptions = load_job_descriptions(args.jd)
+
+    if args.restart and os.path.exists(args.output):
+        os.remove(args.output)
+    done = completed_pairs(args.output, output_format)
+    resumes = [
+        path for path in find_resumes(args.resume_dir)
+        if any((path, name) not in done for name, _ in job_descriptions)
+    ]
+    print(f"{len(resumes)} resumes to screen ({len(done)} pairs already done)", file=sys.stderr)
+
+    scorer = None
+    if args.match_mode == "bm25":
+        from relevance import IDF_MODEL_DIR, BM25Scorer, IdfModel, get_idf_model
+
+        model = get_idf_model(args.idf_model or IDF_MODEL_DIR)
+        if model is None:
+            print("No IDF model found; fitting IDF over the given job descriptions", file=sys.stderr)
+            model = IdfModel.fit([text for _, text in job_descriptions])
+        scorer = BM25Scorer(model, [text for _, text in job_descriptions])
+
+    llm_executor = None
+    if args.llm:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        llm_executor = ThreadPoolExecutor(max_workers=args.llm_concurrency)
+
+    store = None
+    if args.store is not None:
+        from analysis_store import ANALYSIS_STORE_PATH, AnalysisStore
+
+        store = AnalysisStore(args.store or ANALYSIS_STORE_PATH)
+
+    resume_index = None
+    if args.resume_index is not None:
+        from resume_index import RESUME_INDEX_PATH, ResumeIndex
+
+        resume_index = ResumeIndex(args.resume_index or RESUME_INDEX_PATH)
+
+    # Analyses of the resumes seen so far, by path (None while they are still
+    # running, when a near-duplicate waits for them). Only the analyses are
+    # kept, not the resume text, so memory does not grow with the corpus.
+    index = None
+    if not args.no_dedup:
+        from near_duplicates import DUPLICATE_THRESHOLD, LshIndex
+
+        threshold = DUPLICATE_THRESHOLD if args.duplicate_threshold is None else args.duplicate_threshold
+        index = LshIndex(threshold)
+    originals = {}
+    waiting = defaultdict(list)
+
+    writer = RecordWriter(args.output, output_format)
+    finished = 0
+    duplicates = 0
+
+    def finish(result):
+        nonlocal finished
+        if store is not None and "text" in result:
+            store_result(store, result, job_descriptions, args.llm, args.industry, args.match_mode)
+        if resume_index is not None and not result["error"] and result.get("keywords"):
+            resume_index.add_document(result["resume"], keywords=result["keywords"])
+        for record in result_records(result, job_descriptions):
+            if (record["resume"], record["job_description"]) not in done:
+                writer.write(record)
+        finished += 1
+        duplicate = f" (duplicate of {result['duplicate_of']})" if result.get("duplicate_of") else ""
+        print(f"[{finished}/{len(resumes)}] {result['resume']}{duplicate}", file=sys.stderr)
+        if result["resume"] in originals:
+            originals[result["resume"]] = {
+                "analyses": result.get("analyses", {}), "analysis_errors": result.get("analysis_errors", {}),
+            }
+        for copy in waiting.pop(result["resume"], []):
+            finish(reuse_analyses(copy, result))
+
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            pending = {
+                pool.submit(
+                    score_resume, path, job_descriptions,
+                    bool(args.llm or store) or resume_index is not None, scorer, index is not None,
+                )
+                for path in resumes
+            }
+            # Futures on the LLM pool; their results are finished, never
+            # analyzed again
+            analyzing = set()
+            while pending:
+                completed, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    result = future.result()
+                    if future in analyzing:
+                        analyzing.discard(future)
+                        finish(result)
+                        continue
+                    signature = result.pop("signature", None)
+                    if signature is not None:
+                        match = index.find_duplicate(signature)
+                        record_cache("near_duplicate", match is not None)
+                        if match is not None:
+                            result["duplicate_of"] = match[0]
+                            duplicates += 1
+                            if llm_executor is not None:
+                                original = originals[match[0]]
+                                if original is None:
+                                    waiting[match[0]].append(result)
+                                    continue
+                                reuse_analyses(result, original)
+                        else:
+                            index.add(result["resume"], signature)
+                            if llm_executor is not None:
+                                originals[result["resume"]] = None
+                    if llm_executor is not None and "text" in result and "analyses" not in result:
+                        future = llm_executor.submit(
+                            analyze_resume, result, job_descriptions, args.llm, args.industry, not args.no_cache
+                        )
+                        analyzing.add(future)
+                        pending.add(future)
+                        continue
+                    finish(result)
+        if index is not None:
+            print(f"{duplicates} near-duplicate resumes found", file=sys.stderr)
+    finally:
+        writer.close()
+        if store is not None:
+            store.close()
+        if resume_index is not None:
+            resume_index.close()
+        # Only the main process's metrics (LLM calls); extraction runs in workers
+        write_metrics_file()
+        if llm_executor is not None:
+            llm_executor.shutdown(wait=False, cancel_futures=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import hashlib
+
+import streamlit as st
+
+
+# Streamlit reruns the whole script on every widget change. session_memo keeps
+# the last result of an expensive step in st.session_state, keyed on the
+# upload's file_id or a hash of the input text, so reruns caused by unrelated
+# widgets reuse it. Each name holds a single entry, so a session never keeps
+# more than one result per step.
+
+MEMO_STATE_KEY = "_session_memo"
+
+
+def text_key(*texts):
+    digest = hashlib.sha256()
+    for text in texts:
+        digest.update(str(text).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+def upload_key(uploaded_file):
+    # file_id changes on every new upload, even of a file with the same name
+    file_id = getattr(uploaded_file, "file_id", None)
+    return file_id or f"{uploaded_file.name}:{uploaded_file.size}"
+
+def session_memo(name, key, compute):
+    # Nothing is stored when compute() raises
+    memo = st.session_state.setdefault(MEMO_STATE_KEY, {})
+    entry = memo.get(name)
+    if entry is not None and entry[0] == key:
+        return entry[1]
+    value = compute()
+    memo[name] = (key, value)
+    return value
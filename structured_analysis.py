@@ -0,0 +1,150 @@
+import json
+import re
+
+from gemini_client import MODEL_NAME, generate_response
+from model_scheduler import INTERACTIVE
+
+
+# Full reports in a single model call. Every analysis section comes back in
+# one JSON object together with per-area scores, missing keywords and
+# recommendations, so charts and metrics read parsed fields instead of
+# scraping percentages out of markdown.
+
+SCORE_AREAS = ["Technical Skills", "Experience", "Education", "Project Relevance", "Soft Skills"]
+VERDICTS = ["Highly Recommend", "Recommend", "Consider", "Do Not Recommend"]
+
+NUMBER_PATTERN = re.compile(r"-?\d+(?:\.\d+)?")
+FENCE_PATTERN = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+
+def report_schema(section_names):
+    # OpenAPI-style schema passed to Gemini as response_schema
+    string_list = {"type": "array", "items": {"type": "string"}}
+    return {
+        "type": "object",
+        "properties": {
+            "overall_score": {"type": "integer"},
+            "scores": {
+                "type": "object",
+                "properties": {area: {"type": "integer"} for area in SCORE_AREAS},
+                "required": SCORE_AREAS,
+            },
+            "missing_keywords": string_list,
+            "strengths": string_list,
+            "recommendations": string_list,
+            "verdict": {"type": "string"},
+            "sections": {
+                "type": "object",
+                "properties": {name: {"type": "string"} for name in section_names},
+                "required": list(section_names),
+            },
+        },
+        "required": ["overall_score", "scores", "missing_keywords", "recommendations", "sections"],
+    }
+
+def report_prompt(sections):
+    # sections maps a section name to the instructions for that section
+    instructions = "\n\n".join(f'"{name}":\n{text.strip()}' for name, text in sections.items())
+    return f"""You are an experienced ATS (Applicant Tracking System) expert. Evaluate the resume against the job description and reply with a single JSON object containing:
+- "overall_score": overall match from 0 to 100
+- "scores": a 0-100 score for each of {", ".join(SCORE_AREAS)}
+- "missing_keywords": important job description keywords that the resume lacks
+- "strengths": the candidate's main strengths for this role
+- "recommendations": specific, actionable improvements
+- "verdict": one of {", ".join(VERDICTS)}
+- "sections": one markdown string per section below, following its instructions
+
+{instructions}
+"""
+
+def extract_json(text):
+    # JSON mode returns a bare object; otherwise look inside a code fence or
+    # between the outermost braces
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    fenced = FENCE_PATTERN.search(text)
+    if fenced:
+        text = fenced.group(1)
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end < start:
+        raise ValueError("The model response does not contain a JSON object")
+    return json.loads(text[start:end + 1])
+
+def parse_score(value):
+    # Accepts 85, 85.0, "85", "85%" and "85/100"; anything else is None
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        number = value
+    else:
+        match = NUMBER_PATTERN.search(str(value))
+        if not match:
+            return None
+        number = float(match.group())
+    if number != number or number in (float("inf"), float("-inf")):
+        return None
+    return max(0, min(100, int(round(number))))
+
+def _strings(value):
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list):
+        return []
+    return [str(item).strip() for item in value if item is not None and str(item).strip()]
+
+def _markdown(value):
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return "\n".join(f"- {item}" for item in _strings(value))
+    if isinstance(value, dict):
+        return "\n".join(f"**{key}**: {item}" for key, item in value.items())
+    return str(value)
+
+def parse_report(text, section_names=()):
+    # Raises ValueError when no JSON object can be recovered; missing or
+    # malformed fields fall back to empty values
+    data = extract_json(text)
+    if not isinstance(data, dict):
+        raise ValueError("The model response is not a JSON object")
+
+    raw_scores = data.get("scores")
+    scores = {}
+    if isinstance(raw_scores, dict):
+        for area, value in raw_scores.items():
+            score = parse_score(value)
+            if score is not None:
+                scores[str(area)] = score
+    overall_score = parse_score(data.get("overall_score"))
+    if overall_score is None and scores:
+        overall_score = round(sum(scores.values()) / len(scores))
+
+    raw_sections = data.get("sections") if isinstance(data.get("sections"), dict) else {}
+    names = list(section_names) or list(raw_sections)
+    verdict = str(data.get("verdict") or "").strip()
+    return {
+        "overall_score": overall_score,
+        "scores": scores,
+        "missing_keywords": _strings(data.get("missing_keywords")),
+        "strengths": _strings(data.get("strengths")),
+        "recommendations": _strings(data.get("recommendations")),
+        "verdict": verdict if verdict in VERDICTS else "",
+        "sections": {name: _markdown(raw_sections.get(name)) for name in names},
+    }
+
+def generate_report(sections, content, job_description, model_name=MODEL_NAME, use_cache=True, priority=INTERACTIVE):
+    section_names = list(sections)
+    generation_config = {
+        "response_mime_type": "application/json",
+        "response_schema": report_schema(section_names),
+    }
+    text = generate_response(
+        report_prompt(sections), content, job_description, model_name, use_cache,
+        generation_config=generation_config,
+        # Responses that cannot be parsed are not cached
+        validate=lambda response: parse_report(response, section_names),
+        priority=priority,
+    )
+    return parse_report(text, section_names)
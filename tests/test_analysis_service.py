@@ -0,0 +1,121 @@
+import base64
+import http.client
+import json
+import threading
+import time
+
+import pytest
+
+import analysis_service
+from analysis_service import AnalysisServer, BadRequest, QueueFull, WorkerPool, parse_analysis_request
+
+
+@pytest.mark.parametrize("payload, message", [
+    ({"job_description": 5, "resume_text": "Python developer"}, "job_description must be a string"),
+    ({"job_description": ["Python"], "resume_text": "Python developer"}, "job_description must be a string"),
+    ({"job_description": "Python", "resume_text": ["Python developer"]}, "resume_text must be a string"),
+    ({"job_description": "Python", "resume_text": 7}, "resume_text must be a string"),
+    ({"job_description": "Python", "resume_text": "Python developer", "industry": ["Technology"]}, "industry must be one of"),
+    ({"job_description": "Python", "resume_text": "Python developer", "analysis_type": {}}, "analysis_type must be one of"),
+    ({"job_description": "Python", "resume_pdf": 12}, "resume_pdf must be base64-encoded"),
+    ({"job_description": "Python", "resume_pdf": "not base64!"}, "resume_pdf must be base64-encoded"),
+    ({"job_description": "Python"}, "resume_text or resume_pdf is required"),
+])
+def test_invalid_fields_are_bad_requests(payload, message):
+    with pytest.raises(BadRequest, match=message):
+        parse_analysis_request(json.dumps(payload))
+
+def test_valid_request_is_parsed():
+    request = parse_analysis_request(json.dumps({
+        "job_description": "Python developer",
+        "resume_pdf": base64.b64encode(b"%PDF-1.4").decode(),
+        "industry": "Finance",
+        "analysis_type": "ATS Match Score",
+    }))
+    assert request["resume_pdf"] == b"%PDF-1.4"
+    assert request["resume_text"] is None
+    assert request["industry"] == "Finance"
+    assert request["use_cache"] is True
+
+
+def wait_for(condition):
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+def request(server, method, path, payload=None):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=10)
+    try:
+        body = json.dumps(payload) if payload is not None else None
+        connection.request(method, path, body=body, headers={"Content-Type": "application/json"})
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), json.loads(response.read())
+    finally:
+        connection.close()
+
+@pytest.fixture
+def blocked_analyses(monkeypatch):
+    # Analyses wait until released
+    release = threading.Event()
+
+    def run(request):
+        release.wait(5)
+        return {"match_percentage": 50.0}
+    monkeypatch.setattr(analysis_service, "run_analysis_request", run)
+    yield release
+    release.set()
+
+@pytest.fixture
+def server():
+    server = AnalysisServer(("127.0.0.1", 0), workers=1, queue_size=1, request_timeout=10)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_full_queue_raises_queue_full():
+    release = threading.Event()
+    pool = WorkerPool(workers=1, queue_size=1)
+    try:
+        running = pool.submit(release.wait, 5)
+        wait_for(lambda: pool.stats()["busy_workers"] == 1)
+        queued = pool.submit(lambda: "queued")
+        assert pool.saturated
+        with pytest.raises(QueueFull):
+            pool.submit(lambda: "rejected")
+        release.set()
+        assert running.result(5) is True and queued.result(5) == "queued"
+        assert not pool.saturated
+        stats = pool.stats()
+        assert stats["completed"] == 2 and stats["rejected"] == 1
+    finally:
+        release.set()
+        pool.shutdown()
+
+def test_saturated_service_answers_429_and_is_not_ready(server, blocked_analyses):
+    payload = {"job_description": "Python developer", "resume_text": "Python engineer"}
+    responses = []
+
+    def post():
+        responses.append(request(server, "POST", "/analyze", payload))
+    assert request(server, "GET", "/readyz")[0] == 200
+    clients = [threading.Thread(target=post) for _ in range(2)]
+    clients[0].start()
+    wait_for(lambda: server.pool.stats()["busy_workers"] == 1)
+    clients[1].start()
+    wait_for(lambda: server.pool.saturated)
+
+    status, headers, body = request(server, "POST", "/analyze", payload)
+    assert status == 429 and headers["Retry-After"] == "1" and "queue is full" in body["error"]
+    status, _, body = request(server, "GET", "/readyz")
+    assert status == 503 and body["status"] == "saturated" and body["rejected"] == 1
+
+    blocked_analyses.set()
+    for client in clients:
+        client.join()
+    assert [status for status, _, _ in responses] == [200, 200]
+    status, _, body = request(server, "GET", "/readyz")
+    assert status == 200 and body["status"] == "ready"
@@ -0,0 +1,49 @@
+import threading
+
+from analysis_store import AnalysisStore
+
+
+def test_readers_are_not_blocked_by_an_open_batch(tmp_path):
+    store = AnalysisStore(str(tmp_path / "analyses.db"))
+    document = store.add_document("python developer", candidate="jane.pdf", source_sha256="pdf")
+    in_batch, release = threading.Event(), threading.Event()
+
+    def write():
+        with store.batch():
+            store.add_document("rust developer", candidate="john.pdf")
+            # Uncommitted writes are visible to the thread running the batch
+            assert store.find_document_by_source("pdf")["sha256"] == document
+            assert store.get_document(store.add_document("go developer")) is not None
+            in_batch.set()
+            release.wait(5)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    assert in_batch.wait(5)
+    results = []
+    readers = [
+        threading.Thread(target=lambda: results.append(store.find_document_by_source("pdf")))
+        for _ in range(8)
+    ]
+    for reader in readers:
+        reader.start()
+    for reader in readers:
+        reader.join(2)
+    # Every read finished while the batch still held the writer
+    assert not any(reader.is_alive() for reader in readers)
+    assert [result["sha256"] for result in results] == [document] * 8
+    release.set()
+    writer.join(5)
+    store.close()
+
+def test_read_connections_are_pooled(tmp_path):
+    store = AnalysisStore(str(tmp_path / "analyses.db"), readers=2)
+    store.add_document("python developer", source_sha256="pdf")
+    threads = [threading.Thread(target=store.find_document_by_source, args=("pdf",)) for _ in range(50)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert store._readers.qsize() <= 2
+    store.close()
+    assert store._readers.qsize() == 0
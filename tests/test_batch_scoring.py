@@ -0,0 +1,42 @@
+import random
+
+from batch_scoring import batch_percentage_match
+from benchmarks.corpus import generate_corpus
+from keywords import count_keywords
+
+
+def calculate_percentage_match(resume_text, job_description):
+    # The per-pair scorer app2.py used before batch scoring
+    resume_keywords = count_keywords(resume_text)
+    job_keywords = count_keywords(job_description)
+    matching_keywords = set(resume_keywords.keys()) & set(job_keywords.keys())
+    total_job_keywords = len(job_keywords)
+    if total_job_keywords == 0:
+        return 0
+    match_percentage = (len(matching_keywords) / total_job_keywords) * 100
+    return round(match_percentage, 2)
+
+
+def test_matrix_matches_per_pair_scores_on_the_corpus():
+    corpus = generate_corpus(seed=0, resumes=40, job_descriptions=8)
+    resumes = [resume["text"] for resume in corpus["resumes"]]
+    job_descriptions = [jd["text"] for jd in corpus["job_descriptions"]]
+    matrix = batch_percentage_match(resumes, job_descriptions)
+    assert matrix.shape == (len(resumes), len(job_descriptions))
+    for i, resume in enumerate(resumes):
+        for j, job_description in enumerate(job_descriptions):
+            assert matrix[i, j] == calculate_percentage_match(resume, job_description)
+
+def test_matrix_matches_per_pair_scores_on_edge_cases():
+    rng = random.Random(0)
+    words = [f"skill{i}" for i in range(30)]
+    # Job descriptions with 3, 6, 7 and 9 keywords give repeating decimals
+    # and values that round on a tie; empty and stopword-only ones score 0
+    job_descriptions = [" ".join(rng.sample(words, size)) for size in (3, 6, 7, 9, 30)]
+    job_descriptions += ["", "the and of", "Python python PYTHON"]
+    resumes = [" ".join(rng.sample(words, size)) for size in range(0, 31, 3)]
+    resumes += ["", "python", "Skill1, skill2; skill3!"]
+    matrix = batch_percentage_match(resumes, job_descriptions)
+    for i, resume in enumerate(resumes):
+        for j, job_description in enumerate(job_descriptions):
+            assert matrix[i, j] == calculate_percentage_match(resume, job_description)
@@ -0,0 +1,76 @@
+import os
+
+from cache import DiskCache, LRUCache, TwoTierCache
+
+
+def age(cache, key, seconds_ago):
+    # DiskCache orders entries by mtime; set it explicitly instead of sleeping
+    path = cache._path(key)
+    mtime = os.path.getmtime(path) - seconds_ago
+    os.utime(path, (mtime, mtime))
+
+
+def test_lru_cache_evicts_the_least_recently_used_entry():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None and cache.get("a") == 1 and cache.get("c") == 3
+    cache.set("a", 10)
+    cache.set("d", 4)
+    assert cache.get("c") is None and cache.get("a") == 10
+    assert len(cache) == 2
+
+def test_disk_cache_evicts_oldest_files_over_the_byte_budget(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=100)
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.set(key, "x" * 30)
+        age(cache, key, 100 - i * 10)
+    # A hit refreshes the file, so "b" is now the oldest
+    assert cache.get("a") == "x" * 30
+    cache.set("d", "x" * 30)
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in ("a", "c", "d")] == ["x" * 30] * 3
+    assert cache._total_bytes == sum(os.path.getsize(cache._path(key)) for key in ("a", "c", "d")) <= 100
+
+def test_disk_cache_skips_oversized_values_and_survives_restarts(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=100)
+    cache.set("big", "x" * 200)
+    assert cache.get("big") is None
+    cache.set("a", {"pages": [1, 2]})
+    reopened = DiskCache(str(tmp_path), max_bytes=100)
+    assert reopened.get("a") == {"pages": [1, 2]}
+    assert reopened._total_bytes == cache._total_bytes
+    # Unreadable files count as misses
+    with open(reopened._path("broken"), "w") as f:
+        f.write("{not json")
+    assert reopened.get("broken", "default") == "default"
+
+def test_two_tier_cache_promotes_disk_hits_to_memory(tmp_path):
+    memory, disk = LRUCache(max_entries=1), DiskCache(str(tmp_path), max_bytes=1000)
+    cache = TwoTierCache(memory, disk)
+    cache.set("a", "first")
+    cache.set("b", "second")
+    # "a" fell out of memory but is still on disk
+    assert memory.get("a") is None
+    assert cache.get("a") == "first"
+    assert memory.get("a") == "first" and memory.get("b") is None
+    assert cache.get("missing", "default") == "default"
+
+def test_two_tier_cache_disk_eviction_leaves_memory_hits(tmp_path):
+    memory, disk = LRUCache(max_entries=4), DiskCache(str(tmp_path), max_bytes=40)
+    cache = TwoTierCache(memory, disk)
+    cache.set("a", "x" * 30)
+    age(disk, "a", 100)
+    cache.set("b", "y" * 30)
+    assert disk.get("a") is None
+    assert cache.get("a") == "x" * 30
+    cache.clear()
+    assert cache.get("a") is None and cache.get("b") is None and len(memory) == 0
+
+def test_memory_only_two_tier_cache():
+    cache = TwoTierCache(LRUCache(max_entries=1))
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") is None and cache.get("b") == 2
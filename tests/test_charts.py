@@ -0,0 +1,70 @@
+import gc
+import random
+import tracemalloc
+
+import pytest
+
+import charts
+from benchmarks.chart_memory import random_scores, rss_bytes
+from cache import LRUCache
+from charts import CHART_CACHE_ENTRIES, clear_chart_cache, render_skill_match_chart
+
+
+RENDERS = 2000
+MATPLOTLIB_WARMUP = 50
+MATPLOTLIB_RENDERS = 150
+MATPLOTLIB_CACHE_ENTRIES = 16
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_chart_cache()
+    yield
+    clear_chart_cache()
+
+
+def test_native_renders_do_not_grow_memory():
+    rng = random.Random(0)
+    # Fill the cache first, so later renders only replace entries
+    for _ in range(CHART_CACHE_ENTRIES + 50):
+        render_skill_match_chart(random_scores(rng), "native")
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in range(RENDERS):
+            render_skill_match_chart(random_scores(rng), "native")
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert after - before < 256 * 1024
+    assert len(charts._chart_cache) == CHART_CACHE_ENTRIES
+
+def test_matplotlib_renders_do_not_grow_memory(monkeypatch):
+    pytest.importorskip("matplotlib")
+    from matplotlib.figure import Figure
+
+    # PNG renders are slow, so a smaller cache and fewer renders. RSS moves
+    # by several MB between renders as the allocator reuses pages, so the
+    # bound is loose; live figures are the exact check for a leak.
+    monkeypatch.setattr(charts, "_chart_cache", LRUCache(MATPLOTLIB_CACHE_ENTRIES))
+    rng = random.Random(1)
+    for _ in range(MATPLOTLIB_WARMUP):
+        render_skill_match_chart(random_scores(rng), "matplotlib")
+    gc.collect()
+    before = rss_bytes()
+    for _ in range(MATPLOTLIB_RENDERS):
+        render_skill_match_chart(random_scores(rng), "matplotlib")
+    gc.collect()
+    assert rss_bytes() - before < 32 * 2**20
+    assert not any(isinstance(obj, Figure) for obj in gc.get_objects())
+    assert len(charts._chart_cache) == MATPLOTLIB_CACHE_ENTRIES
+
+def test_repeated_scores_are_served_from_the_cache(monkeypatch):
+    calls = []
+    monkeypatch.setitem(charts.RENDERERS, "native", lambda skills, scores: calls.append(scores) or "<svg/>")
+    scores = {"Python": 80, "SQL": 40}
+    for _ in range(10):
+        assert render_skill_match_chart(scores, "native") == "<svg/>"
+    assert len(calls) == 1
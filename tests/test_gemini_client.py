@@ -0,0 +1,15 @@
+import sys
+
+import pytest
+
+import gemini_client
+
+
+def test_cached_model_is_returned_without_the_sdk(monkeypatch):
+    stub = object()
+    monkeypatch.setitem(gemini_client._models, "stub-model", stub)
+    # An import of the SDK now raises ImportError
+    monkeypatch.setitem(sys.modules, "google.generativeai", None)
+    assert gemini_client.get_model("stub-model") is stub
+    with pytest.raises(ImportError):
+        gemini_client.get_model("uncached-model")
@@ -0,0 +1,115 @@
+import random
+
+import pytest
+
+from analysis import generate_improvement_suggestions
+from keywords import (
+    STOP_WORDS, IncrementalScorer, PhraseMatcher, _common_prefix_length, _common_suffix_length, count_keywords,
+    get_phrase_matcher, keyword_match_percentage, tokenize,
+)
+
+
+WORDS = ["python", "Python", "sql", "the", "and", "kubernetes", "data-driven", "C++", "café", "x2", "team", "Lead"]
+FRAGMENTS = WORDS + [" ", "  ", "\n", ",", ".", "-", "_", "é", "2", "ab"]
+
+
+def random_text(rng, length):
+    return "".join(rng.choice(FRAGMENTS) for _ in range(length))
+
+def random_edit(rng, text):
+    # Insert, delete or replace a run anywhere, including at either end and
+    # in the middle of a word
+    start = rng.randint(0, len(text))
+    end = min(len(text), start + rng.choice([0, 0, 1, 2, 5, 20]))
+    insert = random_text(rng, rng.choice([0, 1, 1, 2, 4]))
+    if not insert and start == end:
+        insert = rng.choice(FRAGMENTS)
+    return text[:start] + insert + text[end:]
+
+def assert_matches_full_recount(scorer):
+    resume_keywords = count_keywords(scorer.resume_text)
+    job_keywords = count_keywords(scorer.job_description)
+    assert scorer.resume_keywords == resume_keywords
+    assert scorer.job_keywords == job_keywords
+    assert scorer.match_percentage == keyword_match_percentage(resume_keywords, job_keywords)
+    assert scorer.missing_keywords == sorted(set(job_keywords) - set(resume_keywords))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_edits_match_a_full_recount(seed):
+    rng = random.Random(seed)
+    resume, job_description = random_text(rng, 60), random_text(rng, 40)
+    scorer = IncrementalScorer(resume, job_description)
+    assert_matches_full_recount(scorer)
+    for _ in range(100):
+        if rng.random() < 0.8:
+            resume = random_edit(rng, resume)
+            scorer.update(resume)
+        else:
+            job_description = random_edit(rng, job_description)
+            scorer.update(job_description=job_description)
+        assert_matches_full_recount(scorer)
+
+def test_texts_cleared_and_replaced_match_a_full_recount():
+    rng = random.Random(0)
+    scorer = IncrementalScorer(random_text(rng, 50), random_text(rng, 50))
+    for resume, job_description in (("", None), (random_text(rng, 50), ""), ("", ""), (random_text(rng, 80), random_text(rng, 80))):
+        scorer.update(resume, job_description)
+        assert_matches_full_recount(scorer)
+
+@pytest.mark.parametrize("length", [0, 1, 255, 256, 257, 1000])
+def test_common_prefix_and_suffix_lengths(length):
+    rng = random.Random(length)
+    head, tail = random_text(rng, length), random_text(rng, length)
+    old, new = head + "OLD" + tail, head + "NEW!" + tail
+    prefix = _common_prefix_length(old, new)
+    assert old[:prefix] == new[:prefix] and (prefix == len(old) or old[prefix] != new[prefix])
+    limit = min(len(old), len(new)) - prefix
+    suffix = _common_suffix_length(old, new, limit)
+    assert suffix <= limit and old[len(old) - suffix:] == new[len(new) - suffix:]
+    assert suffix == limit or old[len(old) - suffix - 1] != new[len(new) - suffix - 1]
+
+def brute_force_find(phrases, text):
+    tokens = tokenize(text)
+    counts = {}
+    for phrase in dict.fromkeys(phrases):
+        pattern = tokenize(phrase)
+        hits = sum(tokens[i:i + len(pattern)] == pattern for i in range(len(tokens) - len(pattern) + 1)) if pattern else 0
+        if hits:
+            counts[phrase] = hits
+    return counts
+
+@pytest.mark.parametrize("seed", range(20))
+def test_phrase_matcher_agrees_with_brute_force(seed):
+    rng = random.Random(seed)
+    vocabulary = ["risk", "management", "project", "data", "analysis", "risk-management", "the", "Data"]
+    # Overlapping phrases, phrases inside other phrases and repeated tokens
+    phrases = [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 3))) for _ in range(15)]
+    phrases += ["risk management", "management", "risk risk", "", "--"]
+    text = " ".join(rng.choice(vocabulary + [",", "\n"]) for _ in range(300))
+    assert dict(PhraseMatcher(phrases).find(text)) == brute_force_find(phrases, text)
+
+@pytest.mark.parametrize("text, keywords", [
+    ("You're a great fit", {"great": 1, "fit": 1}),
+    ("we'll see what you've done and that'll shouldn't matter", {"see": 1, "done": 1, "matter": 1}),
+    ("It's DON'T won't", {}),
+    ("o'reilly re-org ma'am", {"reilly": 1, "org": 1}),
+])
+def test_contractions_of_stop_words_are_removed(text, keywords):
+    assert dict(count_keywords(text)) == keywords
+
+def test_stop_words_are_single_tokens():
+    assert all(tokenize(word) == [word] for word in STOP_WORDS)
+    assert {"you", "re", "ll", "t", "s"} <= STOP_WORDS and "you're" not in STOP_WORDS
+
+def test_suggestions_match_template_and_job_description_phrases():
+    get_phrase_matcher.cache_clear()
+    resume = "Led risk management and market research for a trading desk using python"
+    job_description = "Python analyst for risk management, investment strategies and financial analysis"
+    suggestions = generate_improvement_suggestions(resume, job_description, "Finance")
+    missing_job, missing_industry = suggestions[0], suggestions[1]
+    assert "python" not in missing_job and "risk" not in missing_job and "analyst" in missing_job
+    # Phrases in the job description come first, matched phrases are not suggested
+    assert missing_industry.endswith(": financial analysis, investment strategies")
+    assert "risk management" not in missing_industry and "market research" not in missing_industry
+    assert get_phrase_matcher.cache_info().currsize == 1
@@ -0,0 +1,108 @@
+import pytest
+
+import llm_cache
+from llm_cache import ResponseCache, cached_generate, response_cache_key
+
+
+RESUME = "Senior python engineer"
+JD = "Backend engineer, python and kubernetes"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llm_cache.time, "time", clock)
+    return clock
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch, clock):
+    cache = ResponseCache(str(tmp_path / "responses.db"), ttl=60, max_bytes=100)
+    monkeypatch.setattr(llm_cache, "_response_cache", cache)
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_ENABLED", True)
+    return cache
+
+def generator(responses):
+    calls = []
+
+    def generate():
+        calls.append(1)
+        return responses[len(calls) - 1]
+    return generate, calls
+
+
+def test_repeated_request_is_answered_from_the_cache(cache):
+    generate, calls = generator(["first", "second"])
+    assert cached_generate("gemini", "prompt", RESUME, JD, generate) == "first"
+    assert cached_generate("gemini", "prompt", RESUME, JD, generate) == "first"
+    assert len(calls) == 1
+
+def test_key_changes_with_model_prompt_and_inputs():
+    key = response_cache_key("gemini-a", "prompt", RESUME, JD)
+    assert key == response_cache_key("gemini-a", "prompt", RESUME, JD)
+    others = [
+        response_cache_key("gemini-b", "prompt", RESUME, JD),
+        response_cache_key("gemini-a", "prompt 2", RESUME, JD),
+        response_cache_key("gemini-a", "prompt", RESUME + ".", JD),
+        response_cache_key("gemini-a", "prompt", RESUME, JD + "."),
+        response_cache_key("gemini-a", "prompt", [RESUME, {"mime_type": "image/jpeg", "data": "AAAA"}], JD),
+    ]
+    assert len({key, *others}) == len(others) + 1
+
+def test_other_model_or_prompt_is_not_served_from_the_cache(cache):
+    generate, calls = generator(["a", "b", "c"])
+    assert cached_generate("gemini-a", "prompt", RESUME, JD, generate) == "a"
+    assert cached_generate("gemini-b", "prompt", RESUME, JD, generate) == "b"
+    assert cached_generate("gemini-a", "other prompt", RESUME, JD, generate) == "c"
+    assert len(calls) == 3
+
+def test_entries_expire_after_the_ttl(cache, clock):
+    generate, calls = generator(["old", "new"])
+    cached_generate("gemini", "prompt", RESUME, JD, generate)
+    clock.now += 59
+    assert cached_generate("gemini", "prompt", RESUME, JD, generate) == "old"
+    clock.now += 2
+    assert cached_generate("gemini", "prompt", RESUME, JD, generate) == "new"
+    assert len(calls) == 2
+
+def test_least_recently_used_entries_are_evicted(cache, clock):
+    keys = [response_cache_key("gemini", f"prompt {i}", RESUME, JD) for i in range(3)]
+    for key in keys:
+        clock.now += 1
+        cache.set(key, "gemini", "x" * 40)
+    # keys[0] would be evicted, but a hit makes keys[1] the oldest
+    assert cache.get(keys[0]) is None
+    clock.now += 1
+    assert cache.get(keys[1]) == "x" * 40
+    clock.now += 1
+    cache.set(response_cache_key("gemini", "prompt 3", RESUME, JD), "gemini", "x" * 40)
+    assert cache.get(keys[1]) == "x" * 40
+    assert cache.get(keys[2]) is None
+    # A response larger than the whole store is not kept
+    cache.set(keys[0], "gemini", "x" * 101)
+    assert cache.get(keys[0]) is None
+
+def test_use_cache_false_neither_reads_nor_writes(cache):
+    generate, calls = generator(["a", "b", "c"])
+    cached_generate("gemini", "prompt", RESUME, JD, generate)
+    assert cached_generate("gemini", "prompt", RESUME, JD, generate, use_cache=False) == "b"
+    assert cached_generate("gemini", "prompt 2", RESUME, JD, generate, use_cache=False) == "c"
+    assert cache.get(response_cache_key("gemini", "prompt 2", RESUME, JD)) is None
+    assert len(calls) == 3
+
+def test_invalid_and_empty_responses_are_not_stored(cache):
+    def reject(response):
+        raise ValueError("not JSON")
+    generate, calls = generator(["not json", "", "{}"])
+    with pytest.raises(ValueError):
+        cached_generate("gemini", "prompt", RESUME, JD, generate, validate=reject)
+    assert cached_generate("gemini", "prompt", RESUME, JD, generate) == ""
+    assert cached_generate("gemini", "prompt", RESUME, JD, generate) == "{}"
+    assert len(calls) == 3
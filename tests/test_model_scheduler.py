@@ -0,0 +1,158 @@
+import threading
+import time
+
+import pytest
+
+import model_scheduler
+from model_scheduler import BATCH, INTERACTIVE, DeadlineExceeded, RequestScheduler
+
+
+class ModelError(Exception):
+    # Like google.api_core errors: the HTTP status is in .code
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+@pytest.fixture
+def scheduler():
+    # No rate limit to wait for, one worker so the queue order is observable
+    scheduler = RequestScheduler(requests_per_minute=60_000, burst=100, workers=1, max_retries=3)
+    yield scheduler
+    scheduler.shutdown()
+
+@pytest.fixture
+def delays(monkeypatch):
+    # Backoff delays are recorded per attempt and kept short
+    delays = []
+    monkeypatch.setattr(model_scheduler, "backoff_delay", lambda attempt, base, maximum: delays.append(attempt) or 0.01)
+    return delays
+
+def block_worker(scheduler):
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocker(remaining):
+        started.set()
+        release.wait(5)
+        return "blocker"
+    future = scheduler.submit(blocker)
+    assert started.wait(5)
+    return release, future
+
+
+def test_interactive_requests_go_ahead_of_batch_work(scheduler):
+    release, _ = block_worker(scheduler)
+    order = []
+    futures = [
+        scheduler.submit(lambda remaining, name=name: order.append(name), priority)
+        for name, priority in (("batch1", BATCH), ("batch2", BATCH), ("interactive1", INTERACTIVE),
+                               ("batch3", BATCH), ("interactive2", INTERACTIVE))
+    ]
+    release.set()
+    for future in futures:
+        future.result(5)
+    assert order == ["interactive1", "interactive2", "batch1", "batch2", "batch3"]
+
+def test_retryable_errors_are_retried_with_backoff(scheduler, delays):
+    attempts = []
+
+    def flaky(remaining):
+        attempts.append(remaining)
+        if len(attempts) < 3:
+            raise ModelError(503) if len(attempts) == 1 else TimeoutError()
+        return "ok"
+    assert scheduler.call(flaky) == "ok"
+    assert len(attempts) == 3 and delays == [0, 1]
+    stats = scheduler.stats()
+    assert stats["retried"] == 2 and stats["succeeded"] == 1 and stats["failed"] == 0
+
+def test_retries_stop_at_max_retries(scheduler, delays):
+    attempts = []
+
+    def overloaded(remaining):
+        attempts.append(remaining)
+        raise ModelError(500)
+    with pytest.raises(ModelError):
+        scheduler.call(overloaded)
+    assert len(attempts) == 4 and scheduler.stats()["failed"] == 1
+
+def test_rate_limit_drains_the_bucket(scheduler, delays):
+    attempts = []
+
+    def limited(remaining):
+        attempts.append(remaining)
+        if len(attempts) == 1:
+            raise ModelError(429)
+        return "ok"
+    assert scheduler.call(limited) == "ok"
+    assert scheduler.stats()["rate_limited"] == 1
+
+@pytest.mark.parametrize("error", [ModelError(400), ModelError(403), ValueError("bad prompt")])
+def test_other_errors_are_not_retried(scheduler, delays, error):
+    attempts = []
+
+    def broken(remaining):
+        attempts.append(remaining)
+        raise error
+    with pytest.raises(type(error)):
+        scheduler.call(broken)
+    assert len(attempts) == 1
+    assert scheduler.stats()["retried"] == 0 and scheduler.stats()["failed"] == 1
+
+def test_request_expires_while_queued(scheduler):
+    release, _ = block_worker(scheduler)
+    calls = []
+    future = scheduler.submit(calls.append, timeout=0.05)
+    time.sleep(0.1)
+    release.set()
+    with pytest.raises(DeadlineExceeded):
+        future.result(5)
+    assert calls == [] and scheduler.stats()["expired"] == 1
+
+def test_call_gives_up_at_the_deadline(scheduler):
+    release, _ = block_worker(scheduler)
+    calls = []
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        scheduler.call(calls.append, timeout=0.1)
+    assert time.monotonic() - started < 1
+    release.set()
+    # Cancelled, so it is never sent
+    scheduler.call(lambda remaining: None)
+    assert calls == []
+
+def test_retry_that_would_miss_the_deadline_fails(scheduler, monkeypatch):
+    monkeypatch.setattr(model_scheduler, "backoff_delay", lambda attempt, base, maximum: 10.0)
+    attempts = []
+
+    def overloaded(remaining):
+        attempts.append(remaining)
+        raise ModelError(503)
+    with pytest.raises(ModelError):
+        scheduler.call(overloaded, timeout=1)
+    assert len(attempts) == 1
+
+def test_shutdown_stops_the_workers():
+    scheduler = RequestScheduler(requests_per_minute=60_000, burst=100, workers=3)
+    assert scheduler.call(lambda remaining: "ok") == "ok"
+    scheduler.shutdown()
+    assert not any(thread.is_alive() for thread in scheduler._threads)
+    calls = []
+    future = scheduler.submit(calls.append)
+    time.sleep(0.05)
+    assert calls == [] and not future.done()
+
+def test_token_bucket_refills_at_the_rate(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(model_scheduler.time, "monotonic", lambda: now[0])
+    bucket = model_scheduler.TokenBucket(rate=2.0, capacity=2)
+    assert bucket.try_acquire() == 0 and bucket.try_acquire() == 0
+    assert bucket.try_acquire() == pytest.approx(0.5)
+    now[0] += 0.5
+    assert bucket.try_acquire() == 0
+    bucket.refund()
+    bucket.drain()
+    assert bucket.try_acquire() == pytest.approx(0.5)
+    now[0] += 60
+    assert [bucket.try_acquire() for _ in range(3)] == [0, 0, pytest.approx(0.5)]
@@ -0,0 +1,137 @@
+import json
+import random
+import threading
+import time
+
+import pytest
+
+import screen_resumes
+from near_duplicates import LshIndex, MinHasher, _band_probability, estimated_jaccard, lsh_parameters
+
+
+WORDS = [f"term{i}" for i in range(3000)]
+
+
+def random_text(rng, length=500):
+    return " ".join(rng.choice(WORDS) for _ in range(length))
+
+def edited(text, rng, edits=3):
+    tokens = text.split()
+    for _ in range(edits):
+        tokens[rng.randrange(len(tokens))] = "edited"
+    return " ".join(tokens)
+
+
+@pytest.mark.parametrize("threshold", [0.5, 0.8, 0.9, 0.95])
+def test_lsh_parameters_fit_the_permutations_and_catch_duplicates(threshold):
+    bands, rows = lsh_parameters(threshold)
+    assert bands * rows <= 128
+    # Most pairs at the threshold become candidates, pairs well below it rarely do
+    assert _band_probability(threshold, bands, rows) >= 0.75
+    assert _band_probability(threshold - 0.3, bands, rows) <= 0.1
+
+def test_signatures_agree_on_near_identical_text():
+    rng = random.Random(0)
+    hasher = MinHasher()
+    text = random_text(rng)
+    assert (hasher.signature(text) == MinHasher().signature(text)).all()
+    assert estimated_jaccard(hasher.signature(text), hasher.signature(edited(text, rng))) >= 0.9
+    assert estimated_jaccard(hasher.signature(text), hasher.signature(random_text(rng))) < 0.2
+    assert hasher.signature("") is None
+
+def test_index_finds_the_original_among_many():
+    rng = random.Random(1)
+    hasher = MinHasher()
+    index = LshIndex(0.85)
+    texts = [random_text(rng) for _ in range(200)]
+    for i, text in enumerate(texts):
+        index.add(i, hasher.signature(text))
+    match = index.find_duplicate(hasher.signature(edited(texts[42], rng)))
+    assert match is not None and match[0] == 42
+    assert index.find_duplicate(hasher.signature(random_text(rng))) is None
+
+
+class TextDocument:
+    # Stands in for PdfDocument: the "PDF" is a text file next to it
+    def __init__(self, path):
+        with open(path, encoding="utf-8") as f:
+            self.text = f.read()
+        self.sha256 = path
+
+    @classmethod
+    def from_path(cls, path):
+        return cls(path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+def test_main_reuses_analyses_for_near_duplicates(tmp_path, monkeypatch):
+    rng = random.Random(2)
+    resumes = tmp_path / "resumes"
+    resumes.mkdir()
+    originals = [random_text(rng) for _ in range(3)]
+    files = {"a.pdf": originals[0], "a_copy.pdf": edited(originals[0], rng), "b.pdf": originals[1],
+             "c.pdf": originals[2], "c_copy.pdf": edited(originals[2], rng)}
+    for name, text in files.items():
+        (resumes / name).write_text(text, encoding="utf-8")
+    jd = tmp_path / "jd.txt"
+    jd.write_text(" ".join(WORDS[:50]), encoding="utf-8")
+
+    calls = []
+    lock = threading.Lock()
+
+    def analyze(result, job_descriptions, *args):
+        # Slow enough that copies arrive while their original is analyzed
+        time.sleep(0.2)
+        with lock:
+            calls.append(result["resume"])
+        result["analyses"] = {name: f"analysis of {result['resume']}" for name, _ in job_descriptions}
+        result["analysis_errors"] = {}
+        return result
+
+    monkeypatch.setattr(screen_resumes, "PdfDocument", TextDocument)
+    monkeypatch.setattr(screen_resumes, "analyze_resume", analyze)
+    # Worker processes are forked, so they see the stand-in document
+    monkeypatch.setattr(screen_resumes, "ProcessPoolExecutor", _fork_pool)
+    output = tmp_path / "out.jsonl"
+    screen_resumes.main([str(resumes), "--jd", str(jd), "-o", str(output), "--llm", "ATS Match Score", "--workers", "2"])
+
+    records = {json.loads(line)["resume"]: json.loads(line) for line in output.read_text().splitlines()}
+    assert len(records) == 5
+    assert len(calls) == 3
+    for first, second in (("a.pdf", "a_copy.pdf"), ("c.pdf", "c_copy.pdf")):
+        pair = [records[str(resumes / name)] for name in (first, second)]
+        # Whichever copy finished extraction first is the original
+        duplicate = next(record for record in pair if record["duplicate_of"])
+        original = next(record for record in pair if not record["duplicate_of"])
+        assert duplicate["duplicate_of"] == original["resume"]
+        assert original["resume"] in calls and duplicate["resume"] not in calls
+        assert duplicate["analysis"] == original["analysis"] == f"analysis of {original['resume']}"
+    assert records[str(resumes / "b.pdf")]["duplicate_of"] == ""
+
+def test_main_marks_near_duplicates_without_analyses(tmp_path, monkeypatch):
+    rng = random.Random(3)
+    resumes = tmp_path / "resumes"
+    resumes.mkdir()
+    original = random_text(rng)
+    (resumes / "a.pdf").write_text(original, encoding="utf-8")
+    (resumes / "b.pdf").write_text(edited(original, rng), encoding="utf-8")
+    jd = tmp_path / "jd.txt"
+    jd.write_text(" ".join(WORDS[:50]), encoding="utf-8")
+    monkeypatch.setattr(screen_resumes, "PdfDocument", TextDocument)
+    monkeypatch.setattr(screen_resumes, "ProcessPoolExecutor", _fork_pool)
+    output = tmp_path / "out.jsonl"
+    screen_resumes.main([str(resumes), "--jd", str(jd), "-o", str(output), "--workers", "1"])
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(record["duplicate_of"] for record in records) == ["", records[0]["resume"]]
+
+def _fork_pool(max_workers):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("fork"))
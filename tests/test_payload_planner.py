@@ -0,0 +1,74 @@
+import pytest
+
+from payload_planner import OMITTED_PAGE_MARKER, plan_payload
+from pdf_admission import AdmissionRejected
+from pdf_processing import PAGE_BREAK
+
+
+CLEAN = "Senior engineer building data pipelines in python and kubernetes for five years."
+
+
+class StubDocument:
+    # Stands in for PdfDocument: fixed page texts, and renders that record
+    # which pages were asked for
+    def __init__(self, page_texts, render_error=None, text_error=None):
+        self._page_texts = page_texts
+        self.render_error = render_error
+        self.text_error = text_error
+        self.rendered = []
+
+    @property
+    def page_texts(self):
+        if self.text_error is not None:
+            raise self.text_error
+        return self._page_texts
+
+    def render(self, pages=(1,)):
+        if self.render_error is not None:
+            raise self.render_error
+        self.rendered.extend(pages)
+        return [{"mime_type": "image/jpeg", "data": f"page{pages[0]}" * 10}]
+
+
+def test_clean_pages_go_as_text_only():
+    document = StubDocument([CLEAN, CLEAN + " More."])
+    content, plan = plan_payload(document)
+    assert content == PAGE_BREAK.join([CLEAN, CLEAN + " More."])
+    assert plan["mode"] == "text" and document.rendered == []
+    assert [page["reason"] for page in plan["pages"]] == ["clean_text", "clean_text"]
+    assert plan["payload_bytes"] == len(content.encode("utf-8"))
+
+def test_pages_under_min_chars_get_an_image():
+    document = StubDocument([CLEAN, "Page 2", CLEAN])
+    content, plan = plan_payload(document, min_chars=20)
+    assert document.rendered == [2]
+    assert content == [CLEAN, {"mime_type": "image/jpeg", "data": "page2" * 10}, CLEAN]
+    assert plan["mode"] == "mixed"
+    assert plan["pages"][1]["reason"] == "sparse_text" and plan["pages"][1]["bytes"] == 50
+
+def test_image_pages_are_capped_at_max_image_pages():
+    document = StubDocument(["", "(cid:1)(cid:2)(cid:3)", "x", ""])
+    content, plan = plan_payload(document, max_image_pages=2)
+    assert document.rendered == [1, 2]
+    assert [page["mode"] for page in plan["pages"]] == ["image", "image", "text", "text"]
+    assert [page["reason"] for page in plan["pages"][2:]] == ["image_limit", "image_limit"]
+    # Over the cap, a page keeps its text, or is marked omitted when it has none
+    assert content[2] == PAGE_BREAK.join(["x", OMITTED_PAGE_MARKER.format(page=4)])
+    assert plan["omitted_pages"] == 1
+
+def test_document_without_text_renders_page_one():
+    content, plan = plan_payload(StubDocument(["", " "]))
+    assert plan["mode"] == "image" and [page["reason"] for page in plan["pages"]] == ["no_text"]
+    assert content == [{"mime_type": "image/jpeg", "data": "page1" * 10}]
+
+def test_document_without_text_or_images_is_rejected():
+    with pytest.raises(ValueError):
+        plan_payload(StubDocument([""], render_error=RuntimeError("poppler failed")))
+
+@pytest.mark.parametrize("document", [
+    StubDocument([CLEAN, ""], render_error=AdmissionRejected("busy")),
+    StubDocument([], text_error=AdmissionRejected("busy")),
+])
+def test_admission_rejected_propagates(document):
+    with pytest.raises(AdmissionRejected):
+        plan_payload(document)
@@ -0,0 +1,110 @@
+import threading
+import time
+
+import pytest
+
+from pdf_admission import AdmissionController, AdmissionRejected, estimate_page_count, extract_cost, render_cost
+
+
+def admit_in_thread(controller, cost, **kwargs):
+    # Returns (admitted event, release event, errors) for a job held open
+    # until released
+    admitted, release, errors = threading.Event(), threading.Event(), []
+
+    def run():
+        try:
+            with controller.admit(cost, **kwargs):
+                admitted.set()
+                release.wait(5)
+        except AdmissionRejected as e:
+            errors.append(e)
+    thread = threading.Thread(target=run)
+    thread.start()
+    return admitted, release, errors, thread
+
+def wait_for(condition):
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_job_over_the_memory_budget_waits_then_is_rejected():
+    controller = AdmissionController(max_concurrent=4, memory_budget=100, timeout=0.1)
+    with controller.admit(80):
+        started = time.monotonic()
+        with pytest.raises(AdmissionRejected):
+            with controller.admit(30):
+                pass
+        assert time.monotonic() - started >= 0.1
+        # A job that fits next to the first one is admitted at once
+        with controller.admit(20) as wait_seconds:
+            assert wait_seconds < 0.1
+    stats = controller.stats()
+    assert stats["admitted"] == 2 and stats["rejected"] == 1 and stats["reserved_bytes"] == 0
+
+def test_waiting_job_runs_once_memory_is_released():
+    controller = AdmissionController(max_concurrent=4, memory_budget=100, timeout=5)
+    first_admitted, first_release, _, first = admit_in_thread(controller, 80)
+    assert first_admitted.wait(5)
+    second_admitted, second_release, errors, second = admit_in_thread(controller, 30)
+    wait_for(lambda: controller.stats()["queued"] == 1)
+    assert not second_admitted.is_set()
+    first_release.set()
+    assert second_admitted.wait(5)
+    second_release.set()
+    first.join()
+    second.join()
+    assert errors == [] and controller.stats()["waited"] == 1
+
+def test_budget_is_released_when_the_job_raises():
+    controller = AdmissionController(max_concurrent=1, memory_budget=100)
+    with pytest.raises(RuntimeError):
+        with controller.admit(60):
+            raise RuntimeError("poppler failed")
+    stats = controller.stats()
+    assert stats["running"] == 0 and stats["reserved_bytes"] == 0
+    with controller.admit(60, timeout=0):
+        pass
+
+def test_full_queue_rejects_at_once():
+    controller = AdmissionController(max_concurrent=1, memory_budget=100, max_queue=1, timeout=5)
+    admitted, release, _, holder = admit_in_thread(controller, 10)
+    assert admitted.wait(5)
+    _, queued_release, queued_errors, queued = admit_in_thread(controller, 10)
+    wait_for(lambda: controller.stats()["queued"] == 1)
+    with pytest.raises(AdmissionRejected):
+        with controller.admit(10):
+            pass
+    release.set()
+    queued_release.set()
+    holder.join()
+    queued.join()
+    assert queued_errors == []
+
+def test_stats_count_every_outcome():
+    controller = AdmissionController(max_concurrent=2, memory_budget=100, timeout=0.05)
+    with controller.admit(40):
+        with controller.admit(40):
+            stats = controller.stats()
+            assert stats["running"] == 2 and stats["reserved_bytes"] == 80
+            for cost in (10, 70):
+                with pytest.raises(AdmissionRejected):
+                    with controller.admit(cost):
+                        pass
+    # A job larger than the whole budget still runs when nothing else does
+    with controller.admit(500):
+        assert controller.stats()["reserved_bytes"] == 500
+    stats = controller.stats()
+    assert {key: stats[key] for key in ("admitted", "rejected", "waited", "running", "queued", "reserved_bytes")} == {
+        "admitted": 3, "rejected": 2, "waited": 0, "running": 0, "queued": 0, "reserved_bytes": 0,
+    }
+    assert stats["wait_seconds"] >= 0 and stats["memory_budget"] == 100 and stats["max_concurrent"] == 2
+
+def test_costs_grow_with_pages_and_dpi():
+    one_page = b"%PDF /Type /Page /MediaBox [0 0 612 792] /Type /Pages"
+    two_pages = one_page + b" /Type /Page"
+    assert estimate_page_count(one_page) == 1 and estimate_page_count(two_pages) == 2
+    assert extract_cost(two_pages) > extract_cost(one_page)
+    assert render_cost(one_page, 200) == 4 * render_cost(one_page, 100)
+    assert render_cost(one_page, 200, grayscale=True) * 3 == render_cost(one_page, 200)
@@ -0,0 +1,36 @@
+import io
+
+import pytest
+
+from pdf_processing import PdfDocument
+
+
+def test_closing_a_document_releases_the_upload_buffer():
+    upload = io.BytesIO(b"%PDF-1.4 resume")
+    with PdfDocument.from_upload(upload) as document:
+        assert bytes(document.data) == b"%PDF-1.4 resume"
+        with pytest.raises(BufferError):
+            upload.write(b"more")
+    upload.write(b"more")
+    upload.close()
+    document.close()
+
+def test_large_stream_uploads_are_mapped_and_unmapped(monkeypatch):
+    monkeypatch.setattr("pdf_processing.PDF_SPOOL_MAX_MEMORY", 16)
+
+    class Stream(io.RawIOBase):
+        # A plain stream without getbuffer, like a file from a request body
+        def __init__(self, data):
+            self._data = io.BytesIO(data)
+
+        def seek(self, *args):
+            return self._data.seek(*args)
+
+        def read(self, size=-1):
+            return self._data.read(size)
+
+    data = b"%PDF-1.4 " + b"x" * 100
+    document = PdfDocument.from_upload(Stream(data))
+    assert bytes(document.data[:]) == data and document.sha256
+    document.close()
+    assert document.data.closed
@@ -0,0 +1,80 @@
+import tracing
+from pdf_processing import PAGE_BREAK
+from prompt_budget import (
+    CHARS_PER_TOKEN, IMAGE_TOKENS, OMITTED_MARKER, compact_payload, fit_to_budget, strip_boilerplate,
+)
+
+
+PROMPT = "You are an experienced technical recruiter. Review the resume against the job description."
+IMAGE = {"mime_type": "image/jpeg", "data": "A" * 200_000}
+
+
+def resume(sections=40):
+    return "\n\n".join(
+        f"PROJECT {i}:\nBuilt service {i} with python and kubernetes for team {i}\n" + f"detail line {i} " * 20
+        for i in range(sections)
+    )
+
+
+def test_long_job_description_is_cut_to_the_budget():
+    job_description = "Senior python engineer with kubernetes experience. " * 3000
+    prompt, content, jd, report = compact_payload(PROMPT, resume(), job_description, token_budget=1000)
+    assert len(jd) < len(job_description)
+    assert jd.endswith(OMITTED_MARKER)
+    assert report["jd_chars_dropped"] > 0
+    assert report["reduction_pct"] > 90
+    assert report["estimated_tokens"] <= 1000 * 1.2
+
+def test_text_parts_of_mixed_content_are_cut_to_the_budget():
+    job_description = "Senior python engineer with kubernetes experience."
+    content = [resume(), IMAGE, resume()]
+    _, compacted, _, report = compact_payload(PROMPT, content, job_description, token_budget=2000)
+    assert compacted[1] is IMAGE
+    text_chars = len(compacted[0]) + len(compacted[2])
+    assert text_chars <= (2000 - IMAGE_TOKENS) * CHARS_PER_TOKEN
+    assert report["sections_dropped"] > 0
+    assert not report["over_budget"]
+
+def test_result_that_still_does_not_fit_is_flagged():
+    content = [IMAGE] * 10
+    _, _, _, report = compact_payload(PROMPT, content, "Python engineer", token_budget=1000)
+    assert report["estimated_tokens"] > 1000
+    assert report["over_budget"]
+
+def test_first_section_over_the_budget_is_cut():
+    text = "\n".join(f"Contact line {i} with a long address and more words" for i in range(11))
+    fitted, _ = fit_to_budget(text + "\n\nSKILLS:\npython", "python", 200)
+    assert len(fitted) <= 200
+    assert OMITTED_MARKER in fitted
+
+def test_payload_within_budget_passes_through_unchanged():
+    text = "Jane Doe\n\nSoftware Engineer\nAcme\n\nSoftware Engineer\nGlobex\n\nSoftware Engineer\nInitech\nPage 1 of 2"
+    prompt, content, jd, report = compact_payload(PROMPT + "  ", text, "python  developer")
+    assert (prompt, content, jd) == (PROMPT + "  ", text, "python  developer")
+    assert report["reduction_pct"] == 0 and report["sections_dropped"] == 0 and report["jd_chars_dropped"] == 0
+    assert not report["over_budget"]
+
+def test_only_page_headers_and_footers_are_stripped():
+    pages = [
+        "Jane Doe - Resume\nSoftware Engineer\nAcme\nSoftware Engineer\nGlobex\njane@example.com | Page 1",
+        "Jane Doe - Resume\nSoftware Engineer\nInitech\nSoftware Engineer\nHooli\njane@example.com | Page 1",
+        "Jane Doe - Resume\nPython\nSQL\nSoftware Engineer\nUmbrella\njane@example.com | Page 1",
+    ]
+    stripped = strip_boilerplate(PAGE_BREAK.join(pages))
+    assert stripped.count("Jane Doe - Resume") == 1
+    assert stripped.count("jane@example.com | Page 1") == 1
+    # Repeated job titles inside the pages are content
+    assert stripped.count("Software Engineer") == 5
+
+def test_boilerplate_is_stripped_only_over_budget():
+    page = "Jane Doe\n" + "\n".join(f"Built service {i} with python" for i in range(10)) + "\nPage 1 of 3"
+    text = PAGE_BREAK.join([page] * 3)
+    _, content, _, _ = compact_payload(PROMPT, text, "python")
+    assert content == text
+    _, content, _, _ = compact_payload(PROMPT, text, "python", token_budget=100)
+    assert "Page 1 of 3" not in content and PAGE_BREAK not in content
+
+def test_over_budget_payloads_are_counted_in_the_metrics():
+    tracing.reset()
+    compact_payload(PROMPT, [IMAGE] * 10, "Python engineer", token_budget=1000)
+    assert "ats_prompt_over_budget_total 1" in tracing.render_prometheus()
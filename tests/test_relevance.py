@@ -0,0 +1,42 @@
+from keywords import count_keywords
+from relevance import BM25Scorer, IdfModel
+
+
+JOB_DESCRIPTIONS = [
+    "Python developer with kubernetes and terraform experience, strong team communication",
+    "Java developer with spring and hibernate experience, strong team communication",
+    "Data analyst with python, sql and tableau, strong team communication",
+]
+
+
+def scores(scorer, *resumes):
+    return scorer.score_matrix([count_keywords(resume) for resume in resumes])
+
+def test_rare_terms_outweigh_common_ones():
+    scorer = BM25Scorer(IdfModel.fit(JOB_DESCRIPTIONS), JOB_DESCRIPTIONS)
+    rare, common = scores(scorer, "kubernetes terraform", "team communication")
+    assert rare[0] > common[0]
+    # Both contain nothing specific to the Java role
+    assert rare[1] == 0
+
+def test_repeated_terms_saturate():
+    scorer = BM25Scorer(IdfModel.fit(JOB_DESCRIPTIONS), JOB_DESCRIPTIONS)
+    once, twice, often = scores(scorer, "kubernetes", "kubernetes kubernetes", "kubernetes " * 50)
+    assert once[0] < twice[0] < often[0]
+    # A term can never add more than k1 + 1 times its weight
+    assert often[0] < once[0] * (scorer.k1 + 1)
+
+def test_long_resumes_are_normalized_by_the_average_length():
+    model = IdfModel.fit(JOB_DESCRIPTIONS, ["python kubernetes terraform developer"] * 3)
+    scorer = BM25Scorer(model, JOB_DESCRIPTIONS)
+    short, padded = scores(scorer, "python kubernetes terraform developer", "python kubernetes terraform developer " + "gardening " * 40)
+    assert padded[0] < short[0]
+
+def test_average_resume_mentioning_every_term_once_scores_100():
+    job_description = JOB_DESCRIPTIONS[0]
+    length = sum(count_keywords(job_description).values())
+    model = IdfModel.fit(JOB_DESCRIPTIONS, [job_description])
+    assert model.average_length == length
+    scorer = BM25Scorer(model, JOB_DESCRIPTIONS)
+    assert scores(scorer, job_description)[0][0] == 100
+    assert scores(scorer, "")[0].tolist() == [0, 0, 0]
@@ -0,0 +1,71 @@
+import random
+import threading
+
+from keywords import count_keywords, keyword_match_percentage
+from resume_index import ResumeIndex
+
+
+SKILLS = ["python", "kubernetes", "postgres", "terraform", "react", "golang", "kafka", "spark", "docker", "redis"]
+
+
+def test_indexed_documents_are_counted_and_found(tmp_path):
+    with ResumeIndex(str(tmp_path / "index.db")) as index:
+        index.add_documents([("a", "python kubernetes"), ("b", "react redis")])
+        index.add_document("c", keywords={"golang": 2})
+        assert len(index) == 3
+        assert "a" in index and "c" in index and "d" not in index
+        index.remove_document("a")
+        assert len(index) == 2 and "a" not in index
+        assert index.query("python kubernetes") == []
+
+def test_query_orders_by_matched_terms_then_hits(tmp_path):
+    with ResumeIndex(str(tmp_path / "index.db")) as index:
+        index.add_documents([
+            ("one_term", "python python python python"),
+            ("two_terms", "python kubernetes"),
+            ("two_terms_repeated", "python kubernetes kubernetes"),
+            ("three_terms", "python kubernetes postgres"),
+            ("unrelated", "react redis"),
+        ])
+        ranked = index.query("python kubernetes postgres", k=4)
+        assert [resume_id for resume_id, _ in ranked] == ["three_terms", "two_terms_repeated", "two_terms", "one_term"]
+        assert [match for _, match in ranked] == [100.0, 66.67, 66.67, 33.33]
+        assert index.query("python kubernetes postgres", k=1) == [("three_terms", 100.0)]
+
+def test_reindexing_a_resume_replaces_its_terms(tmp_path):
+    with ResumeIndex(str(tmp_path / "index.db")) as index:
+        index.add_document("a", "python kubernetes")
+        index.add_document("a", "react redis")
+        assert len(index) == 1
+        assert index.query("python kubernetes") == []
+        assert index.query("react redis") == [("a", 100.0)]
+
+def test_queries_from_many_threads_match_a_full_scan(tmp_path):
+    rng = random.Random(0)
+    resumes = {f"resume{i}": " ".join(rng.sample(SKILLS, rng.randint(1, 8))) for i in range(100)}
+    jds = [" ".join(rng.sample(SKILLS, rng.randint(2, 6))) for _ in range(20)]
+    with ResumeIndex(str(tmp_path / "index.db")) as index:
+        index.add_documents(resumes.items())
+        expected = {jd: index.query(jd, k=5) for jd in jds}
+        for jd, ranked in expected.items():
+            best = max(keyword_match_percentage(count_keywords(text), count_keywords(jd)) for text in resumes.values())
+            assert ranked[0][1] == best
+
+        errors = []
+
+        def run(offset):
+            try:
+                for i in range(200):
+                    jd = jds[(offset + i) % len(jds)]
+                    assert index.query(jd, k=5) == expected[jd]
+                    # Writers in between, as during a screening run
+                    index.add_document(f"extra{offset}", keywords=count_keywords("unrelated words only"))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run, args=(offset,)) for offset in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
@@ -0,0 +1,52 @@
+import csv
+import json
+
+import pytest
+
+from screen_resumes import RecordWriter, completed_pairs
+
+
+def record(resume, job_description, analysis="Strong python\nbackground"):
+    return {
+        "resume": resume,
+        "job_description": job_description,
+        "match_percentage": 80,
+        "analysis": analysis,
+        "error": "",
+        "duplicate_of": "",
+    }
+
+def write_records(path, output_format, records):
+    writer = RecordWriter(str(path), output_format)
+    for r in records:
+        writer.write(r)
+    writer.close()
+
+def read_records(path, output_format):
+    with open(path, newline="", encoding="utf-8") as f:
+        if output_format == "csv":
+            return [row["resume"] for row in csv.DictReader(f)]
+        return [json.loads(line)["resume"] for line in f]
+
+
+@pytest.mark.parametrize("output_format", ["jsonl", "csv"])
+def test_resume_after_a_record_cut_short(tmp_path, output_format):
+    path = tmp_path / f"results.{output_format}"
+    write_records(path, output_format, [record("a.pdf", "jd"), record("b.pdf", "jd")])
+    # Cut the last record inside its multi-line analysis
+    text = path.read_bytes()
+    path.write_bytes(text[:text.rindex(b"python") + 3])
+
+    assert completed_pairs(str(path), output_format) == {("a.pdf", "jd")}
+    write_records(path, output_format, [record("b.pdf", "jd"), record("c.pdf", "jd")])
+    assert read_records(path, output_format) == ["a.pdf", "b.pdf", "c.pdf"]
+    assert completed_pairs(str(path), output_format) == {("a.pdf", "jd"), ("b.pdf", "jd"), ("c.pdf", "jd")}
+
+def test_csv_row_missing_fields_is_not_counted_as_done(tmp_path):
+    path = tmp_path / "results.csv"
+    write_records(path, "csv", [record("a.pdf", "jd", analysis="ok")])
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        f.write("b.pdf,jd,80\n")
+    assert completed_pairs(str(path), "csv") == {("a.pdf", "jd")}
+    write_records(path, "csv", [record("c.pdf", "jd", analysis="ok")])
+    assert read_records(path, "csv") == ["a.pdf", "c.pdf"]
@@ -0,0 +1,27 @@
+import pytest
+
+from benchmarks.startup import CORE_MODULES, measure_startup
+
+
+# Cold imports run in fresh interpreters with sockets disabled; see
+# benchmarks/startup.py for the probe
+CORE_BUDGET_SECONDS = 0.5
+APP_BUDGET_SECONDS = 3.0
+
+
+def check_startup(modules, budget):
+    report = measure_startup(modules, runs=3)
+    assert report["median_seconds"] <= budget, (
+        f"median startup {report['median_seconds']:.3f}s is over the {budget:.3f}s budget"
+    )
+    assert report["heavy_modules_loaded"] == []
+    assert report["network_attempts"] == []
+
+def test_core_modules_start_within_budget():
+    check_startup(CORE_MODULES, CORE_BUDGET_SECONDS)
+
+@pytest.mark.parametrize("app", ["app", "app1", "app2"])
+def test_apps_start_within_budget(app):
+    pytest.importorskip("streamlit")
+    pytest.importorskip("dotenv")
+    check_startup(CORE_MODULES + [app], APP_BUDGET_SECONDS)
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from structured_analysis import extract_json, parse_report, parse_score
+
+
+REPORT = {
+    "overall_score": 78,
+    "scores": {"Technical Skills": 85, "Experience": 70},
+    "missing_keywords": ["kubernetes"],
+    "strengths": ["python"],
+    "recommendations": ["Add metrics to project bullets"],
+    "verdict": "Recommend",
+    "sections": {"Summary": "Solid backend profile"},
+}
+
+
+@pytest.mark.parametrize("text", [
+    json.dumps(REPORT),
+    "```json\n" + json.dumps(REPORT) + "\n```",
+    "```\n" + json.dumps(REPORT) + "\n```",
+    "Here is the report:\n" + json.dumps(REPORT, indent=2) + "\nLet me know if you need more.",
+    "Sure!\n```json\n" + json.dumps(REPORT) + "\n```\nThe candidate {looks} strong.",
+])
+def test_json_is_recovered_from_fences_and_surrounding_text(text):
+    assert extract_json(text) == REPORT
+
+def test_text_without_a_json_object_is_rejected():
+    with pytest.raises(ValueError):
+        extract_json("The candidate is a strong match.")
+    with pytest.raises(ValueError):
+        extract_json("} not json {")
+
+@pytest.mark.parametrize("value, score", [
+    (85, 85), (85.4, 85), ("85", 85), ("85%", 85), ("70/100", 70), (" 62.5 % ", 62),
+    (140, 100), ("-5", 0), ("n/a", None), (None, None), (True, None), (float("nan"), None),
+])
+def test_scores_are_parsed_and_clamped(value, score):
+    assert parse_score(value) == score
+
+def test_written_out_scores_are_parsed_in_a_report():
+    report = parse_report(json.dumps({"scores": {"Technical Skills": "85%", "Experience": "70/100"}}))
+    assert report["scores"] == {"Technical Skills": 85, "Experience": 70}
+    # Without an overall score, the area scores are averaged
+    assert report["overall_score"] == 78
+
+@pytest.mark.parametrize("value", [[REPORT], '"report"', "42", "null"])
+def test_top_level_value_that_is_not_an_object_is_rejected(value):
+    text = json.dumps(value) if isinstance(value, list) else value
+    with pytest.raises(ValueError):
+        parse_report(text)
+
+def test_missing_sections_are_empty():
+    data = dict(REPORT)
+    del data["sections"]
+    report = parse_report(json.dumps(data), ["Summary", "Skills"])
+    assert report["sections"] == {"Summary": "", "Skills": ""}
+    assert report["overall_score"] == 78 and report["verdict"] == "Recommend"
+
+def test_sections_of_the_wrong_type_are_converted_or_dropped():
+    data = dict(REPORT, sections={"Summary": ["Backend", "Python"], "Skills": {"Python": "expert"}, "Gaps": 3})
+    report = parse_report(json.dumps(data), ["Summary", "Skills", "Gaps", "Missing"])
+    assert report["sections"] == {
+        "Summary": "- Backend\n- Python", "Skills": "**Python**: expert", "Gaps": "3", "Missing": "",
+    }
+    for sections in (["Summary"], "Summary", 5):
+        report = parse_report(json.dumps(dict(REPORT, sections=sections)), ["Summary"])
+        assert report["sections"] == {"Summary": ""}
+
+def test_malformed_fields_fall_back_to_empty_values():
+    data = {"overall_score": "high", "scores": ["85"], "missing_keywords": "kubernetes",
+            "strengths": None, "recommendations": [None, " ", "Add metrics"], "verdict": "Hire"}
+    report = parse_report(json.dumps(data))
+    assert report == {
+        "overall_score": None, "scores": {}, "missing_keywords": ["kubernetes"], "strengths": [],
+        "recommendations": ["Add metrics"], "verdict": "", "sections": {},
+    }
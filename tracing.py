@@ -0,0 +1,189 @@
+import functools
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+# Lightweight in-process metrics: stage durations and payload sizes as
+# histograms, cache lookups as counters, queue depths as gauges, plus a short list of recent spans for
+# the debug panel. Everything can be rendered in the Prometheus text format,
+# served by analysis_service.py at /metrics or written to METRICS_FILE.
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "1").lower() not in ("0", "false", "no")
+METRICS_FILE = os.getenv("METRICS_FILE")
+
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (1_000, 10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 5_000_000)
+
+METRICS = {
+    "ats_stage_duration_seconds": ("histogram", "Time spent in each pipeline stage", DURATION_BUCKETS),
+    "ats_payload_size": ("histogram", "Payload sizes (image bytes, prompt characters)", SIZE_BUCKETS),
+    "ats_cache_requests_total": ("counter", "Cache lookups by cache and result", None),
+    "ats_payload_pages_total": ("counter", "Resume pages sent to the model as text or image", None),
+    "ats_model_requests_total": ("counter", "Scheduled model requests by outcome", None),
+    "ats_prompt_over_budget_total": ("counter", "Payloads still over the token budget after compaction", None),
+    "ats_pdf_admission_wait_seconds": ("histogram", "Time PDF work waited for admission", DURATION_BUCKETS),
+    "ats_pdf_admission_total": ("counter", "PDF work admitted or rejected by admission control", None),
+    "ats_pdf_admission_queue_depth": ("gauge", "PDF work waiting for admission", None),
+    "ats_pdf_admission_reserved_bytes": ("gauge", "Estimated memory held by admitted PDF work", None),
+}
+
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+_recent_spans = deque(maxlen=200)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+
+def _labels_key(labels):
+    return tuple(sorted(labels.items()))
+
+def observe(metric, value, **labels):
+    if not TRACING_ENABLED:
+        return
+    key = (metric, _labels_key(labels))
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram(METRICS[metric][2])
+        histogram.observe(value)
+
+def increment(metric, amount=1, **labels):
+    if not TRACING_ENABLED:
+        return
+    key = (metric, _labels_key(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+def set_gauge(metric, value, **labels):
+    # Gauges share the counter table; only the update differs
+    if not TRACING_ENABLED:
+        return
+    key = (metric, _labels_key(labels))
+    with _lock:
+        _counters[key] = value
+
+def record_size(kind, value):
+    observe("ats_payload_size", value, kind=kind)
+
+def record_cache(cache, hit):
+    increment("ats_cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+@contextmanager
+def span(stage, **attributes):
+    # attributes are kept with the recent span for the debug panel only, so
+    # they do not multiply metric series
+    if not TRACING_ENABLED:
+        yield attributes
+        return
+    start = time.perf_counter()
+    error = None
+    try:
+        yield attributes
+    except Exception as e:
+        error = type(e).__name__
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        observe("ats_stage_duration_seconds", duration, stage=stage)
+        with _lock:
+            _recent_spans.append({
+                "stage": stage,
+                "duration_ms": round(duration * 1000, 3),
+                "started_at": time.time() - duration,
+                "error": error,
+                **attributes,
+            })
+
+def traced(stage):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def recent_spans(limit=50):
+    with _lock:
+        return list(_recent_spans)[-limit:]
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+        _recent_spans.clear()
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+def render_prometheus():
+    with _lock:
+        histograms = sorted(_histograms.items())
+        counters = sorted(_counters.items())
+
+    lines = []
+    for metric, (kind, help_text, _) in METRICS.items():
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        if kind == "histogram":
+            for (name, labels), histogram in histograms:
+                if name != metric:
+                    continue
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f"{metric}_bucket{_format_labels(labels + (('le', repr(float(bound))),))} {cumulative}")
+                lines.append(f"{metric}_bucket{_format_labels(labels + (('le', '+Inf'),))} {histogram.count}")
+                lines.append(f"{metric}_sum{_format_labels(labels)} {histogram.sum}")
+                lines.append(f"{metric}_count{_format_labels(labels)} {histogram.count}")
+        else:
+            for (name, labels), value in counters:
+                if name == metric:
+                    lines.append(f"{metric}{_format_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+def write_metrics_file(path=None):
+    # Each writer gets its own temporary file, so concurrent sessions never
+    # share one. Returns False when the export failed; metrics are best
+    # effort and a failure must not reach the page.
+    path = path or METRICS_FILE
+    if not path:
+        return False
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".metrics-", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(render_prometheus())
+        os.replace(tmp_path, path)
+        return True
+    except OSError:
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        return False